@@ -0,0 +1,44 @@
+"""store_inquiries question_embedding / corpus_version for semantic answer cache
+
+Revision ID: a6d1f5c8e302
+Revises: f4b8d2e6a913
+Create Date: 2026-10-17 20:05:11.742630
+
+"""
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6d1f5c8e302'
+down_revision: Union[str, Sequence[str], None] = 'f4b8d2e6a913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+HNSW_M = int(os.getenv("VECTOR_HNSW_M", "16"))
+HNSW_EF_CONSTRUCTION = int(os.getenv("VECTOR_HNSW_EF_CONSTRUCTION", "64"))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('store_inquiries', sa.Column('question_embedding', Vector(1536), nullable=True))
+    op.add_column('store_inquiries', sa.Column('corpus_version', sa.String(length=64), nullable=True))
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_store_inquiries_question_embedding_hnsw "
+            "ON store_inquiries USING hnsw (question_embedding vector_cosine_ops) "
+            f"WITH (m = {HNSW_M}, ef_construction = {HNSW_EF_CONSTRUCTION})"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_store_inquiries_question_embedding_hnsw")
+    op.drop_column('store_inquiries', 'corpus_version')
+    op.drop_column('store_inquiries', 'question_embedding')
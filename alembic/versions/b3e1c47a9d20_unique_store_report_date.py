@@ -0,0 +1,36 @@
+"""unique store_reports (store_id, report_date)
+
+Revision ID: b3e1c47a9d20
+Revises: 71461bb8676c
+Create Date: 2026-10-17 10:12:41.218305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e1c47a9d20'
+down_revision: Union[str, Sequence[str], None] = '71461bb8676c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 기존 delete-then-insert 경합으로 생긴 중복 행 정리 (최신 report_id만 남김)
+    op.execute("""
+        DELETE FROM store_reports a
+        USING store_reports b
+        WHERE a.store_id = b.store_id
+          AND a.report_date = b.report_date
+          AND a.report_id < b.report_id
+    """)
+    op.create_unique_constraint('uix_store_report_date', 'store_reports', ['store_id', 'report_date'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uix_store_report_date', 'store_reports', type_='unique')
@@ -0,0 +1,119 @@
+"""store_watermarks table maintained by sales_daily / orders / reviews triggers
+
+Revision ID: c8d4e2f1a7b9
+Revises: a6d1f5c8e302
+Create Date: 2026-10-17 22:14:36.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8d4e2f1a7b9'
+down_revision: Union[str, Sequence[str], None] = 'a6d1f5c8e302'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 테이블 -> (워터마크 컬럼, 원본 시각 컬럼)
+WATERMARK_SOURCES = {
+    'sales_daily': ('last_sale_date', 'sale_date'),
+    'orders': ('last_ordered_at', 'ordered_at'),
+    'reviews': ('last_review_at', 'created_at'),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'store_watermarks',
+        sa.Column('store_id', sa.Integer(), sa.ForeignKey('stores.store_id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('last_sale_date', sa.Date(), nullable=True),
+        sa.Column('last_ordered_at', sa.DateTime(), nullable=True),
+        sa.Column('last_review_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+    )
+
+    # 전체 재계산 (삭제/TRUNCATE 후, 최초 적재) - 매장별 MAX는 (store_id, 시각) 인덱스로 조회
+    op.execute("""
+        CREATE OR REPLACE FUNCTION refresh_store_watermarks() RETURNS void AS $$
+        BEGIN
+            INSERT INTO store_watermarks (store_id, last_sale_date, last_ordered_at, last_review_at, updated_at)
+            SELECT s.store_id,
+                   (SELECT MAX(sale_date) FROM sales_daily WHERE store_id = s.store_id),
+                   (SELECT MAX(ordered_at) FROM orders WHERE store_id = s.store_id),
+                   (SELECT MAX(created_at) FROM reviews WHERE store_id = s.store_id),
+                   now()
+            FROM stores s
+            ON CONFLICT (store_id) DO UPDATE
+            SET last_sale_date = EXCLUDED.last_sale_date,
+                last_ordered_at = EXCLUDED.last_ordered_at,
+                last_review_at = EXCLUDED.last_review_at,
+                updated_at = now();
+            PERFORM pg_notify('store_watermark', '*');
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+    # INSERT / UPDATE: 변경된 행의 매장만 GREATEST로 올림 (문장 단위 트리거, 대량 적재도 1회 실행)
+    for table, (watermark_column, source_column) in WATERMARK_SOURCES.items():
+        op.execute(f"""
+            CREATE OR REPLACE FUNCTION bump_store_watermark_{table}() RETURNS trigger AS $$
+            DECLARE
+                changed text;
+            BEGIN
+                INSERT INTO store_watermarks (store_id, {watermark_column}, updated_at)
+                SELECT store_id, MAX({source_column}), now()
+                FROM new_rows
+                GROUP BY store_id
+                ON CONFLICT (store_id) DO UPDATE
+                SET {watermark_column} = GREATEST(store_watermarks.{watermark_column}, EXCLUDED.{watermark_column}),
+                    updated_at = now();
+
+                SELECT string_agg(DISTINCT store_id::text, ',') INTO changed FROM new_rows;
+                IF changed IS NOT NULL THEN
+                    PERFORM pg_notify('store_watermark', changed);
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+        for event in ('INSERT', 'UPDATE'):
+            op.execute(f"""
+                CREATE TRIGGER trg_{table}_watermark_{event.lower()}
+                AFTER {event} ON {table}
+                REFERENCING NEW TABLE AS new_rows
+                FOR EACH STATEMENT EXECUTE FUNCTION bump_store_watermark_{table}()
+            """)
+
+    # DELETE / TRUNCATE는 드물고 MAX가 내려갈 수 있으므로 전체 재계산
+    op.execute("""
+        CREATE OR REPLACE FUNCTION rebuild_store_watermarks() RETURNS trigger AS $$
+        BEGIN
+            PERFORM refresh_store_watermarks();
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for table in WATERMARK_SOURCES:
+        op.execute(f"""
+            CREATE TRIGGER trg_{table}_watermark_rebuild
+            AFTER DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION rebuild_store_watermarks()
+        """)
+
+    op.execute("SELECT refresh_store_watermarks()")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in WATERMARK_SOURCES:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_watermark_rebuild ON {table}")
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_watermark_insert ON {table}")
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_watermark_update ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS bump_store_watermark_{table}()")
+    op.execute("DROP FUNCTION IF EXISTS rebuild_store_watermarks()")
+    op.execute("DROP FUNCTION IF EXISTS refresh_store_watermarks()")
+    op.drop_table('store_watermarks')
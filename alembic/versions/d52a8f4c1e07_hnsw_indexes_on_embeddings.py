@@ -0,0 +1,50 @@
+"""hnsw indexes on manuals/policies/reviews/menus embeddings
+
+Revision ID: d52a8f4c1e07
+Revises: b3e1c47a9d20
+Create Date: 2026-10-17 14:03:27.510942
+
+"""
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd52a8f4c1e07'
+down_revision: Union[str, Sequence[str], None] = 'b3e1c47a9d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 인덱스 생성 파라미터 (app/core/db.py와 같은 환경변수)
+HNSW_M = int(os.getenv("VECTOR_HNSW_M", "16"))
+HNSW_EF_CONSTRUCTION = int(os.getenv("VECTOR_HNSW_EF_CONSTRUCTION", "64"))
+
+EMBEDDING_TABLES = ["manuals", "policies", "reviews", "menus"]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # policies 테이블은 seed 스크립트(create_all)로 만들어진 환경도 있으므로 존재하는 테이블만 처리
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    # CONCURRENTLY: 리뷰 테이블이 커도 인덱스 생성 중 INSERT가 막히지 않도록 (트랜잭션 밖에서 실행)
+    with op.get_context().autocommit_block():
+        for table in EMBEDDING_TABLES:
+            if table not in existing:
+                print(f"⚠️ '{table}' 테이블이 없어 HNSW 인덱스 생성을 건너뜁니다.")
+                continue
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_embedding_hnsw "
+                f"ON {table} USING hnsw (embedding vector_cosine_ops) "
+                f"WITH (m = {HNSW_M}, ef_construction = {HNSW_EF_CONSTRUCTION})"
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table in EMBEDDING_TABLES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_embedding_hnsw")
@@ -0,0 +1,58 @@
+"""covering indexes for windowed sales_daily / orders / reviews queries
+
+Revision ID: e2a7c9f4b618
+Revises: c8d4e2f1a7b9
+Create Date: 2026-10-17 23:41:09.372815
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a7c9f4b618'
+down_revision: Union[str, Sequence[str], None] = 'c8d4e2f1a7b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 인덱스 이름 -> (테이블, 정의), app/*/..._schema.py의 Index와 같아야 함
+WINDOW_INDEXES = {
+    # 리포트 일별 매출 (since ~ until), 매출 분석 daily CTE
+    'ix_sales_daily_store_date_covering': (
+        'sales_daily', '(store_id, sale_date) INCLUDE (total_sales, total_orders, weather_info)'
+    ),
+    # 메뉴별 비교 / 매출 분석 menu_stats (store_id + ordered_at 범위)
+    'ix_orders_store_ordered_at_covering': (
+        'orders', '(store_id, ordered_at) INCLUDE (menu_id, quantity, total_price)'
+    ),
+    # 매장 최신 리뷰 N건 (리뷰 본문은 커서 INCLUDE하지 않음, LIMIT 건수만큼만 힙 조회)
+    'ix_reviews_store_created_at': (
+        'reviews', '(store_id, created_at DESC)'
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    # CONCURRENTLY: 주문/리뷰가 계속 들어오는 중에도 쓰기를 막지 않도록 (트랜잭션 밖에서 실행)
+    with op.get_context().autocommit_block():
+        for name, (table, definition) in WINDOW_INDEXES.items():
+            if table not in existing:
+                print(f"⚠️ '{table}' 테이블이 없어 '{name}' 인덱스 생성을 건너뜁니다.")
+                continue
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} {definition}")
+
+        # 인덱스만으로 응답(Index Only Scan)하려면 visibility map이 최신이어야 함 (VACUUM도 트랜잭션 밖에서)
+        for table in sorted({table for table, _ in WINDOW_INDEXES.values()} & existing):
+            op.execute(f"VACUUM (ANALYZE) {table}")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name in WINDOW_INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,54 @@
+"""full-text / trigram indexes on manuals/policies for hybrid search
+
+Revision ID: e7c3a91b5f24
+Revises: d52a8f4c1e07
+Create Date: 2026-10-17 16:21:48.093517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7c3a91b5f24'
+down_revision: Union[str, Sequence[str], None] = 'd52a8f4c1e07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# app/core/db.py의 HYBRID_TEXT_COLUMNS와 같은 표현식이어야 hybrid_search가 인덱스를 사용함
+HYBRID_TABLES = ["manuals", "policies"]
+DOCUMENT = "(title || ' ' || content)"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # policies 테이블은 seed 스크립트(create_all)로 만들어진 환경도 있으므로 존재하는 테이블만 처리
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    with op.get_context().autocommit_block():
+        for table in HYBRID_TABLES:
+            if table not in existing:
+                print(f"⚠️ '{table}' 테이블이 없어 키워드 검색 인덱스 생성을 건너뜁니다.")
+                continue
+            # 키워드 일치 (to_tsquery @@)
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_document_fts "
+                f"ON {table} USING gin (to_tsvector('simple', {DOCUMENT}))"
+            )
+            # 부분 일치 (word_similarity <%) - 조사가 붙은 한국어 단어도 일치
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_document_trgm "
+                f"ON {table} USING gin ({DOCUMENT} gin_trgm_ops)"
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table in HYBRID_TABLES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_document_trgm")
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_document_fts")
@@ -0,0 +1,72 @@
+"""add manual_chunks / policy_chunks passage tables
+
+Revision ID: f4b8d2e6a913
+Revises: e7c3a91b5f24
+Create Date: 2026-10-17 18:42:05.318264
+
+"""
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b8d2e6a913'
+down_revision: Union[str, Sequence[str], None] = 'e7c3a91b5f24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+HNSW_M = int(os.getenv("VECTOR_HNSW_M", "16"))
+HNSW_EF_CONSTRUCTION = int(os.getenv("VECTOR_HNSW_EF_CONSTRUCTION", "64"))
+
+# 조각 테이블 -> (원본 테이블, 문서 ID 컬럼)
+CHUNK_TABLES = {
+    "manual_chunks": ("manuals", "manual_id"),
+    "policy_chunks": ("policies", "policy_id"),
+}
+DOCUMENT = "(title || ' ' || content)"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # policies 테이블은 seed 스크립트(create_all)로 만들어진 환경도 있으므로 원본이 있는 경우만 생성
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    for table, (parent, id_column) in CHUNK_TABLES.items():
+        if parent not in existing:
+            print(f"⚠️ '{parent}' 테이블이 없어 '{table}' 생성을 건너뜁니다.")
+            continue
+        if table in existing:
+            continue
+
+        op.create_table(
+            table,
+            sa.Column('chunk_id', sa.Integer(), nullable=False),
+            sa.Column(id_column, sa.Integer(), nullable=False),
+            sa.Column('chunk_no', sa.Integer(), nullable=False),
+            sa.Column('category', sa.String(length=50), nullable=False),
+            sa.Column('title', sa.String(length=200), nullable=False),
+            sa.Column('content', sa.Text(), nullable=False),
+            sa.Column('content_hash', sa.String(length=64), nullable=False),
+            sa.Column('embedding', Vector(1536), nullable=True),
+            sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+            sa.ForeignKeyConstraint([id_column], [f'{parent}.{id_column}'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('chunk_id'),
+            sa.UniqueConstraint(id_column, 'chunk_no', name=f'uix_{table}_doc_chunk'),
+        )
+        op.execute(
+            f"CREATE INDEX ix_{table}_embedding_hnsw ON {table} USING hnsw (embedding vector_cosine_ops) "
+            f"WITH (m = {HNSW_M}, ef_construction = {HNSW_EF_CONSTRUCTION})"
+        )
+        # 하이브리드 검색 키워드 인덱스 (e7c3a91b5f24와 같은 표현식)
+        op.execute(f"CREATE INDEX ix_{table}_document_fts ON {table} USING gin (to_tsvector('simple', {DOCUMENT}))")
+        op.execute(f"CREATE INDEX ix_{table}_document_trgm ON {table} USING gin ({DOCUMENT} gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in CHUNK_TABLES:
+        op.execute(f"DROP TABLE IF EXISTS {table}")
@@ -0,0 +1,132 @@
+"""store_watermarks triggers: skip non-advancing bumps, touch updated_at on UPDATE
+
+Revision ID: f5c1d8a3b2e7
+Revises: e2a7c9f4b618
+Create Date: 2026-10-18 10:27:53.184620
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5c1d8a3b2e7'
+down_revision: Union[str, Sequence[str], None] = 'e2a7c9f4b618'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 테이블 -> (워터마크 컬럼, 원본 시각 컬럼, 저장 단위)
+# 주문/리뷰 시각은 분 단위로 잘라 저장 -> 주문이 몰리는 매장도 워터마크 행 갱신(잠금)은 분당 최대 1회
+WATERMARK_SOURCES = {
+    'sales_daily': ('last_sale_date', 'sale_date', 'MAX(sale_date)'),
+    'orders': ('last_ordered_at', 'ordered_at', "date_trunc('minute', MAX(ordered_at))"),
+    'reviews': ('last_review_at', 'created_at', "date_trunc('minute', MAX(created_at))"),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, (watermark_column, source_column, bucket) in WATERMARK_SOURCES.items():
+        # INSERT: 저장된 값보다 앞설 때만 upsert
+        # ON CONFLICT DO UPDATE는 WHERE가 거짓이어도 행을 잠그므로, 잠금 없는 스냅샷 비교로 먼저 걸러냄
+        op.execute(f"""
+            CREATE OR REPLACE FUNCTION bump_store_watermark_{table}() RETURNS trigger AS $$
+            DECLARE
+                changed text;
+            BEGIN
+                WITH latest AS (
+                    SELECT store_id, {bucket} AS value
+                    FROM new_rows
+                    GROUP BY store_id
+                ),
+                bumped AS (
+                    INSERT INTO store_watermarks (store_id, {watermark_column}, updated_at)
+                    SELECT l.store_id, l.value, now()
+                    FROM latest l
+                    LEFT JOIN store_watermarks w ON w.store_id = l.store_id
+                    WHERE w.store_id IS NULL OR w.{watermark_column} IS NULL OR w.{watermark_column} < l.value
+                    ON CONFLICT (store_id) DO UPDATE
+                    SET {watermark_column} = EXCLUDED.{watermark_column},
+                        updated_at = now()
+                    WHERE store_watermarks.{watermark_column} IS NULL
+                       OR store_watermarks.{watermark_column} < EXCLUDED.{watermark_column}
+                    RETURNING store_id
+                )
+                SELECT string_agg(store_id::text, ',') INTO changed FROM bumped;
+
+                IF changed IS NOT NULL THEN
+                    PERFORM pg_notify('store_watermark', changed);
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+
+        # UPDATE: 기존 행 수정(매출 정정, 리뷰 수정)은 MAX가 그대로여도 updated_at을 올려 캐시 버전을 바꿈
+        op.execute(f"""
+            CREATE OR REPLACE FUNCTION touch_store_watermark_{table}() RETURNS trigger AS $$
+            DECLARE
+                changed text;
+            BEGIN
+                WITH touched AS (
+                    INSERT INTO store_watermarks (store_id, {watermark_column}, updated_at)
+                    SELECT store_id, {bucket}, now()
+                    FROM new_rows
+                    GROUP BY store_id
+                    ON CONFLICT (store_id) DO UPDATE
+                    SET {watermark_column} = GREATEST(store_watermarks.{watermark_column}, EXCLUDED.{watermark_column}),
+                        updated_at = now()
+                    RETURNING store_id
+                )
+                SELECT string_agg(store_id::text, ',') INTO changed FROM touched;
+
+                IF changed IS NOT NULL THEN
+                    PERFORM pg_notify('store_watermark', changed);
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_watermark_update ON {table}")
+        op.execute(f"""
+            CREATE TRIGGER trg_{table}_watermark_update
+            AFTER UPDATE ON {table}
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION touch_store_watermark_{table}()
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, (watermark_column, source_column, _) in WATERMARK_SOURCES.items():
+        # c8d4e2f1a7b9의 정의로 복구 (INSERT / UPDATE 모두 GREATEST upsert)
+        op.execute(f"""
+            CREATE OR REPLACE FUNCTION bump_store_watermark_{table}() RETURNS trigger AS $$
+            DECLARE
+                changed text;
+            BEGIN
+                INSERT INTO store_watermarks (store_id, {watermark_column}, updated_at)
+                SELECT store_id, MAX({source_column}), now()
+                FROM new_rows
+                GROUP BY store_id
+                ON CONFLICT (store_id) DO UPDATE
+                SET {watermark_column} = GREATEST(store_watermarks.{watermark_column}, EXCLUDED.{watermark_column}),
+                    updated_at = now();
+
+                SELECT string_agg(DISTINCT store_id::text, ',') INTO changed FROM new_rows;
+                IF changed IS NOT NULL THEN
+                    PERFORM pg_notify('store_watermark', changed);
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_watermark_update ON {table}")
+        op.execute(f"""
+            CREATE TRIGGER trg_{table}_watermark_update
+            AFTER UPDATE ON {table}
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_store_watermark_{table}()
+        """)
+        op.execute(f"DROP FUNCTION IF EXISTS touch_store_watermark_{table}()")
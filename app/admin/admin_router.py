@@ -0,0 +1,22 @@
+from fastapi import APIRouter
+from app.core.cache import get_cache_stats
+from app.core.vector_index import get_vector_index_stats
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/cache/stats")
+async def get_cache_stats_api():
+    """
+    캐시 현황 조회 (네임스페이스별 hit/miss, L1/Redis/DB 지연 히스토그램, 메모리/방출)
+    - 워커별 값이므로 멀티 워커 환경에서는 요청을 받은 워커 기준
+    """
+    return await get_cache_stats()
+
+
+@router.get("/vector-index/stats")
+async def get_vector_index_stats_api():
+    """
+    메모리 벡터 인덱스 현황 (테이블별 메모리 적재 여부 / 행 수)
+    """
+    return get_vector_index_stats()
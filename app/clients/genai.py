@@ -1,5 +1,7 @@
 import os
 import re
+import json
+import asyncio
 from dotenv import load_dotenv
 from google import genai
 from google.genai.types import Tool, GenerateContentConfig, GoogleSearch
@@ -10,10 +12,27 @@ load_dotenv()
 api_key = os.getenv("GEMINI_API_KEY")
 client = genai.Client(api_key=api_key.strip() if api_key else None)
 
+# [Non-Blocking] 동기 client.models 대신 SDK의 비동기 표면(client.aio)을 사용
+# -> LLM 응답을 기다리는 동안 이벤트 루프가 다른 요청(/store/get 등)을 계속 처리
+aio_models = client.aio.models
+
+# 동시에 날아가는 Gemini 호출 수 상한 (Rate Limit / 소켓 폭주 방지)
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
+_gemini_semaphore = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
+
+
+async def _generate_content(contents, config):
+    """동시성 상한(Semaphore) 안에서 비동기 generate_content 호출"""
+    async with _gemini_semaphore:
+        return await aio_models.generate_content(
+            model="gemini-2.0-flash",
+            contents=contents,
+            config=config,
+        )
+
 @perform_async_logging
 async def genai_generate_text(prompt: str):
-    response = client.models.generate_content(
-        model="gemini-2.0-flash",
+    response = await _generate_content(
         contents=[{"role": "user", "parts": [{"text": prompt}]}],
         config={
             "response_mime_type": "text/plain", # JSON 강제 제거 (유연성 확보)
@@ -23,6 +42,21 @@ async def genai_generate_text(prompt: str):
     result_text = response.text if response.text else ""
     return result_text.strip()
 
+@perform_async_logging
+async def genai_generate_json(prompt: str, schema: dict) -> dict:
+    """
+    구조화 출력 (response_schema 강제) -> 파싱된 dict
+    스키마를 모델이 지키므로 코드 블록 제거 / 키 누락 처리가 필요 없음, 파싱 실패 시 예외 발생
+    """
+    response = await _generate_content(
+        contents=[{"role": "user", "parts": [{"text": prompt}]}],
+        config={
+            "response_mime_type": "application/json",
+            "response_schema": schema,
+        }
+    )
+    return json.loads(response.text or "{}")
+
 @perform_async_logging
 async def genai_generate_with_grounding(prompt: str):
     """
@@ -34,15 +68,14 @@ async def genai_generate_with_grounding(prompt: str):
         google_search=GoogleSearch()
     )
 
-    response = client.models.generate_content(
-        model="gemini-2.0-flash",
+    response = await _generate_content(
         contents=[{"role": "user", "parts": [{"text": prompt}]}],
         config=GenerateContentConfig(
             tools=[google_search_tool],
             response_modalities=["TEXT"],
         )
     )
-    
+
     # Grounding 메타데이터 (소스 출처 등) 추출
     citations = []
     if response.candidates and response.candidates[0].grounding_metadata:
@@ -53,13 +86,13 @@ async def genai_generate_with_grounding(prompt: str):
                     title = chunk.web.title or "Link"
                     uri = chunk.web.uri
                     citations.append(f"- [{title}]({uri})")
-    
+
     result_text = response.text if response.text else "답변을 생성하지 못했습니다."
-    
+
     # 출처 목록이 있으면 하단에 추가
     if citations:
         # 중복 제거
         unique_citations = list(dict.fromkeys(citations))
         result_text += "\n\n**🌐 참고 출처:**\n" + "\n".join(unique_citations)
-        
+
     return result_text.strip()
@@ -1,12 +1,19 @@
 import os
+import hashlib
+import unicodedata
 from dotenv import load_dotenv
 from openai import AsyncOpenAI
+from app.core.cache import cached
 from app.util.decorators import perform_async_logging
 
 load_dotenv()
 
 client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_CACHE_TTL = int(os.getenv("EMBEDDING_CACHE_TTL", str(7 * 24 * 3600)))  # 같은 모델이면 결과가 변하지 않으므로 길게
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "100"))  # 문서 임베딩 1회 요청당 입력 수
+
 @perform_async_logging
 async def openai_generate_text(prompt: str, model: str = "gpt-4o"):
     response = await client.chat.completions.create(
@@ -19,15 +26,51 @@ async def openai_generate_text(prompt: str, model: str = "gpt-4o"):
     return response.choices[0].message.content
 
 @perform_async_logging
-async def openai_create_embedding(text: str, model: str = "text-embedding-3-small"):
+async def openai_create_embedding(text: str, model: str = EMBEDDING_MODEL):
     """
     텍스트를 입력받아 OpenAI Embedding Vector (List[float])를 반환합니다.
     """
-    # 줄바꿈 공백 치환 (권장 사항)
-    text = text.replace("\n", " ")
-    
-    response = await client.embeddings.create(
-        input=[text],
-        model=model
-    )
-    return response.data[0].embedding
\ No newline at end of file
+    return await embed_text(text, model)
+
+
+# ---------------------------------------------------------
+# [Embedding Cache] 같은(거의 같은) 질문은 임베딩 API를 다시 호출하지 않음
+# 정규화된 텍스트의 해시를 키로 L1(메모리) + Redis에 저장
+# ---------------------------------------------------------
+
+def normalize_embedding_text(text: str) -> str:
+    """캐시 키용 정규화: 유니코드(NFKC) / 공백 / 대소문자 / 끝 문장부호 차이를 무시"""
+    text = unicodedata.normalize("NFKC", text)
+    text = " ".join(text.split()).lower()
+    return text.rstrip(" ?!.~")
+
+
+def _embedding_key(text: str, model: str = EMBEDDING_MODEL) -> str:
+    return f"{model}:{hashlib.sha256(text.encode()).hexdigest()}"
+
+
+@cached("embedding", ttl=EMBEDDING_CACHE_TTL, key_builder=_embedding_key)
+async def _embed_normalized(text: str, model: str = EMBEDDING_MODEL) -> list[float]:
+    response = await client.embeddings.create(input=[text], model=model)
+    return response.data[0].embedding
+
+
+async def embed_text(text: str, model: str = EMBEDDING_MODEL) -> list[float]:
+    """
+    질문/문서 임베딩 (캐시 우선, 실패 시 예외 발생)
+    모듈 단위 AsyncOpenAI 클라이언트를 재사용하므로 호출마다 연결을 새로 만들지 않음
+    """
+    return await _embed_normalized(normalize_embedding_text(text), model)
+
+
+async def embed_texts(texts: list[str], model: str = EMBEDDING_MODEL, batch_size: int = EMBEDDING_BATCH_SIZE) -> list[list[float]]:
+    """
+    문서 조각 일괄 임베딩 (입력 순서 유지, 실패 시 예외 발생)
+    문서는 content_hash로 변경분만 골라 호출하므로 질문용 캐시를 거치지 않고, batch_size개씩 한 번에 요청
+    """
+    vectors = []
+    for start in range(0, len(texts), batch_size):
+        batch = texts[start:start + batch_size]
+        response = await client.embeddings.create(input=batch, model=model)
+        vectors.extend(item.embedding for item in sorted(response.data, key=lambda item: item.index))
+    return vectors
@@ -1,105 +1,1222 @@
+import os
+import copy
 import json
+import time
+import uuid
+import bisect
+import asyncio
+import hashlib
+import inspect
+import functools
+import orjson
+import ormsgpack
+import zstandard
 import redis.asyncio as redis
-from datetime import date, datetime
-from typing import Any, Optional
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Optional
 
 # ---------------------------------------------------------
 # [Redis 및 메모리 캐시 통합 관리] 
-# Redis가 연결 가능한 상태면 Redis를 쓰고, 아니면 메모리(Local)를 씁니다.
+# L1: 프로세스 내부 메모리 (TTL + LRU + 용량 제한)
+# L2: Redis (워커 간 공유)
+# 조회는 L1 -> Redis 순서, 저장은 Redis + L1 동시 저장
 # ---------------------------------------------------------
 
 # Redis 연결 설정 (기본값: localhost:6379 / DB: 0)
-REDIS_URL = "redis://localhost:6379/0"
-_redis_client = None
-_local_cache = {} # Redis 실패 시 사용될 백업 메모리 캐시
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# 커넥션 풀 / 타임아웃 (느린 Redis가 요청 지연으로 번지지 않도록 짧게)
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "0.25"))
+REDIS_CONNECT_TIMEOUT = float(os.getenv("REDIS_CONNECT_TIMEOUT", "0.5"))
+REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "30"))
+
+# 서킷 브레이커 (연속 실패 N회 -> OPEN, 지수 백오프 후 HALF-OPEN에서 재연결 시도)
+REDIS_BREAKER_FAILURE_THRESHOLD = int(os.getenv("REDIS_BREAKER_FAILURE_THRESHOLD", "3"))
+REDIS_BREAKER_BASE_BACKOFF = float(os.getenv("REDIS_BREAKER_BASE_BACKOFF", "1"))
+REDIS_BREAKER_MAX_BACKOFF = float(os.getenv("REDIS_BREAKER_MAX_BACKOFF", "60"))
+
+# 리포트 캐시 TTL 정책 (Stale-While-Revalidate)
+# - SOFT: 이 시간이 지나면 캐시를 즉시 응답하되 백그라운드에서 재생성
+# - HARD: 이 시간이 지나면 캐시에서 사라져 동기 재생성
+REPORT_SOFT_TTL = int(os.getenv("REPORT_SOFT_TTL", "3600"))
+REPORT_HARD_TTL = int(os.getenv("REPORT_HARD_TTL", "86400"))
+
+# 리포트 캐시 무효화
+# - 키에 전역 세대(generation) 번호를 포함 -> 전체 초기화는 INCR 한 번으로 끝 (옛 키는 TTL로 자연 소멸)
+# - 세대 번호는 워커 메모리에 잠시 보관 (Pub/Sub 메시지로 즉시 갱신, 놓친 경우 REFRESH 주기마다 재확인)
+REPORT_GENERATION_KEY = "report:generation"
+REPORT_GENERATION_REFRESH = float(os.getenv("REPORT_GENERATION_REFRESH", "5"))
+REPORT_INVALIDATION_CHANNEL = "report:invalidate"
+INVALIDATION_BATCH = 500  # SCAN COUNT / UNLINK 한 번에 보내는 키 수
+
+# 직렬화 코덱 (msgpack | orjson | json) / zstd 압축 기준 크기(바이트)
+CACHE_CODEC = os.getenv("CACHE_CODEC", "msgpack")
+CACHE_COMPRESS_THRESHOLD = int(os.getenv("CACHE_COMPRESS_THRESHOLD", "1024"))
+CACHE_ZSTD_LEVEL = int(os.getenv("CACHE_ZSTD_LEVEL", "3"))
+
+# @cached 데코레이터 기본 TTL (카탈로그성 조회: 지점/메뉴/매뉴얼/정책/일별 매출)
+CACHED_DEFAULT_TTL = int(os.getenv("CACHED_DEFAULT_TTL", "300"))
+
+# L1 캐시 용량 설정 (항목 수 / 바이트 예산)
+LOCAL_CACHE_MAX_ENTRIES = int(os.getenv("LOCAL_CACHE_MAX_ENTRIES", "1000"))
+LOCAL_CACHE_MAX_BYTES = int(os.getenv("LOCAL_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# 질문 임베딩 전용 L1 (1536차원 벡터가 질문마다 늘어나므로 공용 L1과 예산 분리)
+EMBEDDING_L1_MAX_ENTRIES = int(os.getenv("EMBEDDING_L1_MAX_ENTRIES", "2000"))
+EMBEDDING_L1_MAX_BYTES = int(os.getenv("EMBEDDING_L1_MAX_BYTES", str(32 * 1024 * 1024)))
+
+
+class LocalTTLCache:
+    """
+    프로세스 내부 L1 캐시
+    - 항목별 TTL (조회 시 만료 확인)
+    - LRU 방출 (항목 수 / 바이트 예산 초과 시 가장 오래 안 쓴 항목부터)
+    - Copy-on-Read (꺼낸 객체를 수정해도 캐시 원본은 그대로)
+    - hit / miss / eviction / expiration 카운터
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._data: "OrderedDict[str, tuple[float, int, Any]]" = OrderedDict()  # key -> (만료시각, 크기, 값)
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key: str):
+        return self._peek(key) is not None
+
+    def _peek(self, key: str):
+        """카운터/LRU 순서 변경 없이 유효한 항목만 확인"""
+        entry = self._data.get(key)
+        if entry is None or entry[0] <= self._clock():
+            return None
+        return entry
+
+    def _remove(self, key: str):
+        _, size, _ = self._data.pop(key)
+        self._bytes -= size
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, _, value = entry
+        if expires_at <= self._clock():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)  # 최근 사용으로 갱신 (LRU)
+        self.hits += 1
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: Any, ttl: float, size: Optional[int] = None):
+        if ttl <= 0:
+            return
+        if size is None:
+            size = len(json.dumps(value, default=str))
+        if size > self.max_bytes:
+            # 예산보다 큰 단일 항목은 L1에 올리지 않음 (Redis에만 존재)
+            return
+
+        if key in self._data:
+            self._remove(key)
+
+        self._data[key] = (self._clock() + ttl, size, copy.deepcopy(value))
+        self._bytes += size
+
+        while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+            oldest_key = next(iter(self._data))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def delete(self, key: str) -> bool:
+        if key in self._data:
+            self._remove(key)
+            return True
+        return False
+
+    def delete_prefix(self, prefix: str) -> int:
+        return self.delete_where(lambda k: k.startswith(prefix))
+
+    def delete_where(self, predicate: Callable[[str], bool]) -> int:
+        keys = [k for k in self._data if predicate(k)]
+        for k in keys:
+            self._remove(k)
+        return len(keys)
+
+    def clear(self) -> int:
+        count = len(self._data)
+        self._data.clear()
+        self._bytes = 0
+        return count
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+_local_cache = LocalTTLCache(LOCAL_CACHE_MAX_ENTRIES, LOCAL_CACHE_MAX_BYTES)
+
+# 네임스페이스 전용 L1: 임베딩 트래픽이 공용 L1의 리포트/카탈로그 항목을 LRU로 밀어내지 않도록
+_namespace_local_caches: dict[str, LocalTTLCache] = {
+    "embedding": LocalTTLCache(EMBEDDING_L1_MAX_ENTRIES, EMBEDDING_L1_MAX_BYTES),
+}
+
+
+def _local_cache_for(namespace: str) -> LocalTTLCache:
+    """@cached 네임스페이스가 쓰는 L1 (전용이 없으면 공용)"""
+    return _namespace_local_caches.get(namespace, _local_cache)
+
+
+# ---------------------------------------------------------
+# [Metrics] 네임스페이스별 hit/miss + 계층별(L1 / Redis / DB) 지연 히스토그램
+# ---------------------------------------------------------
+
+LATENCY_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+class LatencyHistogram:
+    """고정 버킷(ms) 지연 히스토그램, 백분위는 해당 버킷의 상한값으로 근사"""
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 마지막 칸: 최대 버킷 초과
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, seconds: float):
+        ms = seconds * 1000
+        self.counts[bisect.bisect_left(self.buckets, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return float(self.buckets[i]) if i < len(self.buckets) else self.max_ms
+        return self.max_ms
+
+    def stats(self) -> dict:
+        labels = [f"<={b}ms" for b in self.buckets] + [f">{self.buckets[-1]}ms"]
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max_ms, 3),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+_tier_latency = {"l1": LatencyHistogram(), "redis": LatencyHistogram(), "db": LatencyHistogram()}
+_namespace_metrics: dict[str, dict] = {}
+
+
+def record_latency(tier: str, seconds: float):
+    """계층(l1 / redis / db)별 조회 지연 기록"""
+    _tier_latency[tier].observe(seconds)
+
+
+def _namespace(namespace: str, ttl: Optional[float] = None) -> dict:
+    """네임스페이스 카운터 (없으면 생성)"""
+    return _namespace_metrics.setdefault(namespace, {
+        "ttl": ttl,
+        "l1_hits": 0,
+        "l2_hits": 0,
+        "misses": 0,
+        "loads": 0,
+        "load_time_total": 0.0,
+        "invalidations": 0,
+    })
+
+
+def record_load(namespace: str, seconds: float):
+    """캐시 Miss 후 원본(DB) 조회 1회 기록"""
+    metrics = _namespace(namespace)
+    metrics["loads"] += 1
+    metrics["load_time_total"] += seconds
+    record_latency("db", seconds)
+
+
+def get_latency_stats() -> dict:
+    return {tier: hist.stats() for tier, hist in _tier_latency.items()}
+
+
+def get_namespace_stats() -> dict:
+    """네임스페이스별 통계 (L1/L2 hit, miss, 원본 조회 평균 시간)"""
+    stats = {}
+    for namespace, m in _namespace_metrics.items():
+        total = m["l1_hits"] + m["l2_hits"] + m["misses"]
+        stats[namespace] = {
+            "ttl": m["ttl"],
+            "calls": total,
+            "l1_hits": m["l1_hits"],
+            "l2_hits": m["l2_hits"],
+            "misses": m["misses"],
+            "hit_ratio": round((m["l1_hits"] + m["l2_hits"]) / total, 4) if total else 0.0,
+            "loads": m["loads"],
+            "avg_load_ms": round(m["load_time_total"] / m["loads"] * 1000, 2) if m["loads"] else 0.0,
+            "invalidations": m["invalidations"],
+        }
+    return stats
+
+
+# ---------------------------------------------------------
+# [Codec] Redis 저장용 바이너리 직렬화
+# 헤더(4바이트): b"RC" + 버전(1) + 플래그(하위 4비트: 코덱 ID, 0x10: zstd 압축)
+# 헤더가 없는 값은 예전 방식(json.dumps 텍스트)으로 간주하여 그대로 디코딩
+# ---------------------------------------------------------
+
+_CODEC_MAGIC = b"RC"
+_CODEC_VERSION = 1
+_FLAG_ZSTD = 0x10
+
+# msgpack 확장 타입: date / datetime / Decimal을 원래 타입 그대로 복원
+_EXT_DATE = 1
+_EXT_DATETIME = 2
+_EXT_DECIMAL = 3
+
+
+def _msgpack_default(obj):
+    if isinstance(obj, datetime):
+        return ormsgpack.Ext(_EXT_DATETIME, obj.isoformat().encode())
+    if isinstance(obj, date):
+        return ormsgpack.Ext(_EXT_DATE, obj.isoformat().encode())
+    if isinstance(obj, Decimal):
+        return ormsgpack.Ext(_EXT_DECIMAL, str(obj).encode())
+    return str(obj)
+
+
+def _msgpack_ext_hook(code: int, data: bytes):
+    text = data.decode()
+    if code == _EXT_DATETIME:
+        return datetime.fromisoformat(text)
+    if code == _EXT_DATE:
+        return date.fromisoformat(text)
+    if code == _EXT_DECIMAL:
+        return Decimal(text)
+    return text
+
+
+def _msgpack_encode(data: Any) -> bytes:
+    return ormsgpack.packb(
+        data,
+        default=_msgpack_default,
+        option=ormsgpack.OPT_PASSTHROUGH_DATETIME | ormsgpack.OPT_NON_STR_KEYS,
+    )
+
+
+def _msgpack_decode(payload: bytes) -> Any:
+    return ormsgpack.unpackb(payload, ext_hook=_msgpack_ext_hook)
+
+
+def _orjson_encode(data: Any) -> bytes:
+    # orjson은 date/datetime을 ISO 문자열로 저장 (타입 복원 X, 기존 JSON과 동일한 수준)
+    return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _json_encode(data: Any) -> bytes:
+    return json.dumps(data, default=str, ensure_ascii=False).encode()
+
+
+# 코덱 ID는 헤더에 기록되므로 한 번 정한 번호는 바꾸지 않습니다.
+_CODECS = {
+    "msgpack": (1, _msgpack_encode, _msgpack_decode),
+    "orjson": (2, _orjson_encode, orjson.loads),
+    "json": (3, _json_encode, json.loads),
+}
+_CODECS_BY_ID = {codec_id: (name, decode) for name, (codec_id, _, decode) in _CODECS.items()}
+
+_zstd_compressor = zstandard.ZstdCompressor(level=CACHE_ZSTD_LEVEL)
+_zstd_decompressor = zstandard.ZstdDecompressor()
+
+
+def _encode(data: Any, codec: str = None) -> tuple[bytes, int]:
+    """(헤더 포함 저장용 바이트, 압축 전 크기) 반환"""
+    codec_id, encode, _ = _CODECS[codec or CACHE_CODEC]
+    payload = encode(data)
+    raw_size = len(payload)
+
+    flags = codec_id
+    if raw_size >= CACHE_COMPRESS_THRESHOLD:
+        payload = _zstd_compressor.compress(payload)
+        flags |= _FLAG_ZSTD
+
+    return _CODEC_MAGIC + bytes((_CODEC_VERSION, flags)) + payload, raw_size
+
+
+def encode_value(data: Any, codec: str = None) -> bytes:
+    """캐시 저장용 직렬화 (코덱 + 필요 시 zstd 압축)"""
+    return _encode(data, codec)[0]
+
+
+def _decode(raw: bytes | str) -> tuple[Any, int]:
+    """(역직렬화된 값, 압축 해제 후 크기) 반환"""
+    if isinstance(raw, str):
+        raw = raw.encode()
+    if len(raw) < 4 or raw[:2] != _CODEC_MAGIC or raw[2] != _CODEC_VERSION:
+        return json.loads(raw), len(raw)  # Legacy: json.dumps(data, default=str) 텍스트
+
+    flags = raw[3]
+    payload = raw[4:]
+    if flags & _FLAG_ZSTD:
+        payload = _zstd_decompressor.decompress(payload)
+
+    _, decode = _CODECS_BY_ID[flags & 0x0F]
+    return decode(payload), len(payload)
+
+
+def decode_value(raw: bytes | str) -> Any:
+    """캐시 값 역직렬화 (버전 헤더 확인, 헤더 없는 예전 JSON 값도 지원)"""
+    return _decode(raw)[0]
+
+
+class RedisConnectionManager:
+    """
+    Redis 연결 관리자 (헬스체크 + 지수 백오프 재연결 + 서킷 브레이커)
+
+    - CLOSED   : 정상. 클라이언트 반환, 연속 실패가 임계치를 넘으면 OPEN
+    - OPEN     : 차단. 백오프 시간 동안 Redis를 건너뛰고 L1 메모리만 사용
+    - HALF_OPEN: 백오프 종료 후 PING 1회로 복구 확인 (성공 -> CLOSED, 실패 -> 백오프 2배로 OPEN)
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        client_factory: Callable[[], Any],
+        failure_threshold: int = REDIS_BREAKER_FAILURE_THRESHOLD,
+        base_backoff: float = REDIS_BREAKER_BASE_BACKOFF,
+        max_backoff: float = REDIS_BREAKER_MAX_BACKOFF,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._client_factory = client_factory
+        self._client = None
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._clock = clock
+
+        # 최초 요청 시 PING으로 연결을 확인하도록 HALF_OPEN에서 시작
+        self.state = self.HALF_OPEN
+        self._consecutive_failures = 0
+        self._trips = 0  # 연속 OPEN 횟수 (백오프 지수)
+        self._open_until = 0.0
+        self._probing = False
+        self.total_failures = 0
+        self.total_trips = 0
+
+    async def get_client(self):
+        """사용 가능한 Redis 클라이언트 반환, 차단 중이면 None"""
+        if self.state == self.OPEN:
+            if self._clock() < self._open_until:
+                return None
+            self.state = self.HALF_OPEN
+
+        if self.state == self.HALF_OPEN:
+            if self._probing:
+                return None  # 다른 요청이 복구 확인 중 -> 이번 요청은 메모리만 사용
+            self._probing = True
+            try:
+                if self._client is None:
+                    self._client = self._client_factory()
+                await self._client.ping()
+                print(f"🚀 [Redis] 연결 성공 ({REDIS_URL})")
+                self.record_success()
+            except Exception as e:
+                print(f"⚠️ [Redis] 연결 실패! 메모리 캐시(Local) 모드로 작동합니다. ({str(e)})")
+                self._trip()
+                return None
+            finally:
+                self._probing = False
+
+        return self._client
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self._consecutive_failures = 0
+        self._trips = 0
+
+    def record_failure(self, error: Exception = None):
+        self.total_failures += 1
+        self._consecutive_failures += 1
+        if self.state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+            self._trip()
+
+    def _trip(self):
+        backoff = min(self.max_backoff, self.base_backoff * (2 ** self._trips))
+        self._trips += 1
+        self.total_trips += 1
+        self._consecutive_failures = 0
+        self.state = self.OPEN
+        self._open_until = self._clock() + backoff
+        print(f"🔌 [Redis Breaker] OPEN → {backoff:.1f}s 동안 Redis 우회 (메모리 캐시 사용)")
+
+    async def close(self):
+        if self._client is not None:
+            try:
+                await self._client.aclose()
+            except Exception:
+                pass
+            self._client = None
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._consecutive_failures,
+            "retry_in_sec": round(max(0.0, self._open_until - self._clock()), 2) if self.state == self.OPEN else 0.0,
+            "total_failures": self.total_failures,
+            "total_trips": self.total_trips,
+        }
+
+
+def _create_redis_client():
+    """풀 크기 / 소켓 타임아웃을 명시한 Redis 클라이언트 생성"""
+    pool = redis.ConnectionPool.from_url(
+        REDIS_URL,
+        decode_responses=False,  # 바이너리 코덱(msgpack + zstd) 저장을 위해 bytes 그대로 사용
+        max_connections=REDIS_MAX_CONNECTIONS,
+        socket_timeout=REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=REDIS_CONNECT_TIMEOUT,
+        health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+    )
+    return redis.Redis(connection_pool=pool)
+
+
+_redis_manager = RedisConnectionManager(_create_redis_client)
+
 
 async def get_redis():
-    """Redis 클라이언트 싱글톤 반환"""
-    global _redis_client
-    if _redis_client is None:
+    """Redis 클라이언트 반환 (서킷 브레이커가 열려 있으면 None -> 메모리 캐시 사용)"""
+    return await _redis_manager.get_client()
+
+
+def record_redis_success():
+    _redis_manager.record_success()
+
+
+def record_redis_failure(error: Exception):
+    """Redis 명령 실패를 브레이커에 보고 (연속 실패 시 OPEN)"""
+    _redis_manager.record_failure(error)
+
+
+async def close_redis():
+    """앱 종료 시 Redis 커넥션 풀 정리"""
+    await _redis_manager.close()
+
+
+def get_redis_breaker_stats() -> dict:
+    return _redis_manager.stats()
+
+# ---------------------------------------------------------
+# [Key / Tag] 'report:g{세대}:{store_id}:{날짜}[:{데이터 버전}]'
+# 데이터 버전(매장 워터마크)이 바뀌면 키가 달라져 이전 리포트는 조회되지 않고 TTL로 소멸
+# 지점/날짜별 태그(Set)에 실제 키를 기록해 두고, 무효화 시 KEYS 대신 태그(또는 SCAN)로 대상을 찾음
+# ---------------------------------------------------------
+
+_generation = 0
+_generation_checked_at = float("-inf")
+
+
+async def _current_generation() -> int:
+    """현재 캐시 세대 번호 (REFRESH 주기마다 Redis에서 재확인, Redis 장애 시 마지막 값 유지)"""
+    global _generation, _generation_checked_at
+
+    now = time.monotonic()
+    if now - _generation_checked_at < REPORT_GENERATION_REFRESH:
+        return _generation
+    _generation_checked_at = now
+
+    client = await get_redis()
+    if client:
         try:
-            _redis_client = redis.from_url(REDIS_URL, decode_responses=True)
-            # 연결 확인용 테스트
-            await _redis_client.ping()
-            print("🚀 [Redis] 연결 성공 (localhost:6379)")
-        except Exception:
-            print("⚠️ [Redis] 연결 실패! 메모리 캐시(Local) 모드로 작동합니다.")
-            _redis_client = False # 연결 실패 표시
-    return _redis_client
+            raw = await client.get(REPORT_GENERATION_KEY)
+            record_redis_success()
+            _set_generation(int(raw or 0))
+        except Exception as e:
+            record_redis_failure(e)
+            print(f"❌ [Redis Error] 캐시 세대 조회 실패: {str(e)}")
+    return _generation
 
-def _make_key(store_id: int, target_date: date) -> str:
-    """캐시 키 생성: 'report:1:2025-12-21'"""
-    return f"report:{store_id}:{target_date.isoformat()}"
 
+def _set_generation(generation: int):
+    """세대가 바뀌면 이전 세대의 L1 항목은 더 이상 조회되지 않으므로 바로 비움"""
+    global _generation
+    if generation != _generation:
+        _generation = generation
+        _local_cache.delete_prefix("report:")
 
 
-async def get_report_cache(store_id: int, target_date: date) -> Optional[dict]:
-    """캐시에서 데이터 조회 (Redis or Memory)"""
-    key = _make_key(store_id, target_date)
+def _make_key(store_id: int, target_date: date, generation: int, version: str = "") -> str:
+    """캐시 키 생성: 'report:g0:1:2025-12-21' (버전이 있으면 'report:g0:1:2025-12-21:w1a2b3c4d5e')"""
+    key = f"report:g{generation}:{store_id}:{target_date.isoformat()}"
+    return f"{key}:{version}" if version else key
+
+
+def _parse_key(key: str) -> Optional[tuple[int, date]]:
+    """캐시 키 -> (store_id, 날짜), 리포트 키가 아니면 None"""
+    parts = key.split(":")
+    if len(parts) not in (4, 5) or parts[0] != "report" or not parts[1].startswith("g"):
+        return None
+    try:
+        return int(parts[2]), date.fromisoformat(parts[3])
+    except ValueError:
+        return None
+
+
+def _store_tag(generation: int, store_id: int) -> str:
+    return f"report:g{generation}:tag:store:{store_id}"
+
+
+def _date_tag(generation: int, target_date: date) -> str:
+    return f"report:g{generation}:tag:date:{target_date.isoformat()}"
+
+
+def _key_matcher(store_id: Optional[int], date_from: Optional[date], date_to: Optional[date]) -> Callable[[str], bool]:
+    """무효화 범위(지점 / 날짜 구간)에 해당하는 리포트 키인지 판별하는 함수"""
+    def match(key: str) -> bool:
+        parsed = _parse_key(key)
+        if parsed is None:
+            return False
+        key_store_id, key_date = parsed
+        if store_id is not None and key_store_id != store_id:
+            return False
+        if date_from is not None and key_date < date_from:
+            return False
+        if date_to is not None and key_date > date_to:
+            return False
+        return True
+    return match
+
+
+async def get_report_cache(store_id: int, target_date: date, version: str = "") -> Optional[dict]:
+    """캐시에서 데이터 조회 (L1 Memory -> Redis), version: 데이터 버전 (매장 워터마크)"""
+    key = _make_key(store_id, target_date, await _current_generation(), version)
+    metrics = _namespace("report", REPORT_HARD_TTL)
+
+    # 1. L1(메모리)에서 시도 - 복사본을 돌려주므로 수정해도 캐시 원본은 안전
+    start = time.perf_counter()
+    data = _local_cache.get(key)
+    record_latency("l1", time.perf_counter() - start)
+    if data is not None:
+        print(f"✅ [Local Hit] '{key}' 데이터를 메모리에서 불러왔습니다.")
+        metrics["l1_hits"] += 1
+        data["cached"] = True
+        data["cache_tier"] = "l1"
+        return data
+
+    # 2. Redis에서 시도 (값 + 남은 TTL을 한 번의 왕복으로 조회)
     client = await get_redis()
-    
-    # 1. Redis에서 시도
     if client:
         try:
-            raw_data = await client.get(key)
+            start = time.perf_counter()
+            async with client.pipeline(transaction=False) as pipe:
+                raw_data, ttl_ms = await pipe.get(key).pttl(key).execute()
+            record_latency("redis", time.perf_counter() - start)
+            record_redis_success()
             if raw_data:
                 print(f"⚡ [Redis Hit] '{key}' 데이터를 불러왔습니다.")
-                data = json.loads(raw_data)
+                data, raw_size = _decode(raw_data)
+                # Redis에 남은 TTL만큼 L1에 올려둠 (다음 조회는 네트워크 없이)
+                if ttl_ms and ttl_ms > 0:
+                    _local_cache.set(key, data, ttl_ms / 1000, size=raw_size)
+                metrics["l2_hits"] += 1
                 data["cached"] = True
+                data["cache_tier"] = "redis"
                 return data
         except Exception as e:
+            record_redis_failure(e)
             print(f"❌ [Redis Error] 조회 실패: {str(e)}")
 
-    # 2. Redis 실패 시 메모리에서 시도
-    if key in _local_cache:
-        print(f"✅ [Local Hit] '{key}' 데이터를 메모리에서 불러왔습니다.")
-        data = _local_cache[key]
-        data["cached"] = True
-        return data
-        
+    metrics["misses"] += 1
     return None
 
 
 
-async def set_report_cache(store_id: int, data: Any, target_date: date, ttl: int = 86400):
-    """캐시에 데이터 저장 (Redis & Memory)"""
-    key = _make_key(store_id, target_date)
+async def set_report_cache(
+    store_id: int,
+    data: Any,
+    target_date: date,
+    ttl: int = REPORT_HARD_TTL,
+    version: str = "",
+    cached_at: Optional[float] = None,
+):
+    """
+    캐시에 데이터 저장 (Redis & Memory) + 지점/날짜 태그에 키 등록
+    cached_at: 리포트 생성 시각 (DB에서 다시 올리는 경우 원래 생성 시각, 기본: 지금)
+    """
+    generation = await _current_generation()
+    key = _make_key(store_id, target_date, generation, version)
     client = await get_redis()
-    
-    # JSON 직렬화
-    json_data = json.dumps(data, default=str)
+
+    # 저장 시각 기록 (Stale-While-Revalidate 판단용)
+    data = {**data, "cached_at": cached_at or time.time()}
+
+    # 바이너리 직렬화 (msgpack + 큰 값은 zstd 압축)
+    encoded, raw_size = _encode(data)
     
     # 1. Redis 저장
     if client:
         try:
-            await client.set(key, json_data, ex=ttl)
-            print(f"💾 [Redis Set] '{key}' 저장 완료 (TTL: {ttl}s)")
+            store_tag = _store_tag(generation, store_id)
+            date_tag = _date_tag(generation, target_date)
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.set(key, encoded, ex=ttl)
+                pipe.sadd(store_tag, key).expire(store_tag, REPORT_HARD_TTL)
+                pipe.sadd(date_tag, key).expire(date_tag, REPORT_HARD_TTL)
+                await pipe.execute()
+            record_redis_success()
+            print(f"💾 [Redis Set] '{key}' 저장 완료 ({len(encoded):,} bytes, TTL: {ttl}s)")
         except Exception as e:
+            record_redis_failure(e)
             print(f"❌ [Redis Error] 저장 실패: {str(e)}")
 
-    # 2. 메모리에도 백업 저장
-    _local_cache[key] = data
-    print(f"💾 [Local Set] '{key}' 메모리 저장 완료")
+    # 2. L1 메모리에도 저장 (같은 TTL, 예산 초과 시 LRU 방출)
+    _local_cache.set(key, data, ttl, size=raw_size)
+    print(f"💾 [Local Set] '{key}' 메모리 저장 완료 (TTL: {ttl}s)")
 
-async def get_report_object_cache(store_id: int, target_date: date) -> Optional[dict]:
+async def get_report_object_cache(store_id: int, target_date: date, version: str = "") -> Optional[dict]:
     """캐시에서 'report' 필드만 쏙 뽑아오기 (Service 간결화용)"""
-    cached = await get_report_cache(store_id, target_date)
+    cached = await get_report_cache(store_id, target_date, version)
     return cached.get("report") if cached else None
 
-def clear_local_cache_by_store(store_id: int):
-    """특정 지점의 메모리 캐시(Local) 강제 삭제"""
-    prefix = f"report:{store_id}:"
-    keys_to_delete = [k for k in _local_cache.keys() if k.startswith(prefix)]
-    
-    for k in keys_to_delete:
-        del _local_cache[k]
-        
-    print(f"🗑️ [Local Cache] {store_id}번 지점 관련 메모리 캐시 {len(keys_to_delete)}개 삭제 완료")
+def get_cache_age(data: dict) -> Optional[float]:
+    """캐시 데이터가 저장된 뒤 흐른 시간(초), 저장 시각 정보가 없으면 None"""
+    cached_at = data.get("cached_at") if data else None
+    return max(0.0, time.time() - cached_at) if cached_at else None
+
+
+# ---------------------------------------------------------
+# [Invalidation] 지점 / 날짜 구간 / 전체(세대 증가) 무효화
+# Redis 키는 태그(Set) 또는 SCAN으로 찾아 UNLINK (KEYS처럼 Redis 전체를 막지 않음)
+# 모든 워커의 L1은 Pub/Sub 메시지를 받아 각자 삭제
+# ---------------------------------------------------------
+
+async def _collect_report_keys(client, generation: int, store_id: Optional[int], date_from: Optional[date], date_to: Optional[date]) -> list[bytes]:
+    """무효화 대상 Redis 키 수집 (지점 태그 -> 날짜 태그 -> SCAN 순으로 가장 좁은 방법 선택)"""
+    if store_id is not None:
+        candidates = await client.smembers(_store_tag(generation, store_id))
+    elif date_from is not None and date_to is not None and (date_to - date_from).days <= 366:
+        tags = [_date_tag(generation, date_from + timedelta(days=i)) for i in range((date_to - date_from).days + 1)]
+        candidates = await client.sunion(tags) if tags else set()
+    else:
+        candidates = [k async for k in client.scan_iter(match=f"report:g{generation}:*", count=INVALIDATION_BATCH)]
+
+    match = _key_matcher(store_id, date_from, date_to)
+    return [k for k in candidates if match(k.decode())]
+
+
+async def _unlink_report_keys(client, generation: int, keys: list[bytes]):
+    """키 삭제(UNLINK: 메모리 해제는 백그라운드) + 태그에서 제거, 배치 단위 파이프라인"""
+    for i in range(0, len(keys), INVALIDATION_BATCH):
+        batch = keys[i:i + INVALIDATION_BATCH]
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.unlink(*batch)
+            for key in batch:
+                key_store_id, key_date = _parse_key(key.decode())
+                pipe.srem(_store_tag(generation, key_store_id), key)
+                pipe.srem(_date_tag(generation, key_date), key)
+            await pipe.execute()
+
+
+def _apply_invalidation(message: dict) -> int:
+    """무효화 메시지를 이 워커의 L1에 반영 (발행한 워커 자신도 동일하게 처리)"""
+    local_caches = (_local_cache, *_namespace_local_caches.values())
+    if message.get("cache_key"):
+        return sum(int(cache.delete(message["cache_key"])) for cache in local_caches)
+    if message.get("cache_prefix"):
+        return sum(cache.delete_prefix(message["cache_prefix"]) for cache in local_caches)
+
+    if message.get("generation") is not None:
+        count = _local_cache.delete_prefix("report:")
+        _set_generation(max(_generation, int(message["generation"])))
+        return count
+
+    date_from = date.fromisoformat(message["date_from"]) if message.get("date_from") else None
+    date_to = date.fromisoformat(message["date_to"]) if message.get("date_to") else None
+    return _local_cache.delete_where(_key_matcher(message.get("store_id"), date_from, date_to))
+
+
+async def _publish_invalidation(client, message: dict):
+    try:
+        await client.publish(REPORT_INVALIDATION_CHANNEL, orjson.dumps(message))
+        record_redis_success()
+    except Exception as e:
+        record_redis_failure(e)
+        print(f"❌ [Redis Error] 무효화 메시지 발행 실패: {str(e)}")
+
+
+async def invalidate_reports(store_id: Optional[int] = None, date_from: Optional[date] = None, date_to: Optional[date] = None) -> int:
+    """
+    지점 및/또는 날짜 구간의 리포트 캐시 무효화 (Redis + 모든 워커의 L1)
+    - 범위 지정이 없으면 전체 무효화(invalidate_all_reports)와 동일
+    - 반환값: 삭제된 Redis 키 수
+    """
+    if store_id is None and date_from is None and date_to is None:
+        return await invalidate_all_reports()
+
+    message = {
+        "store_id": store_id,
+        "date_from": date_from.isoformat() if date_from else None,
+        "date_to": date_to.isoformat() if date_to else None,
+    }
+    deleted = 0
+    generation = await _current_generation()
+    client = await get_redis()
+    if client:
+        try:
+            keys = await _collect_report_keys(client, generation, store_id, date_from, date_to)
+            await _unlink_report_keys(client, generation, keys)
+            record_redis_success()
+            deleted = len(keys)
+        except Exception as e:
+            record_redis_failure(e)
+            print(f"❌ [Redis Error] 캐시 무효화 실패: {str(e)}")
+
+    _namespace("report", REPORT_HARD_TTL)["invalidations"] += 1
+
+    # Redis 삭제 후 L1 정리 (순서가 반대면 그 사이 조회가 Redis 값으로 L1을 다시 채울 수 있음)
+    local_count = _apply_invalidation(message)
+    if client:
+        await _publish_invalidation(client, message)
+
+    print(f"🗑️ [Invalidate] store={store_id} {date_from}~{date_to} -> Redis {deleted}개 / Local {local_count}개 삭제")
+    return deleted
+
+
+async def invalidate_store_reports(store_id: int) -> int:
+    """특정 지점의 모든 리포트 캐시 무효화"""
+    return await invalidate_reports(store_id=store_id)
+
+
+async def invalidate_all_reports() -> int:
+    """
+    전체 리포트 캐시 무효화: 세대 번호를 올려 기존 키를 한 번에 무효화 (O(1))
+    - 이전 세대 키는 조회되지 않고 HARD TTL 후 Redis에서 자연 소멸
+    - 반환값: 새 세대 번호 (Redis 미연결 시 현재 워커 L1만 비우고 현재 세대 반환)
+    """
+    _namespace("report", REPORT_HARD_TTL)["invalidations"] += 1
+
+    client = await get_redis()
+    if client:
+        try:
+            generation = await client.incr(REPORT_GENERATION_KEY)
+            record_redis_success()
+            local_count = _apply_invalidation({"generation": generation})
+            await _publish_invalidation(client, {"generation": generation})
+            print(f"🗑️ [Invalidate] 전체 리포트 캐시 무효화 -> 세대 g{generation} (Local {local_count}개 삭제)")
+            return generation
+        except Exception as e:
+            record_redis_failure(e)
+            print(f"❌ [Redis Error] 캐시 세대 증가 실패: {str(e)}")
+
+    local_count = _local_cache.delete_prefix("report:")
+    print(f"🗑️ [Invalidate] Redis 미연결 - 이 워커의 리포트 메모리 캐시 {local_count}개만 삭제")
+    return _generation
+
+
+# ---------------------------------------------------------
+# [Pub/Sub Listener] 다른 워커가 보낸 무효화 메시지를 받아 L1 반영
+# 구독 전용 연결은 응답 대기가 길어 일반 풀(짧은 socket_timeout)과 분리
+# ---------------------------------------------------------
+
+_invalidation_listener: Optional[asyncio.Task] = None
+
+
+async def _listen_invalidations():
+    global _generation_checked_at
+
+    failures = 0
+    while True:
+        subscriber = redis.Redis.from_url(
+            REDIS_URL,
+            decode_responses=False,
+            socket_connect_timeout=REDIS_CONNECT_TIMEOUT,
+            health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+        )
+        try:
+            async with subscriber.pubsub() as pubsub:
+                await pubsub.subscribe(REPORT_INVALIDATION_CHANNEL)
+                if failures:
+                    # 끊겨 있던 동안 놓친 메시지가 있을 수 있으므로 L1을 비우고 세대 번호 재확인
+                    _local_cache.delete_prefix("report:")
+                    _generation_checked_at = float("-inf")
+                failures = 0
+                print(f"📡 [Pub/Sub] '{REPORT_INVALIDATION_CHANNEL}' 구독 시작")
+
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    try:
+                        _apply_invalidation(orjson.loads(message["data"]))
+                    except Exception as e:
+                        print(f"⚠️ [Pub/Sub] 잘못된 무효화 메시지 무시: {str(e)}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            failures += 1
+            delay = min(REDIS_BREAKER_MAX_BACKOFF, REDIS_BREAKER_BASE_BACKOFF * (2 ** (failures - 1)))
+            print(f"❌ [Pub/Sub] 구독 끊김 ({str(e)}), {delay:.0f}초 후 재연결")
+            await asyncio.sleep(delay)
+        finally:
+            await subscriber.aclose()
+
+
+def start_invalidation_listener():
+    """앱 시작 시 호출: 무효화 메시지 구독 태스크 시작"""
+    global _invalidation_listener
+    if _invalidation_listener is None or _invalidation_listener.done():
+        _invalidation_listener = asyncio.create_task(_listen_invalidations())
+
+
+async def stop_invalidation_listener():
+    """앱 종료 시 호출: 구독 태스크 정리"""
+    global _invalidation_listener
+    if _invalidation_listener is not None:
+        _invalidation_listener.cancel()
+        # 구독 연결 정리가 늦어져도 종료를 붙잡지 않도록 대기 시간 제한
+        await asyncio.wait({_invalidation_listener}, timeout=1.0)
+        _invalidation_listener = None
+
+
+def get_local_cache_stats() -> dict:
+    """L1 메모리 캐시 통계 (항목 수, 바이트, hit/miss/eviction), 전용 L1은 dedicated 아래에"""
+    return {
+        **_local_cache.stats(),
+        "dedicated": {namespace: cache.stats() for namespace, cache in _namespace_local_caches.items()},
+    }
+
+
+# ---------------------------------------------------------
+# [Single-Flight] 같은 키에 대한 동시 생성 요청 병합
+# 1) 프로세스 내부: 먼저 온 요청만 producer를 실행하고 나머지는 같은 Task를 기다림
+# 2) 워커 간: Redis 락(SET NX PX)을 잡은 워커만 생성, 나머지는 캐시에 결과가 올라올 때까지 대기
+# ---------------------------------------------------------
+
+SINGLE_FLIGHT_LOCK_TTL = float(os.getenv("SINGLE_FLIGHT_LOCK_TTL", "120"))  # 초 (리포트 생성 최대 소요 시간)
+SINGLE_FLIGHT_POLL_INTERVAL = 0.5
+
+_inflight: dict[str, asyncio.Task] = {}
+
+# 내가 잡은 락일 때만 삭제 (다른 워커가 TTL 만료 후 새로 잡은 락을 지우지 않도록)
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+else
+    return 0
+end
+"""
+
+
+async def _run_with_distributed_lock(
+    key: str,
+    producer: Callable[[], Awaitable[Any]],
+    wait_for: Optional[Callable[[], Awaitable[Any]]],
+    lock_ttl: float,
+):
+    client = await get_redis()
+    if not client:
+        return await producer()
+
+    lock_key = f"lock:{key}"
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + lock_ttl
+
+    while True:
+        try:
+            acquired = await client.set(lock_key, token, nx=True, px=int(lock_ttl * 1000))
+        except Exception as e:
+            record_redis_failure(e)
+            print(f"❌ [Redis Error] 락 획득 실패, 단독 실행: {str(e)}")
+            return await producer()
+
+        if acquired:
+            try:
+                return await producer()
+            finally:
+                try:
+                    await client.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+                except Exception as e:
+                    record_redis_failure(e)
+                    print(f"❌ [Redis Error] 락 해제 실패 (TTL 만료로 자동 해제): {str(e)}")
+
+        # 다른 워커가 생성 중 -> 결과가 캐시에 올라올 때까지 폴링
+        print(f"⏳ [Single-Flight] '{key}' 다른 워커가 생성 중, 결과 대기")
+        lock_released = False
+        while time.monotonic() < deadline:
+            await asyncio.sleep(SINGLE_FLIGHT_POLL_INTERVAL)
+            if wait_for:
+                result = await wait_for()
+                if result is not None:
+                    return result
+            try:
+                if not await client.exists(lock_key):
+                    lock_released = True
+                    break
+            except Exception as e:
+                record_redis_failure(e)
+                break
+
+        if not lock_released:
+            # 락 보유 워커가 응답 없음 -> 직접 생성
+            print(f"⚠️ [Single-Flight] '{key}' 대기 시간 초과, 직접 생성")
+            return await producer()
+        # 락은 풀렸는데 결과가 없음(생성 실패/불량 리포트) -> 락 재획득 시도
+
+
+async def single_flight(
+    key: str,
+    producer: Callable[[], Awaitable[Any]],
+    wait_for: Optional[Callable[[], Awaitable[Any]]] = None,
+    lock_ttl: float = SINGLE_FLIGHT_LOCK_TTL,
+    distributed: bool = True,
+):
+    """
+    같은 key로 동시에 들어온 요청을 하나의 producer 실행으로 병합합니다.
+
+    Args:
+        key: 병합 기준 키 (예: 'report:1:2025-12-21')
+        producer: 실제 생성 작업 (한 번만 실행됨)
+        wait_for: 다른 워커가 생성 중일 때 결과를 확인하는 함수 (예: 캐시 조회)
+        lock_ttl: Redis 락 유지 시간 (초)
+        distributed: False면 Redis 락 없이 프로세스 내부 병합만 (가벼운 조회용)
+
+    Returns:
+        producer 결과의 복사본 (호출자끼리 같은 객체를 공유하지 않도록)
+    """
+    task = _inflight.get(key)
+    if task is None:
+        if distributed:
+            task = asyncio.ensure_future(_run_with_distributed_lock(key, producer, wait_for, lock_ttl))
+        else:
+            task = asyncio.ensure_future(producer())
+        _inflight[key] = task
+        task.add_done_callback(lambda _t: _inflight.pop(key, None))
+    else:
+        print(f"🔗 [Single-Flight] '{key}' 진행 중인 생성 작업에 합류")
+
+    # shield: 요청 하나가 취소(클라이언트 이탈)돼도 공유 작업은 계속 진행
+    result = await asyncio.shield(task)
+    return copy.deepcopy(result)
+
+
+
+# ---------------------------------------------------------
+# [@cached] 자주 읽고 드물게 바뀌는 조회 함수용 캐시 데코레이터
+# - 키: 'cache:{namespace}:{인자}' (인자가 길면 해시)
+# - L1(메모리) -> L2(Redis) -> 원본 함수 순서, 동시 Miss는 프로세스 내부에서 병합
+# - func.invalidate(*args) / func.invalidate_all() 로 모든 워커에서 무효화 (Pub/Sub)
+# ---------------------------------------------------------
+
+def _default_key_builder(signature: inspect.Signature, args: tuple, kwargs: dict) -> str:
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    raw = ":".join(str(v) for v in bound.arguments.values())
+    if not raw:
+        return "all"
+    return raw if len(raw) <= 64 else hashlib.sha1(raw.encode()).hexdigest()
+
+
+def cached(namespace: str, ttl: int = CACHED_DEFAULT_TTL, key_builder: Optional[Callable[..., str]] = None):
+    """
+    비동기 조회 함수 결과를 L1/L2에 캐싱하는 데코레이터
+
+    Args:
+        namespace: 캐시 키 접두어 겸 통계 이름 (예: 'stores')
+        ttl: 캐시 유지 시간 (초)
+        key_builder: 인자 -> 키 문자열 함수 (기본: 인자 값을 ':'로 연결)
+
+    사용 예:
+        @cached("daily_sales", ttl=600)
+        async def select_daily_sales_by_store(store_id: int): ...
+
+        await select_daily_sales_by_store.invalidate(store_id)  # 특정 인자만
+        await select_daily_sales_by_store.invalidate_all()      # 네임스페이스 전체
+    """
+    prefix = f"cache:{namespace}:"
+
+    def decorator(func):
+        signature = inspect.signature(func)
+        metrics = _namespace(namespace, ttl)
+        local_cache = _local_cache_for(namespace)
+
+        def make_key(*args, **kwargs) -> str:
+            suffix = key_builder(*args, **kwargs) if key_builder else _default_key_builder(signature, args, kwargs)
+            return prefix + suffix
+
+        async def load(key: str, args: tuple, kwargs: dict):
+            start = time.perf_counter()
+            result = await func(*args, **kwargs)
+            record_load(namespace, time.perf_counter() - start)
+
+            # None(조회 실패/없음)은 캐싱하지 않음
+            if result is not None:
+                encoded, raw_size = _encode(result)
+                client = await get_redis()
+                if client:
+                    try:
+                        await client.set(key, encoded, ex=ttl)
+                        record_redis_success()
+                    except Exception as e:
+                        record_redis_failure(e)
+                        print(f"❌ [Redis Error] '{key}' 저장 실패: {str(e)}")
+                local_cache.set(key, result, ttl, size=raw_size)
+            return result
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = make_key(*args, **kwargs)
+
+            # 1. L1
+            start = time.perf_counter()
+            data = local_cache.get(key)
+            record_latency("l1", time.perf_counter() - start)
+            if data is not None:
+                metrics["l1_hits"] += 1
+                return data
+
+            # 2. L2 (값 + 남은 TTL)
+            client = await get_redis()
+            if client:
+                try:
+                    start = time.perf_counter()
+                    async with client.pipeline(transaction=False) as pipe:
+                        raw_data, ttl_ms = await pipe.get(key).pttl(key).execute()
+                    record_latency("redis", time.perf_counter() - start)
+                    record_redis_success()
+                    if raw_data:
+                        data, raw_size = _decode(raw_data)
+                        if ttl_ms and ttl_ms > 0:
+                            local_cache.set(key, data, ttl_ms / 1000, size=raw_size)
+                        metrics["l2_hits"] += 1
+                        return data
+                except Exception as e:
+                    record_redis_failure(e)
+                    print(f"❌ [Redis Error] '{key}' 조회 실패: {str(e)}")
+
+            # 3. 원본 함수 (동시 Miss는 한 번만 실행)
+            metrics["misses"] += 1
+            return await single_flight(key, lambda: load(key, args, kwargs), distributed=False)
+
+        async def invalidate(*args, **kwargs):
+            """해당 인자의 캐시만 무효화"""
+            key = make_key(*args, **kwargs)
+            metrics["invalidations"] += 1
+            client = await get_redis()
+            if client:
+                try:
+                    await client.unlink(key)
+                    record_redis_success()
+                except Exception as e:
+                    record_redis_failure(e)
+                    print(f"❌ [Redis Error] '{key}' 무효화 실패: {str(e)}")
+            _apply_invalidation({"cache_key": key})
+            if client:
+                await _publish_invalidation(client, {"cache_key": key})
+
+        async def invalidate_all():
+            """네임스페이스 전체 캐시 무효화 (SCAN + UNLINK)"""
+            metrics["invalidations"] += 1
+            client = await get_redis()
+            if client:
+                try:
+                    keys = [k async for k in client.scan_iter(match=prefix + "*", count=INVALIDATION_BATCH)]
+                    for i in range(0, len(keys), INVALIDATION_BATCH):
+                        await client.unlink(*keys[i:i + INVALIDATION_BATCH])
+                    record_redis_success()
+                except Exception as e:
+                    record_redis_failure(e)
+                    print(f"❌ [Redis Error] '{prefix}*' 무효화 실패: {str(e)}")
+            count = _apply_invalidation({"cache_prefix": prefix})
+            if client:
+                await _publish_invalidation(client, {"cache_prefix": prefix})
+            print(f"🗑️ [Invalidate] '{namespace}' 캐시 무효화 (Local {count}개 삭제)")
+
+        wrapper.invalidate = invalidate
+        wrapper.invalidate_all = invalidate_all
+        wrapper.cache_key = make_key
+        return wrapper
+
+    return decorator
+
+
+
+async def get_redis_memory_stats() -> Optional[dict]:
+    """Redis 서버 메모리 / 방출 / 키 수 (연결 불가 시 None)"""
+    client = await get_redis()
+    if not client:
+        return None
+    try:
+        memory = await client.info("memory")
+        server_stats = await client.info("stats")
+        keys = await client.dbsize()
+        record_redis_success()
+    except Exception as e:
+        record_redis_failure(e)
+        print(f"❌ [Redis Error] INFO 조회 실패: {str(e)}")
+        return None
 
+    return {
+        "keys": keys,
+        "used_memory": memory.get("used_memory"),
+        "used_memory_human": memory.get("used_memory_human"),
+        "maxmemory": memory.get("maxmemory"),
+        "maxmemory_policy": memory.get("maxmemory_policy"),
+        "evicted_keys": server_stats.get("evicted_keys"),
+        "expired_keys": server_stats.get("expired_keys"),
+        "keyspace_hits": server_stats.get("keyspace_hits"),
+        "keyspace_misses": server_stats.get("keyspace_misses"),
+    }
 
-def clear_all_local_cache():
-    """모든 메모리 캐시(Local) 강제 삭제"""
-    count = len(_local_cache)
-    _local_cache.clear()
-    print(f"🗑️ [Local Cache] 전체 메모리 캐시 {count}개 삭제 완료")
 
+async def get_cache_stats() -> dict:
+    """
+    캐시 전체 현황 (/admin/cache/stats)
+    - namespaces: 네임스페이스별 hit/miss
+    - latency: L1 / Redis / DB 계층별 지연 히스토그램
+    - local: 이 워커의 L1 항목 수 / 바이트 / 방출
+    - redis: 서킷 브레이커 상태 + 서버 메모리 / 방출
+    """
+    return {
+        "namespaces": get_namespace_stats(),
+        "latency": get_latency_stats(),
+        "local": get_local_cache_stats(),
+        "redis": {
+            "breaker": get_redis_breaker_stats(),
+            "server": await get_redis_memory_stats(),
+        },
+    }
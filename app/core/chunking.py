@@ -0,0 +1,158 @@
+import os
+import re
+import hashlib
+from psycopg import sql
+from app.clients.openai import EMBEDDING_MODEL, embed_texts
+from app.core.cache import cached
+from app.core.db import fetch_all, get_pool, to_vector
+
+# ---------------------------------------------------------
+# [Chunking] 매뉴얼/정책 본문 -> 검색용 조각(passage) + 변경분만 임베딩하는 동기화 파이프라인
+# - 조각 = 문장/단계 단위로 나눈 뒤 CHUNK_MAX_CHARS 이하로 묶은 본문 일부
+# - content_hash(모델 + 분류 + 임베딩 입력)가 같으면 재임베딩/갱신 생략 -> 문서 1개 수정 시 그 조각만 API 호출
+# - 문서가 지워지거나 조각 수가 줄면 남는 조각 삭제
+# ---------------------------------------------------------
+
+CHUNK_MAX_CHARS = int(os.getenv("CHUNK_MAX_CHARS", "400"))
+CORPUS_VERSION_TTL = int(os.getenv("CORPUS_VERSION_TTL", "60"))  # sync_chunks가 무효화하므로 SQL 직접 수정 대비용
+
+# 원본 테이블 -> 조각 테이블 / 문서 ID 컬럼 / 임베딩 입력 머리말
+CHUNK_SOURCES = {
+    "manuals": {"chunk_table": "manual_chunks", "id_column": "manual_id", "label": "매뉴얼"},
+    "policies": {"chunk_table": "policy_chunks", "id_column": "policy_id", "label": "정책"},
+}
+
+# 문장 끝(. ! ?) 뒤 공백에서 나눔, "1. 포터필터" 같은 번호 뒤의 마침표는 제외
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[^\d\s][.!?])\s+")
+
+
+def split_passages(text: str, max_chars: int = CHUNK_MAX_CHARS) -> list[str]:
+    """본문 -> 조각 목록 (줄/문장 경계를 유지하며 max_chars 이하로 묶음, 한 문장이 너무 길면 글자 수로 자름)"""
+    units = []  # (문장, 줄의 첫 문장 여부)
+    for line in text.splitlines():
+        for i, sentence in enumerate(_SENTENCE_BOUNDARY.split(line.strip())):
+            while len(sentence) > max_chars:
+                units.append((sentence[:max_chars], i == 0))
+                sentence, i = sentence[max_chars:], 1
+            if sentence:
+                units.append((sentence, i == 0))
+
+    passages, current = [], ""
+    for unit, starts_line in units:
+        if current and len(current) + 1 + len(unit) > max_chars:
+            passages.append(current)
+            current = unit
+        elif current:
+            current += ("\n" if starts_line else " ") + unit
+        else:
+            current = unit
+    if current:
+        passages.append(current)
+    return passages
+
+
+def build_chunks(source: str, docs: list[dict], max_chars: int = CHUNK_MAX_CHARS) -> list[dict]:
+    """원본 문서 행 -> 조각 행 (embedding 제외, 임베딩 입력 텍스트와 해시 포함)"""
+    config = CHUNK_SOURCES[source]
+    chunks = []
+    for doc in docs:
+        for chunk_no, passage in enumerate(split_passages(doc["content"], max_chars)):
+            embed_input = f"{config['label']}: {doc['title']}\n{passage}"
+            digest = hashlib.sha256(f"{EMBEDDING_MODEL}\n{doc['category']}\n{embed_input}".encode()).hexdigest()
+            chunks.append({
+                "doc_id": doc[config["id_column"]],
+                "chunk_no": chunk_no,
+                "category": doc["category"],
+                "title": doc["title"],
+                "content": passage,
+                "content_hash": digest,
+                "embed_input": embed_input,
+            })
+    return chunks
+
+
+async def sync_chunks(source: str, doc_ids: list[int] | None = None) -> dict:
+    """
+    원본 테이블과 조각 테이블 동기화 (doc_ids를 주면 해당 문서만)
+
+    Returns:
+        {"docs", "chunks", "embedded", "unchanged", "deleted"}
+    """
+    if source not in CHUNK_SOURCES:
+        raise ValueError(f"sync_chunks: 지원하지 않는 원본 테이블 '{source}'")
+    config = CHUNK_SOURCES[source]
+    id_column = sql.Identifier(config["id_column"])
+    chunk_table = sql.Identifier(config["chunk_table"])
+    where = sql.SQL("WHERE {} = ANY(%s)").format(id_column) if doc_ids is not None else sql.SQL("")
+    params = (list(doc_ids),) if doc_ids is not None else ()
+
+    docs = await fetch_all(
+        sql.SQL("SELECT {id}, category, title, content FROM {table} {where}").format(
+            id=id_column, table=sql.Identifier(source), where=where
+        ),
+        params,
+    )
+    existing = await fetch_all(
+        sql.SQL("SELECT {id} AS doc_id, chunk_no, content_hash FROM {table} {where}").format(
+            id=id_column, table=chunk_table, where=where
+        ),
+        params,
+    )
+    existing_hashes = {(row["doc_id"], row["chunk_no"]): row["content_hash"] for row in existing}
+
+    chunks = build_chunks(source, docs)
+    changed = [c for c in chunks if existing_hashes.get((c["doc_id"], c["chunk_no"])) != c["content_hash"]]
+    stale = existing_hashes.keys() - {(c["doc_id"], c["chunk_no"]) for c in chunks}
+
+    # 임베딩 API는 변경된 조각만, 배치 단위로 호출 (DB 트랜잭션 밖에서 먼저 수행)
+    vectors = await embed_texts([c["embed_input"] for c in changed]) if changed else []
+
+    upsert = sql.SQL("""
+        INSERT INTO {table} ({id}, chunk_no, category, title, content, content_hash, embedding, updated_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %b, now())
+        ON CONFLICT ({id}, chunk_no) DO UPDATE
+        SET category = EXCLUDED.category,
+            title = EXCLUDED.title,
+            content = EXCLUDED.content,
+            content_hash = EXCLUDED.content_hash,
+            embedding = EXCLUDED.embedding,
+            updated_at = now()
+    """).format(table=chunk_table, id=id_column)
+    delete = sql.SQL("DELETE FROM {table} WHERE {id} = %s AND chunk_no = %s").format(table=chunk_table, id=id_column)
+
+    async with get_pool().connection() as conn:
+        async with conn.transaction():
+            async with conn.cursor() as cur:
+                if changed:
+                    await cur.executemany(upsert, [
+                        (c["doc_id"], c["chunk_no"], c["category"], c["title"], c["content"], c["content_hash"], to_vector(v))
+                        for c, v in zip(changed, vectors)
+                    ])
+                if stale:
+                    await cur.executemany(delete, sorted(stale))
+
+    if changed or stale:
+        # 이 코퍼스를 근거로 한 시맨틱 답변 캐시 무효화 (모든 워커)
+        await get_corpus_version.invalidate(source)
+
+    stats = {
+        "docs": len(docs),
+        "chunks": len(chunks),
+        "embedded": len(changed),
+        "unchanged": len(chunks) - len(changed),
+        "deleted": len(stale),
+    }
+    print(f"🧩 [Chunking] '{source}' 동기화 완료 {stats}")
+    return stats
+
+
+@cached("corpus_version", ttl=CORPUS_VERSION_TTL)
+async def get_corpus_version(source: str) -> str:
+    """조각 테이블 버전 (content_hash 전체의 md5) - 조각이 추가/수정/삭제되면 값이 바뀜"""
+    config = CHUNK_SOURCES[source]
+    query = sql.SQL("""
+        SELECT md5(COALESCE(string_agg(content_hash, ',' ORDER BY {id}, chunk_no), '')) AS version
+        FROM {table}
+    """).format(id=sql.Identifier(config["id_column"]), table=sql.Identifier(config["chunk_table"]))
+    rows = await fetch_all(query)
+    return rows[0]["version"]
@@ -1,6 +1,10 @@
 
+import re
+import numpy as np
+from psycopg import AsyncConnection, sql
 from psycopg.rows import dict_row
 from psycopg_pool import AsyncConnectionPool
+from pgvector.psycopg import register_vector_async
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 pool: AsyncConnectionPool
@@ -17,8 +21,9 @@ database_url = f"postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@
 
 # SQLAlchemy는 "postgresql://"만 주면 기본적으로 psycopg2를 찾으므로,
 # 설치된 psycopg(v3)를 사용하도록 스키마를 명시해줍니다.
+# echo=True는 모든 SQL을 로그로 찍어 I/O를 잡아먹으므로 필요할 때만 켭니다. (DB_ECHO=true)
 engine = create_engine(database_url.replace(
-    "postgresql://", "postgresql+psycopg://"), echo=True)
+    "postgresql://", "postgresql+psycopg://"), echo=os.getenv("DB_ECHO", "false").lower() == "true")
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -27,20 +32,35 @@ SessionLocal = sessionmaker(
 )
 
 base = declarative_base()
+
+# pgvector HNSW 인덱스 파라미터 (embedding 컬럼 공통)
+# - m / ef_construction: 인덱스 생성 시 그래프 밀도 (클수록 정확하지만 생성 느림, 메모리 증가)
+# - ef_search: 조회 시 탐색 폭 (클수록 recall 증가, 지연 증가), 쿼리마다 SET LOCAL로 지정
+VECTOR_HNSW_M = int(os.getenv("VECTOR_HNSW_M", "16"))
+VECTOR_HNSW_EF_CONSTRUCTION = int(os.getenv("VECTOR_HNSW_EF_CONSTRUCTION", "64"))
+VECTOR_EF_SEARCH = int(os.getenv("VECTOR_EF_SEARCH", "40"))
+# 하이브리드(키워드 + 벡터) 검색: 각 검색기에서 뽑을 후보 수 / RRF 상수 (1 / (k + 순위))
+HYBRID_CANDIDATES = int(os.getenv("HYBRID_CANDIDATES", "20"))
+HYBRID_RRF_K = int(os.getenv("HYBRID_RRF_K", "60"))
 # Import models directly so Base.metadata is populated for Alembic autogenerate.
 
 # 새 모델이 생기면 아래에 추가하세요.
 
 from app.menu.menu_schema import Menu  # noqa: F401
 # from app.user.user_schema import User  # noqa: F401
-from app.store.store_schema import Store  # noqa: F401
+from app.store.store_schema import Store, StoreWatermark  # noqa: F401
 from app.review.review_schema import Review  # noqa: F401
 from app.order.order_schema import Order  # noqa: F401
 from app.sales.sales_schema import SalesDaily  # noqa: F401
 from app.report.report_schema import StoreReport  # noqa: F401
-from app.manual.manual_schema import Manual  # noqa: F401
+from app.manual.manual_schema import Manual, ManualChunk  # noqa: F401
 from app.inquiry.inquiry_schema import StoreInquiry  # noqa: F401
-from app.policy.policy_schema import Policy  # noqa: F401
+from app.policy.policy_schema import Policy, PolicyChunk  # noqa: F401
+
+
+async def _configure_connection(conn: AsyncConnection):
+    # pgvector 타입 등록: 벡터를 '[0.1, ...]' 문자열이 아닌 바이너리 파라미터로 주고받음
+    await register_vector_async(conn)
 
 
 async def init_pool():
@@ -51,6 +71,7 @@ async def init_pool():
         min_size=1,
         max_size=50,
         open=False,
+        configure=_configure_connection,
     )
     await pool.open()
     print("🔥 DB pool initialized")
@@ -70,17 +91,19 @@ def get_pool() -> AsyncConnectionPool:
     return pool
 
 
-async def fetch_one(sql: str, params=()) -> dict | None:
+# prepare: True면 서버 측 prepared statement로 즉시 실행 (커넥션별 캐시, 반복되는 고정 SQL용)
+#          None이면 psycopg 기본값 (같은 SQL이 prepare_threshold회 이상 실행되면 자동 prepare)
+async def fetch_one(sql: str, params=(), prepare: bool | None = None) -> dict | None:
     async with pool.connection() as conn:
         async with conn.cursor() as cur:
-            await cur.execute(sql, params)
+            await cur.execute(sql, params, prepare=prepare)
             return await cur.fetchone()
 
 
-async def fetch_all(sql: str, params=()) -> list[dict]:
+async def fetch_all(sql: str, params=(), prepare: bool | None = None) -> list[dict]:
     async with pool.connection() as conn:
         async with conn.cursor() as cur:
-            await cur.execute(sql, params)
+            await cur.execute(sql, params, prepare=prepare)
             return await cur.fetchall()
 
 
@@ -107,6 +130,237 @@ async def execute_return(sql: str, params=()) -> dict | None:
             print("execute_insert 실행 실패", e)
             await conn.rollback()
 
+# ---------------------------------------------------------
+# [Vector Search] pgvector 유사도 검색 공용 헬퍼
+# - 벡터는 %b(바이너리) 파라미터로 전송 -> SQL 문자열이 매번 같아 Prepared Statement 재사용 가능
+# - 테이블/컬럼은 화이트리스트로 제한 (식별자는 psycopg.sql로 안전하게 조립)
+# ---------------------------------------------------------
+
+# 테이블 -> 조회/필터 허용 컬럼 (embedding 컬럼 자체는 응답에서 제외)
+VECTOR_SEARCH_TABLES = {
+    "manuals": ("manual_id", "category", "title", "content"),
+    "policies": ("policy_id", "category", "title", "content"),
+    "reviews": ("review_id", "store_id", "menu_id", "rating", "review_text", "created_at"),
+    "menus": ("menu_id", "menu_name", "category", "description"),
+    "manual_chunks": ("chunk_id", "manual_id", "chunk_no", "category", "title", "content"),
+    "policy_chunks": ("chunk_id", "policy_id", "chunk_no", "category", "title", "content"),
+    "store_inquiries": ("inquiry_id", "store_id", "category", "question", "answer", "created_at", "corpus_version"),
+}
+
+# 임베딩 컬럼 이름이 embedding이 아닌 테이블
+VECTOR_EMBEDDING_COLUMNS = {
+    "store_inquiries": "question_embedding",
+}
+
+
+def to_vector(values) -> np.ndarray:
+    """임베딩(list[float]) -> pgvector 바이너리 전송용 float32 배열"""
+    return np.asarray(values, dtype=np.float32)
+
+
+async def vector_search(
+    table: str,
+    vector,
+    k: int = 5,
+    filters: dict | None = None,
+    columns: tuple | None = None,
+    ef_search: int | None = None,
+    exact: bool = False,
+    not_null: tuple = (),
+) -> list[dict]:
+    """
+    코사인 거리(<=>) 기준 Top-K 검색
+
+    Args:
+        table: VECTOR_SEARCH_TABLES 중 하나
+        vector: 질문 임베딩
+        k: 반환 개수
+        filters: {컬럼: 값} 동등 조건 (값이 list/tuple이면 ANY)
+        columns: 반환 컬럼 (기본: 테이블의 허용 컬럼 전체)
+        ef_search: HNSW 탐색 폭 (기본: VECTOR_EF_SEARCH, k보다 작으면 k로 맞춤)
+        exact: True면 인덱스를 쓰지 않는 정확 검색 (recall 검증/벤치마크용)
+        not_null: 값이 있어야 하는 컬럼 (IS NOT NULL 조건)
+
+    Returns:
+        [{...columns, "distance": float}] (distance가 작을수록 유사)
+    """
+    if table not in VECTOR_SEARCH_TABLES:
+        raise ValueError(f"vector_search: 허용되지 않은 테이블 '{table}'")
+    allowed = VECTOR_SEARCH_TABLES[table]
+    columns = columns or allowed
+    for col in [*columns, *(filters or {}), *not_null]:
+        if col not in allowed:
+            raise ValueError(f"vector_search: '{table}' 테이블에 허용되지 않은 컬럼 '{col}'")
+    embedding = sql.Identifier(VECTOR_EMBEDDING_COLUMNS.get(table, "embedding"))
+
+    conditions = [sql.SQL("{} IS NOT NULL").format(embedding)]
+    conditions += [sql.SQL("{} IS NOT NULL").format(sql.Identifier(col)) for col in not_null]
+    params: list = [to_vector(vector)]
+    for col, value in (filters or {}).items():
+        if isinstance(value, (list, tuple, set)):
+            conditions.append(sql.SQL("{} = ANY(%s)").format(sql.Identifier(col)))
+            params.append(list(value))
+        else:
+            conditions.append(sql.SQL("{} = %s").format(sql.Identifier(col)))
+            params.append(value)
+    params.append(k)
+
+    query = sql.SQL("""
+        SELECT {columns}, {embedding} <=> %b AS distance
+        FROM {table}
+        WHERE {conditions}
+        ORDER BY distance
+        LIMIT %s
+    """).format(
+        columns=sql.SQL(", ").join(map(sql.Identifier, columns)),
+        embedding=embedding,
+        table=sql.Identifier(table),
+        conditions=sql.SQL(" AND ").join(conditions),
+    )
+
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            # SET LOCAL: 이 트랜잭션(쿼리)에만 적용되고 풀에 반환될 때 원복
+            if exact:
+                await cur.execute("SET LOCAL enable_indexscan = off")
+            else:
+                ef = max(ef_search or VECTOR_EF_SEARCH, k)
+                await cur.execute(sql.SQL("SET LOCAL hnsw.ef_search = {}").format(sql.Literal(ef)))
+            await cur.execute(query, params)
+            return await cur.fetchall()
+
+
+# ---------------------------------------------------------
+# [Hybrid Search] 키워드(Full-Text + Trigram) + 벡터 검색을 RRF로 합친 검색 (매뉴얼/정책)
+# - "제빙기 필터"처럼 고유 명사가 들어간 질문은 키워드 일치가, 표현이 다른 질문은 벡터가 잘 찾음
+# - 두 후보 목록을 CTE로 만들고 순위만으로 합산 -> 점수 스케일 차이와 무관, DB 왕복 1번
+# - 인덱스: to_tsvector('simple', title || ' ' || content) GIN + 같은 문자열의 gin_trgm_ops
+# ---------------------------------------------------------
+
+# 테이블 -> 키워드 검색 대상 텍스트 컬럼 (마이그레이션의 인덱스 표현식과 같아야 인덱스를 탐)
+HYBRID_TEXT_COLUMNS = {
+    "manuals": ("title", "content"),
+    "policies": ("title", "content"),
+    "manual_chunks": ("title", "content"),
+    "policy_chunks": ("title", "content"),
+}
+
+
+def lexical_terms(text: str, max_terms: int = 10) -> list[str]:
+    """질문 -> 키워드 목록 (소문자, 2글자 이상, 중복 제거, 문장부호/밑줄 제외)"""
+    terms = []
+    for term in re.findall(r"[^\W_]+", text.lower()):
+        if len(term) >= 2 and term not in terms:
+            terms.append(term)
+    return terms[:max_terms]
+
+
+async def hybrid_search(
+    table: str,
+    vector,
+    query_text: str,
+    k: int = 5,
+    columns: tuple | None = None,
+    candidates: int | None = None,
+) -> list[dict]:
+    """
+    키워드 + 벡터 하이브리드 Top-K 검색 (Reciprocal Rank Fusion)
+
+    Args:
+        table: HYBRID_TEXT_COLUMNS 중 하나
+        vector: 질문 임베딩
+        query_text: 원문 질문 (키워드 검색용)
+        k: 반환 개수
+        columns: 반환 컬럼 (기본: 테이블의 허용 컬럼 전체)
+        candidates: 검색기별 후보 수 (기본: HYBRID_CANDIDATES, k보다 작으면 k로 맞춤)
+
+    Returns:
+        [{...columns, "distance", "vector_rank", "lexical_rank", "rrf_score"}]
+        (rrf_score 내림차순, 한쪽 후보에만 있으면 다른 쪽 순위는 None)
+    """
+    if table not in HYBRID_TEXT_COLUMNS:
+        raise ValueError(f"hybrid_search: 허용되지 않은 테이블 '{table}'")
+    allowed = VECTOR_SEARCH_TABLES[table]
+    columns = columns or allowed
+    for col in columns:
+        if col not in allowed:
+            raise ValueError(f"hybrid_search: '{table}' 테이블에 허용되지 않은 컬럼 '{col}'")
+
+    terms = lexical_terms(query_text)
+    if not terms:
+        # 키워드가 없으면 (이모지/한 글자 질문 등) 벡터 검색과 동일
+        rows = await vector_search(table, vector, k=k, columns=columns)
+        for rank, row in enumerate(rows, start=1):
+            row.update(vector_rank=rank, lexical_rank=None, rrf_score=1.0 / (HYBRID_RRF_K + rank))
+        return rows
+
+    candidates = max(candidates or HYBRID_CANDIDATES, k)
+    id_column = sql.Identifier(allowed[0])
+    document = sql.SQL("({})").format(
+        sql.SQL(" || ' ' || ").join(map(sql.Identifier, HYBRID_TEXT_COLUMNS[table]))
+    )
+
+    query = sql.SQL("""
+        WITH vector_hits AS (
+            SELECT {id}, ROW_NUMBER() OVER (ORDER BY distance) AS vector_rank
+            FROM (
+                SELECT {id}, embedding <=> %(vector)b AS distance
+                FROM {table}
+                WHERE embedding IS NOT NULL
+                ORDER BY distance
+                LIMIT %(candidates)s
+            ) v
+        ),
+        lexical_hits AS (
+            SELECT {id}, ROW_NUMBER() OVER (ORDER BY score DESC) AS lexical_rank
+            FROM (
+                SELECT {id},
+                       ts_rank_cd(to_tsvector('simple', {document}), to_tsquery('simple', %(tsquery)s))
+                       + word_similarity(%(query_text)s, {document}) AS score
+                FROM {table}
+                WHERE to_tsvector('simple', {document}) @@ to_tsquery('simple', %(tsquery)s)
+                   OR %(query_text)s <%% {document}
+                ORDER BY score DESC
+                LIMIT %(candidates)s
+            ) l
+        ),
+        fused AS (
+            SELECT {id}, v.vector_rank, l.lexical_rank,
+                   COALESCE(1.0 / (%(rrf_k)s + v.vector_rank), 0)
+                   + COALESCE(1.0 / (%(rrf_k)s + l.lexical_rank), 0) AS rrf_score
+            FROM vector_hits v
+            FULL JOIN lexical_hits l USING ({id})
+        )
+        SELECT {columns}, t.embedding <=> %(vector)b AS distance,
+               f.vector_rank, f.lexical_rank, f.rrf_score::float AS rrf_score
+        FROM fused f
+        JOIN {table} t USING ({id})
+        ORDER BY f.rrf_score DESC, distance
+        LIMIT %(k)s
+    """).format(
+        id=id_column,
+        table=sql.Identifier(table),
+        document=document,
+        columns=sql.SQL(", ").join(sql.Identifier("t", col) for col in columns),
+    )
+    params = {
+        "vector": to_vector(vector),
+        # 키워드 OR + 접두 일치 ("필터" -> "필터교체"도 일치)
+        "tsquery": " | ".join(f"{term}:*" for term in terms),
+        "query_text": query_text,
+        "candidates": candidates,
+        "rrf_k": HYBRID_RRF_K,
+        "k": k,
+    }
+
+    async with pool.connection() as conn:
+        async with conn.cursor() as cur:
+            ef = max(VECTOR_EF_SEARCH, candidates)
+            await cur.execute(sql.SQL("SET LOCAL hnsw.ef_search = {}").format(sql.Literal(ef)))
+            await cur.execute(query, params)
+            return await cur.fetchall()
+
+
 # FastAPI Dependency Injection용
 def get_db():
     db = SessionLocal()
@@ -0,0 +1,229 @@
+import os
+import asyncio
+import numpy as np
+from typing import Optional
+from psycopg import sql
+from app.core.db import (
+    HYBRID_CANDIDATES,
+    HYBRID_RRF_K,
+    HYBRID_TEXT_COLUMNS,
+    VECTOR_SEARCH_TABLES,
+    fetch_all,
+    fetch_one,
+    hybrid_search,
+    lexical_terms,
+    vector_search,
+)
+
+# ---------------------------------------------------------
+# [In-Memory Vector Index] 작은 RAG 코퍼스(매뉴얼/정책 조각)용 프로세스 내부 인덱스
+# - 정규화된 float32 행렬 1개 -> 코사인 Top-K를 행렬곱 한 번으로 계산 (DB 왕복 없음)
+# - 시작 시 로드, 주기적으로 코퍼스 서명(행 수 + 내용 해시)을 확인해 바뀌었을 때만 다시 로드
+# - 행 수가 VECTOR_INDEX_MAX_ROWS를 넘으면 메모리에 올리지 않고 pgvector 검색 사용
+# - 하이브리드 검색: 글자 bigram 겹침(pg_trgm 근사) 키워드 순위 + 벡터 순위를 RRF로 합산
+# ---------------------------------------------------------
+
+VECTOR_INDEX_ENABLED = os.getenv("VECTOR_INDEX_ENABLED", "true").lower() == "true"
+VECTOR_INDEX_MAX_ROWS = int(os.getenv("VECTOR_INDEX_MAX_ROWS", "5000"))
+VECTOR_INDEX_REFRESH_INTERVAL = float(os.getenv("VECTOR_INDEX_REFRESH_INTERVAL", "60"))
+
+# 메모리 인덱스 대상 테이블 -> 내용 변경 감지용 텍스트 컬럼 (검색 단위는 문서가 아닌 조각)
+VECTOR_INDEX_TABLES = {
+    "manual_chunks": "content_hash",
+    "policy_chunks": "content_hash",
+}
+
+
+def _char_bigrams(text: str) -> set[str]:
+    """공백 기준 단어별 글자 bigram ("필터는" -> {"필터", "터는"}), 조사가 붙어도 겹침이 남음"""
+    grams = set()
+    for word in text.lower().split():
+        grams.update(word[i:i + 2] for i in range(len(word) - 1))
+    return grams
+
+
+class InMemoryVectorIndex:
+    """행 단위로 정규화된 임베딩 행렬 + 원본 컬럼 값 (+ 키워드 검색용 bigram 집합)"""
+
+    def __init__(self, rows: list[dict], text_columns: Optional[tuple] = None):
+        self.rows = [{k: v for k, v in row.items() if k != "embedding"} for row in rows]
+        self.bigrams = [
+            _char_bigrams(" ".join(str(row.get(col) or "") for col in text_columns)) for row in rows
+        ] if text_columns else []
+        if rows:
+            matrix = np.vstack([np.asarray(row["embedding"], dtype=np.float32) for row in rows])
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            self.matrix = matrix / np.where(norms == 0, 1, norms)
+        else:
+            self.matrix = np.zeros((0, 0), dtype=np.float32)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def search(self, vector, k: int = 5, columns: Optional[tuple] = None) -> list[dict]:
+        """코사인 거리(1 - 유사도) 오름차순 Top-K, pgvector의 <=> 결과와 같은 형태"""
+        if not self.rows:
+            return []
+
+        scores = self._cosine(vector)
+        k = min(k, len(self.rows))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [self._item(i, scores, columns) for i in top]
+
+    def hybrid_search(
+        self,
+        vector,
+        query_text: str,
+        k: int = 5,
+        columns: Optional[tuple] = None,
+        candidates: int = HYBRID_CANDIDATES,
+    ) -> list[dict]:
+        """db.hybrid_search와 같은 형태의 결과 (키워드 순위 + 벡터 순위 RRF)"""
+        if not self.rows:
+            return []
+
+        scores = self._cosine(vector)
+        candidates = min(max(candidates, k), len(self.rows))
+        vector_top = np.argsort(-scores)[:candidates]
+        vector_rank = {int(i): rank for rank, i in enumerate(vector_top, start=1)}
+
+        # 키워드 점수: 질문 bigram 중 문서에 있는 비율 (0이면 키워드 후보 아님)
+        query_grams = _char_bigrams(" ".join(lexical_terms(query_text)))
+        lexical_rank = {}
+        if query_grams and self.bigrams:
+            overlap = [(len(query_grams & grams) / len(query_grams), i) for i, grams in enumerate(self.bigrams)]
+            hits = sorted((item for item in overlap if item[0] > 0), key=lambda item: (-item[0], -scores[item[1]]))
+            lexical_rank = {i: rank for rank, (_, i) in enumerate(hits[:candidates], start=1)}
+
+        fused = {}
+        for i in vector_rank.keys() | lexical_rank.keys():
+            fused[i] = sum(1.0 / (HYBRID_RRF_K + ranks[i]) for ranks in (vector_rank, lexical_rank) if i in ranks)
+
+        top = sorted(fused, key=lambda i: (-fused[i], -scores[i]))[:k]
+        results = []
+        for i in top:
+            item = self._item(i, scores, columns)
+            item.update(vector_rank=vector_rank.get(i), lexical_rank=lexical_rank.get(i), rrf_score=fused[i])
+            results.append(item)
+        return results
+
+    def _cosine(self, vector) -> np.ndarray:
+        query = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+        return self.matrix @ query
+
+    def _item(self, i, scores: np.ndarray, columns: Optional[tuple]) -> dict:
+        row = self.rows[i]
+        item = {col: row[col] for col in columns} if columns else dict(row)
+        item["distance"] = float(1.0 - scores[i])
+        return item
+
+
+_indexes: dict[str, Optional[InMemoryVectorIndex]] = {}  # None: 용량 초과 -> pgvector 사용
+_signatures: dict[str, tuple] = {}
+_refresher: Optional[asyncio.Task] = None
+
+
+async def _corpus_signature(table: str) -> tuple:
+    """(임베딩 있는 행 수, 내용 해시) - 행이 추가/삭제/수정되면 값이 바뀜"""
+    id_column = VECTOR_SEARCH_TABLES[table][0]
+    query = sql.SQL("""
+        SELECT COUNT(*) AS row_count,
+               md5(string_agg({id}::text || ':' || md5({text}), ',' ORDER BY {id})) AS content_hash
+        FROM {table}
+        WHERE embedding IS NOT NULL
+    """).format(
+        id=sql.Identifier(id_column),
+        text=sql.Identifier(VECTOR_INDEX_TABLES[table]),
+        table=sql.Identifier(table),
+    )
+    row = await fetch_one(query)
+    return row["row_count"], row["content_hash"]
+
+
+async def refresh_vector_index(table: str, force: bool = False) -> bool:
+    """코퍼스가 바뀌었으면 다시 로드 (변경 없으면 False)"""
+    signature = await _corpus_signature(table)
+    if not force and _signatures.get(table) == signature:
+        return False
+    _signatures[table] = signature
+
+    row_count = signature[0]
+    if row_count > VECTOR_INDEX_MAX_ROWS:
+        _indexes[table] = None
+        print(f"⚠️ [VectorIndex] '{table}' {row_count}행 > {VECTOR_INDEX_MAX_ROWS}행 -> pgvector 검색 사용")
+        return True
+
+    query = sql.SQL("SELECT {columns}, embedding FROM {table} WHERE embedding IS NOT NULL").format(
+        columns=sql.SQL(", ").join(map(sql.Identifier, VECTOR_SEARCH_TABLES[table])),
+        table=sql.Identifier(table),
+    )
+    rows = await fetch_all(query)
+    _indexes[table] = InMemoryVectorIndex(rows, HYBRID_TEXT_COLUMNS.get(table))
+    print(f"🧠 [VectorIndex] '{table}' 메모리 인덱스 로드 ({len(rows)}행)")
+    return True
+
+
+async def load_vector_indexes():
+    """앱 시작 시 호출: 대상 테이블 인덱스 로드 + 변경 감지 태스크 시작"""
+    global _refresher
+    if not VECTOR_INDEX_ENABLED:
+        return
+
+    for table in VECTOR_INDEX_TABLES:
+        try:
+            await refresh_vector_index(table, force=True)
+        except Exception as e:
+            print(f"❌ [VectorIndex] '{table}' 로드 실패 (pgvector 검색 사용): {e}")
+
+    if _refresher is None or _refresher.done():
+        _refresher = asyncio.create_task(_refresh_loop())
+
+
+async def _refresh_loop():
+    while True:
+        await asyncio.sleep(VECTOR_INDEX_REFRESH_INTERVAL)
+        for table in VECTOR_INDEX_TABLES:
+            try:
+                await refresh_vector_index(table)
+            except Exception as e:
+                print(f"❌ [VectorIndex] '{table}' 변경 확인 실패: {e}")
+
+
+async def stop_vector_index_refresher():
+    global _refresher
+    if _refresher is not None:
+        _refresher.cancel()
+        await asyncio.wait({_refresher}, timeout=1.0)
+        _refresher = None
+
+
+async def search_corpus(
+    table: str,
+    vector,
+    k: int = 5,
+    columns: Optional[tuple] = None,
+    query_text: Optional[str] = None,
+) -> list[dict]:
+    """
+    코퍼스 유사도 검색: 메모리 인덱스가 있으면 사용, 없으면(비활성/용량 초과/로드 실패) pgvector
+    - query_text 없음: 벡터 검색, 반환 형태는 vector_search와 동일 ([{...columns, "distance"}])
+    - query_text 있음: 키워드 + 벡터 하이브리드, 반환 형태는 hybrid_search와 동일
+    """
+    hybrid = query_text is not None and table in HYBRID_TEXT_COLUMNS
+    index = _indexes.get(table)
+    if index is not None:
+        return index.hybrid_search(vector, query_text, k, columns) if hybrid else index.search(vector, k, columns)
+    if hybrid:
+        return await hybrid_search(table, vector, query_text, k=k, columns=columns)
+    return await vector_search(table, vector, k=k, columns=columns)
+
+
+def get_vector_index_stats() -> dict:
+    return {
+        table: {"in_memory": index is not None, "rows": len(index) if index is not None else None}
+        for table, index in _indexes.items()
+    }
@@ -9,13 +9,41 @@ from app.inquiry.nodes.retrieval import manual_node, policy_node, web_search_nod
 from app.inquiry.nodes.answer import answer_node_v2
 from app.inquiry.nodes.save import save_node
 from app.clients.genai import genai_generate_text
+from app.clients.openai import embed_text
+from app.inquiry.inquiry_service import find_cached_answer
 
 
 # ===== [Phase 1] 검색 및 진단 실행 함수 (Entry Point) =====
-async def run_search_check(store_id: int, question: str) -> Dict[str, Any]:
+async def run_search_check(store_id: int, question: str, use_cache: bool = True) -> Dict[str, Any]:
     """
     1단계: 질문 분류 -> DB 검색 -> 유사도 평가 결과 반환
+    (거의 같은 질문의 이전 답변이 있으면 분류/검색 없이 cache_hit=True와 함께 바로 반환)
     """
+    # 0. 시맨틱 답변 캐시 (질문 임베딩은 캐시되므로 이후 매뉴얼/정책 검색에서 재사용)
+    if use_cache:
+        try:
+            hit = await find_cached_answer(store_id, await embed_text(question))
+        except Exception as e:
+            print(f"⚠️ [AnswerCache] 조회 실패 (일반 처리): {e}")
+            hit = None
+        if hit:
+            print(f"♻️ [AnswerCache] Hit (inquiry_id={hit['inquiry_id']}, distance={hit['distance']:.4f})")
+            return {
+                "cache_hit": True,
+                "category": hit["category"],
+                "min_distance": hit["distance"],
+                "similarity_score": round((1 - hit["distance"]) * 100, 1),
+                "cached_answer": hit["answer"],
+                "cached_question": hit["question"],
+                "cached_inquiry_id": hit["inquiry_id"],
+                "cached_at": str(hit["created_at"]),
+                "top_document": None,
+                "candidates": [],
+                "context_data": [],
+                "recommendation": {"indices": [], "comment": ""},
+                "sales_data": {}
+            }
+
     # 1. State 초기화
     state = InquiryState(
         store_id=store_id,
@@ -37,6 +65,7 @@ async def run_search_check(store_id: int, question: str) -> Dict[str, Any]:
     top_doc = None
     min_dist = 1.0 
     search_results = []
+    meta = {}
     
     if category == "sales":
         # 매출은 사용자가 선택할 필요 없이 무조건 데이터 분석
@@ -49,7 +78,8 @@ async def run_search_check(store_id: int, question: str) -> Dict[str, Any]:
             "search_params": {
                 "scope": sales_info.get("scope"),
                 "tables_used": sales_info.get("tables_used"),
-                "period": sales_info.get("period")
+                "period": sales_info.get("period"),
+                "timings_ms": sales_info.get("timings_ms")
             }
         }
         
@@ -82,7 +112,12 @@ async def run_search_check(store_id: int, question: str) -> Dict[str, Any]:
     # [Feature] AI Contextual Check: 문서 적합성 판단
     recommendation = {"indices": [], "comment": ""}
     
-    if search_results and category != "sales":
+    if search_results and category != "sales" and meta.get("top_match"):
+        # 키워드/벡터 검색이 같은 문서를 1위로 뽑음 -> LLM 적합성 판단 생략
+        recommendation["indices"] = [0]
+        recommendation["comment"] = "✅ 검색 일치: 키워드 검색과 의미 검색 모두 1순위 문서가 같습니다."
+
+    elif search_results and category != "sales":
         try:
             # 후보군 제목 + 앞부분 요약 추출
             docs_summary = []
@@ -126,6 +161,7 @@ async def run_search_check(store_id: int, question: str) -> Dict[str, Any]:
             recommendation["comment"] = "추천 시스템 일시 오류"
 
     return {
+        "cache_hit": False,
         "category": category,
         "min_distance": min_dist,
         "similarity_score": round((1 - min_dist) * 100, 1),
@@ -165,7 +201,8 @@ async def run_final_answer_stream(store_id: int, question: str, category: str, m
         details = {
             "type": "analysis", 
             "summary": state["sales_data"].get("diagnosis_result"),
-            "sales_summary": state["sales_data"].get("summary_text", "")[:100] + "..."
+            "sales_summary": state["sales_data"].get("summary_text", "")[:100] + "...",
+            "timings_ms": state["sales_data"].get("timings_ms")
         }
         yield json.dumps({"step": "sales", "message": "✅ 분석 완료", "details": details}) + "\n"
         
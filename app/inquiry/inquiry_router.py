@@ -11,6 +11,7 @@ class InquiryRequest(BaseModel):
     """질문 요청 스키마"""
     store_id: int
     question: str
+    use_cache: bool = True # False면 시맨틱 답변 캐시를 건너뛰고 새로 검색
 
 class GenerateRequest(BaseModel):
     store_id: int
@@ -26,9 +27,10 @@ async def check_database_search(request: InquiryRequest):
     [Steps 1] DB 검색 & 유사도 확인 API
     질문을 받아 내부 DB(매뉴얼/정책)를 검색하고, 
     가장 유사한 문서와 점수를 반환합니다. (답변 생성 X)
+    거의 같은 질문의 이전 답변이 있으면 cache_hit=True, cached_answer로 바로 반환합니다.
     """
     
-    result = await run_search_check(request.store_id, request.question)
+    result = await run_search_check(request.store_id, request.question, request.use_cache)
     return {
         "success": True,
         "data": result
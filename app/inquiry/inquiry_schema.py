@@ -1,8 +1,9 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
+from pgvector.sqlalchemy import Vector
 from pydantic import BaseModel
-from app.core.db import base
+from app.core.db import base, VECTOR_HNSW_M, VECTOR_HNSW_EF_CONSTRUCTION
 from typing import TypedDict, List, Dict, Any
 
 # --- LangGraph State ---
@@ -36,8 +37,22 @@ class StoreInquiry(base):
     question = Column(Text, nullable=False)
     answer = Column(Text, nullable=False)
     
+    # 시맨틱 답변 캐시: 질문 임베딩 + 답변 근거가 된 코퍼스 버전 (버전이 바뀌면 재사용 안 함, 웹 검색 답변은 NULL)
+    question_embedding = Column(Vector(1536), nullable=True)
+    corpus_version = Column(String(64), nullable=True)
+    
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        Index(
+            "ix_store_inquiries_question_embedding_hnsw",
+            "question_embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": VECTOR_HNSW_M, "ef_construction": VECTOR_HNSW_EF_CONSTRUCTION},
+            postgresql_ops={"question_embedding": "vector_cosine_ops"},
+        ),
+    )
+
 
 # --- Pydantic Models for API ---
 class InquiryCreate(BaseModel):
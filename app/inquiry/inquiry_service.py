@@ -1,30 +1,90 @@
-from app.core.db import SessionLocal
-from app.inquiry.inquiry_schema import StoreInquiry
+import os
+from app.core.chunking import get_corpus_version
+from app.core.db import execute_return, to_vector, vector_search
 
-def save_inquiry(store_id: int, category: str, question: str, answer: str) -> int:
+# ---------------------------------------------------------
+# [Semantic Answer Cache] 같은 매장에서 거의 같은 질문이 다시 오면 저장된 답변을 바로 반환
+# - 질문 임베딩 코사인 거리 <= ANSWER_CACHE_MAX_DISTANCE
+# - 답변 당시 코퍼스 버전(corpus_version)이 현재와 같을 때만 (매뉴얼/정책이 바뀌면 자동 무효)
+# - 매출(sales)은 데이터가 매일 바뀌므로, 웹 검색 답변은 근거가 외부라서 캐시하지 않음
+# ---------------------------------------------------------
+
+ANSWER_CACHE_ENABLED = os.getenv("ANSWER_CACHE_ENABLED", "true").lower() == "true"
+ANSWER_CACHE_MAX_DISTANCE = float(os.getenv("ANSWER_CACHE_MAX_DISTANCE", "0.08"))
+# HNSW는 ef_search개 후보를 먼저 찾고 매장/카테고리 필터를 나중에 적용
+# -> 다른 매장 질문이 많으면 기본값(40)으로는 같은 매장의 같은 질문이 후보에서 밀려남
+ANSWER_CACHE_EF_SEARCH = int(os.getenv("ANSWER_CACHE_EF_SEARCH", "400"))
+
+# 캐시 가능한 카테고리 -> 근거 코퍼스 (app/core/chunking.py의 CHUNK_SOURCES)
+ANSWER_CACHE_SOURCES = {
+    "manual": "manuals",
+    "policy": "policies",
+}
+
+
+async def get_answer_corpus_version(category: str) -> str | None:
+    """답변 근거 코퍼스 버전 (캐시 불가 카테고리는 None)"""
+    source = ANSWER_CACHE_SOURCES.get(category)
+    return await get_corpus_version(source) if source else None
+
+
+async def save_inquiry(
+    store_id: int,
+    category: str,
+    question: str,
+    answer: str,
+    question_embedding=None,
+    corpus_version: str | None = None,
+) -> int:
     """
-    질문과 AI 답변을 DB에 저장
+    질문과 AI 답변을 DB에 저장 (비동기 풀 커넥션 사용)
     
     Args:
         store_id: 매장 ID
         category: 질문 카테고리 (sales/manual/policy)
         question: 질문 내용
         answer: AI 답변
+        question_embedding: 질문 임베딩 (시맨틱 캐시 조회용)
+        corpus_version: 답변 근거 코퍼스 버전 (None이면 캐시 재사용 대상 아님)
     
     Returns:
-        생성된 inquiry_id
+        생성된 inquiry_id (저장 실패 시 0)
+    """
+    sql = """
+        INSERT INTO store_inquiries (store_id, category, question, answer, question_embedding, corpus_version)
+        VALUES (%s, %s, %s, %s, %b, %s)
+        RETURNING inquiry_id
+    """
+    embedding = to_vector(question_embedding) if question_embedding is not None else None
+    row = await execute_return(sql, (store_id, category, question, answer, embedding, corpus_version))
+    return row["inquiry_id"] if row else 0
+
+
+async def find_cached_answer(store_id: int, question_vector) -> dict | None:
+    """
+    같은 매장의 가장 가까운 이전 질문 답변 조회 (거리 기준/코퍼스 버전 불일치 시 None)
+
+    Returns:
+        {"inquiry_id", "category", "question", "answer", "created_at", "distance"} | None
     """
-    db = SessionLocal()
-    try:
-        new_inquiry = StoreInquiry(
-            store_id=store_id,
-            category=category,
-            question=question,
-            answer=answer
-        )
-        db.add(new_inquiry)
-        db.commit()
-        db.refresh(new_inquiry)
-        return new_inquiry.inquiry_id
-    finally:
-        db.close()
+    if not ANSWER_CACHE_ENABLED:
+        return None
+
+    # 카테고리는 라우팅(LLM) 전이라 아직 모름 -> 캐시 가능한 카테고리(매뉴얼/정책) 전체에서 찾고,
+    # 적중하면 저장된 category로 응답 (코퍼스 버전도 그 카테고리 기준으로 확인)
+    rows = await vector_search(
+        "store_inquiries",
+        question_vector,
+        k=1,
+        filters={"store_id": store_id, "category": list(ANSWER_CACHE_SOURCES)},
+        columns=("inquiry_id", "category", "question", "answer", "created_at", "corpus_version"),
+        ef_search=ANSWER_CACHE_EF_SEARCH,
+        not_null=("corpus_version",),
+    )
+    row = rows[0] if rows else None
+    if not row or row["distance"] > ANSWER_CACHE_MAX_DISTANCE:
+        return None
+    if row.pop("corpus_version") != await get_answer_corpus_version(row["category"]):
+        print(f"♻️ [AnswerCache] 코퍼스 변경으로 재사용 불가 (inquiry_id={row['inquiry_id']})")
+        return None
+    return row
@@ -0,0 +1,130 @@
+import os
+import asyncio
+import numpy as np
+from typing import Optional
+from app.clients.openai import embed_text
+
+# ---------------------------------------------------------
+# [Intent Classifier] router_node 앞단의 로컬 질문 분류 (LLM 왕복 없이 sales / manual / policy 결정)
+# - 카테고리별 예시 질문 임베딩의 평균(centroid)과 질문 임베딩의 코사인 유사도
+# - + 키워드 사전 일치 가점 (INTENT_LEXICON_WEIGHT x 일치 수, 최대 INTENT_LEXICON_MAX_HITS개)
+# - 1위와 2위 점수 차(margin)가 INTENT_CONFIDENCE_MARGIN 이상일 때만 채택, 애매하면 None -> LLM 라우터
+# - 질문 임베딩은 캐시되므로 이후 매뉴얼/정책 검색, 답변 캐시 조회에서 그대로 재사용
+# - 임계값은 scripts/eval_intent_classifier.py로 정확도/커버리지를 보고 조정
+# ---------------------------------------------------------
+
+INTENT_CLASSIFIER_ENABLED = os.getenv("INTENT_CLASSIFIER_ENABLED", "true").lower() == "true"
+INTENT_CONFIDENCE_MARGIN = float(os.getenv("INTENT_CONFIDENCE_MARGIN", "0.05"))
+INTENT_LEXICON_WEIGHT = float(os.getenv("INTENT_LEXICON_WEIGHT", "0.03"))
+INTENT_LEXICON_MAX_HITS = 3
+
+# centroid 계산용 예시 질문 (router_node 프롬프트의 분류 기준과 같은 범위)
+INTENT_EXAMPLES = {
+    "sales": [
+        "지난주 매출 어때?",
+        "가장 많이 팔린 메뉴는?",
+        "이번 달 주문 건수 알려줘",
+        "최근 매출 하락 원인을 분석해줘",
+        "메뉴별 판매량 순위 보여줘",
+        "부산점과 서울점 매출 비교해줘",
+        "어제 객단가가 얼마야?",
+        "주말 매출 추이가 어떻게 돼?",
+        "리뷰 평점이 낮은 메뉴는 뭐야?",
+        "작년 같은 기간 대비 실적은?",
+    ],
+    "manual": [
+        "커피머신 청소 어떻게 해?",
+        "와이파이 연결법 알려줘",
+        "제빙기 필터는 언제 교체해?",
+        "그라인더 날 교체 주기는?",
+        "포스기가 느려졌을 때 재부팅 방법",
+        "오븐 예열 온도 설정 방법",
+        "식기세척기 세제 교체 방법",
+        "오픈 준비 체크리스트 알려줘",
+        "마감 정산 절차가 어떻게 돼?",
+        "재고 발주는 몇 시까지 해야 해?",
+    ],
+    "policy": [
+        "고객이 환불을 요구하면 규정이 어떻게 돼?",
+        "직원 복장 규정 알려줘",
+        "지각하면 어떻게 처리해?",
+        "연차 휴가 신청 규정은?",
+        "위생 점검 기준이 뭐야?",
+        "외부 음식 반입 정책은?",
+        "개인정보 보호 규정 알려줘",
+        "서울 종로구 맛집 추천해줘",
+        "오늘 날씨 어때?",
+        "주변 상권 뉴스 알려줘",
+    ],
+}
+
+# 키워드 사전 (부분 문자열 일치, 조사가 붙어도 일치)
+INTENT_LEXICON = {
+    "sales": ["매출", "판매", "팔린", "주문", "실적", "순위", "객단가", "추이", "통계", "평점", "베스트", "워스트"],
+    "manual": ["청소", "세척", "교체", "고장", "수리", "레시피", "방법", "설정", "재부팅", "연결", "체크리스트", "발주", "머신"],
+    "policy": ["규정", "정책", "환불", "반품", "복장", "근무", "휴가", "지각", "위생", "보안", "맛집", "날씨", "뉴스", "상권"],
+}
+
+_centroids: Optional[dict[str, np.ndarray]] = None
+_centroid_lock = asyncio.Lock()
+
+
+def build_centroids(example_vectors: dict[str, list]) -> dict[str, np.ndarray]:
+    """카테고리별 예시 임베딩 -> 정규화된 평균 벡터"""
+    centroids = {}
+    for category, vectors in example_vectors.items():
+        matrix = np.asarray(vectors, dtype=np.float32)
+        matrix = matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+        centroid = matrix.mean(axis=0)
+        centroids[category] = centroid / np.linalg.norm(centroid)
+    return centroids
+
+
+async def load_intent_centroids(force: bool = False) -> dict[str, np.ndarray]:
+    """예시 질문 임베딩(임베딩 캐시 사용) -> centroid (프로세스당 1회)"""
+    global _centroids
+    async with _centroid_lock:
+        if _centroids is None or force:
+            example_vectors = {}
+            for category, examples in INTENT_EXAMPLES.items():
+                example_vectors[category] = await asyncio.gather(*[embed_text(q) for q in examples])
+            _centroids = build_centroids(example_vectors)
+            print(f"🧭 [Intent] centroid 로드 ({', '.join(f'{c}={len(e)}' for c, e in INTENT_EXAMPLES.items())})")
+    return _centroids
+
+
+def score_intent(question: str, vector, centroids: dict[str, np.ndarray]) -> dict:
+    """
+    centroid 유사도 + 키워드 가점 -> 분류 결과
+
+    Returns:
+        {"category": str | None (애매하면 None), "margin": float, "scores": {category: float}}
+    """
+    query = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(query)
+    if norm:
+        query = query / norm
+
+    text = question.lower()
+    scores = {}
+    for category, centroid in centroids.items():
+        hits = sum(1 for keyword in INTENT_LEXICON.get(category, ()) if keyword in text)
+        scores[category] = float(centroid @ query) + INTENT_LEXICON_WEIGHT * min(hits, INTENT_LEXICON_MAX_HITS)
+
+    ranked = sorted(scores, key=scores.get, reverse=True)
+    margin = scores[ranked[0]] - scores[ranked[1]] if len(ranked) > 1 else scores[ranked[0]]
+    category = ranked[0] if margin >= INTENT_CONFIDENCE_MARGIN else None
+    return {"category": category, "margin": round(margin, 4), "scores": {c: round(s, 4) for c, s in scores.items()}}
+
+
+async def classify_intent(question: str) -> dict:
+    """로컬 분류 (비활성/임베딩 실패 시 category=None -> 호출자가 LLM 라우터 사용)"""
+    if not INTENT_CLASSIFIER_ENABLED:
+        return {"category": None, "margin": 0.0, "scores": {}}
+    try:
+        centroids = await load_intent_centroids()
+        vector = await embed_text(question)
+    except Exception as e:
+        print(f"⚠️ [Intent] 로컬 분류 실패 (LLM 라우터 사용): {e}")
+        return {"category": None, "margin": 0.0, "scores": {}}
+    return score_intent(question, vector, centroids)
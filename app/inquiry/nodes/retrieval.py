@@ -3,33 +3,39 @@ from typing import Dict, Any, List
 
 # External App Imports
 from app.clients.genai import genai_generate_with_grounding
-from app.core.db import fetch_all
+from app.clients.openai import embed_text
+from app.core.vector_index import search_corpus
 from app.inquiry.inquiry_schema import InquiryState
 
+def _is_top_match(rows: List[Dict[str, Any]]) -> bool:
+    """1순위 문서가 키워드 검색/벡터 검색 모두에서 1위 -> 관련성 재확인(LLM) 없이 채택 가능"""
+    return bool(rows) and rows[0].get("vector_rank") == 1 and rows[0].get("lexical_rank") == 1
+
+
+async def _search_passages(chunk_table: str, doc_table: str, question_vector, question: str) -> List[Dict[str, Any]]:
+    """조각 테이블 하이브리드 검색 (조각 동기화 전이면 문서 테이블로 대체)"""
+    columns = ("title", "content", "category")
+    rows = await search_corpus(chunk_table, question_vector, k=5, columns=columns, query_text=question)
+    if not rows:
+        rows = await search_corpus(doc_table, question_vector, k=5, columns=columns, query_text=question)
+    return rows
+
+
 # ===== Step 4: Manual RAG Node (매뉴얼 검색) =====
 async def manual_node(state: InquiryState) -> InquiryState:
-    """매뉴얼 DB에서 관련 문서 검색 (Vector Search)"""
+    """매뉴얼 DB에서 관련 문서 검색 (키워드 + Vector 하이브리드 검색)"""
     if state["category"] != "manual":
         return state
     
     question = state["question"]
     
-    # OpenAI Embeddings로 질문 벡터화
-    from langchain_openai import OpenAIEmbeddings
-    embeddings_model = OpenAIEmbeddings(model="text-embedding-3-small")
-    question_vector = embeddings_model.embed_query(question)
+    # 질문 벡터화 (공용 비동기 클라이언트 + 임베딩 캐시)
+    question_vector = await embed_text(question)
     
-    # pgvector 유사도 검색 (코사인 거리 기준 Top 3)
+    # 하이브리드 검색 (키워드 순위 + 코사인 거리 순위를 RRF로 합산한 Top 5, 메모리 인덱스 우선 / 없으면 pgvector)
+    # 문서 전체가 아닌 관련 문단(조각)만 가져와 답변 프롬프트를 줄임, 조각이 아직 없으면 문서 단위 검색
     # distance가 0에 가까울수록 유사함
-    query = f"""
-    SELECT title, content, category,
-           embedding <=> '{question_vector}'::vector AS distance
-    FROM manuals
-    ORDER BY distance
-    LIMIT 5
-    """
-    
-    rows = await fetch_all(query)
+    rows = await _search_passages("manual_chunks", "manuals", question_vector, question)
     
     # 검색 결과 및 최소 거리 저장
     min_distance = 1.0 # 기본값 (불일치)
@@ -42,9 +48,9 @@ async def manual_node(state: InquiryState) -> InquiryState:
     ]
     
     if "search_meta" not in state: state["search_meta"] = {}
-    state["search_meta"] = {"min_distance": min_distance, "source": "manual_db"}
+    state["search_meta"] = {"min_distance": min_distance, "source": "manual_db", "top_match": _is_top_match(rows)}
     
-    print(f"📖 [Manual] 검색 완료 (Min Distance: {min_distance:.4f})")
+    print(f"📖 [Manual] 검색 완료 (Min Distance: {min_distance:.4f}, Top Match: {state['search_meta']['top_match']})")
     return state
 
 
@@ -56,19 +62,9 @@ async def policy_node(state: InquiryState) -> InquiryState:
     
     question = state["question"]
     
-    from langchain_openai import OpenAIEmbeddings
-    embeddings_model = OpenAIEmbeddings(model="text-embedding-3-small")
-    question_vector = embeddings_model.embed_query(question)
-    
-    query = f"""
-    SELECT title, content, category,
-           embedding <=> '{question_vector}'::vector AS distance
-    FROM policies
-    ORDER BY distance
-    LIMIT 5
-    """
+    question_vector = await embed_text(question)
     
-    rows = await fetch_all(query)
+    rows = await _search_passages("policy_chunks", "policies", question_vector, question)
     
     min_distance = 1.0
     if rows:
@@ -79,9 +75,9 @@ async def policy_node(state: InquiryState) -> InquiryState:
         for row in rows
     ]
     
-    state["search_meta"] = {"min_distance": min_distance, "source": "policy_db"}
+    state["search_meta"] = {"min_distance": min_distance, "source": "policy_db", "top_match": _is_top_match(rows)}
     
-    print(f"📜 [Policy] 검색 완료 (Min Distance: {min_distance:.4f})")
+    print(f"📜 [Policy] 검색 완료 (Min Distance: {min_distance:.4f}, Top Match: {state['search_meta']['top_match']})")
     return state
 
 
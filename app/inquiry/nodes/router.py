@@ -1,11 +1,27 @@
-import json
-from datetime import datetime, date
-from typing import Dict, Any, List
+from typing import Dict, Any
 
 # External App Imports
-from app.clients.genai import genai_generate_text
+from app.clients.genai import genai_generate_json
+from app.inquiry.intent_classifier import classify_intent
 from app.inquiry.inquiry_schema import InquiryState
 
+# 분류 + 매출 분석 파라미터를 한 번에 받는 구조화 출력 스키마
+# (기존: router -> extract_search_params -> AI 매장 매칭, LLM 3회 순차 호출)
+ROUTE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "category": {"type": "STRING", "enum": ["sales", "manual", "policy"]},
+        "reason": {"type": "STRING"},
+        "target_store_codes": {"type": "ARRAY", "items": {"type": "STRING"}},
+        "required_tables": {"type": "ARRAY", "items": {"type": "STRING", "enum": ["orders", "sales_daily", "reviews"]}},
+        "period_days": {"type": "INTEGER"},
+    },
+    "required": ["category", "reason", "target_store_codes", "required_tables", "period_days"],
+}
+
+DEFAULT_SEARCH_PARAMS = {"target_store_codes": ["ALL"], "required_tables": ["sales_daily", "orders"], "period_days": 7}
+
+
 # ===== Router Node (질문 분류) =====
 async def router_node(state: InquiryState) -> InquiryState:
     """
@@ -13,15 +29,49 @@ async def router_node(state: InquiryState) -> InquiryState:
     - sales: 매출, 성과, 통계 관련
     - manual: 기기 사용법, 레시피, 기술 지원
     - policy: 운영 규정, 고객 응대, 본사 정책
+    (로컬 분류기가 확신하면 LLM 호출 없이 결정, 애매한 질문만 LLM 라우터)
+    (LLM 라우터가 sales로 분류하면 매출 분석 파라미터도 같은 호출에서 받아 state["search_params"]에 저장)
     """
     question = state["question"]
-    
+
+    # [Fast Path] centroid + 키워드 로컬 분류
+    intent = await classify_intent(question)
+    if intent["category"]:
+        category = intent["category"]
+        print(f"⚡ [Router] Local Decision: {category} (margin: {intent['margin']}, scores: {intent['scores']})")
+    else:
+        route = await llm_route_with_params(question)
+        category = route["category"]
+        if category == "sales":
+            state["search_params"] = route
+        print(f"🔀 [Router] Category Decision: {category} (Reason: {route['reason']}, local margin: {intent['margin']})")
+
+    # State 업데이트
+    state["category"] = category
+    return state
+
+
+async def llm_route(question: str) -> tuple[str, str]:
+    """Gemini 분류 -> (category, reason), 실패 시 policy"""
+    route = await llm_route_with_params(question)
+    return route["category"], route["reason"]
+
+
+async def llm_route_with_params(question: str) -> Dict[str, Any]:
+    """
+    Gemini 구조화 출력 1회로 분류 + 매출 분석 파라미터 추출
+
+    Returns:
+        {"category", "reason", "target_store_codes", "required_tables", "period_days"}
+        (실패 시 category=policy + 기본 파라미터)
+    """
     prompt = f"""
-    당신은 프랜차이즈 매장 질문 분류 AI입니다. 
-    질문의 핵심 의도를 파악하여 다음 3가지 중 하나로 분류하세요.
+    당신은 프랜차이즈 매장 질문 분류 AI입니다.
+    질문의 핵심 의도를 파악하여 다음 3가지 중 하나로 분류하고, 매출 분석에 필요한 파라미터를 추출하세요.
 
     질문: "{question}"
 
+    [category]
     1. sales (매출/데이터):
        - 매출, 판매량, 주문 건수, 메뉴별 성과, 통계
        - "지난주 매출 어때?", "가장 많이 팔린 메뉴는?"
@@ -34,29 +84,31 @@ async def router_node(state: InquiryState) -> InquiryState:
        - 매장 운영 규정, 환불/반품 정책, 고객 응대 매뉴얼
        - **[중요]**: "맛집 추천", "날씨", "뉴스", "주변 상권" 등 외부 정보 검색이 필요한 경우도 'policy'로 분류
 
-    [Output Format]
-    JSON으로만 응답하세요:
-    {{"category": "sales" | "manual" | "policy", "reason": "분류 이유"}}
-    """ 
-    
-    # LLM 호출 (Gemini로 간소화)
+    [target_store_codes] 분석 대상 매장명 (한글 키워드, 질문에 있는 단어 그대로)
+       - ❌ 절대 영어로 번역하지 마세요.
+       - "강남점 매출" -> ["강남"], "서울이랑 부산 비교" -> ["서울", "부산"]
+       - "전체", "모든", 매장 언급 없음 -> ["ALL"]
+
+    [required_tables] 답변에 필요한 테이블 (복수 선택)
+       - "orders": 메뉴 판매량, 인기/비인기 메뉴 식별 (What)
+       - "sales_daily": 매출 추이, 날씨 정보 포함 (External Factor)
+       - "reviews": 판매/매출의 '원인(Why)' 분석, 고객 반응 (이유/분석 요청 시 필수 포함)
+       - "왜 매출이 줄었어?" -> ["sales_daily", "reviews"], "안 팔린 메뉴와 이유" -> ["orders", "reviews"]
+
+    [period_days] 분석 기간(일), 언급 없으면 7 ("오늘/어제" 1, "이번 달/한 달" 30)
+
+    sales가 아니면 target_store_codes는 ["ALL"], required_tables는 [], period_days는 7로 채우세요.
+    """
+
+    # LLM 호출 (Gemini 구조화 출력)
     try:
-        # 가볍고 빠른 gemai 사용
-        response = await genai_generate_text(prompt)
-        
-        # JSON 파싱
-        content = response.replace("```json", "").replace("```", "").strip()
-        data = json.loads(content)
-        category = data.get("category", "policy") # 기본값 policy
-        reason = data.get("reason", "")
+        data = await genai_generate_json(prompt, ROUTE_SCHEMA)
+        route = {**DEFAULT_SEARCH_PARAMS, **{k: v for k, v in data.items() if v not in (None, [])}}
+        route["category"] = data.get("category", "policy") # 기본값 policy
+        route["reason"] = data.get("reason", "")
+        route["period_days"] = min(max(int(route["period_days"]), 1), 90)
     except Exception as e:
         print(f"⚠️ [Router] 분류 오류 (Fallback to policy): {e}")
-        category = "policy"
-        reason = "Error Parsing"
-        data = {}
+        route = {**DEFAULT_SEARCH_PARAMS, "category": "policy", "reason": "Error Parsing"}
 
-    print(f"🔀 [Router] Category Decision: {category} (Reason: {reason})")
-    
-    # State 업데이트
-    state["category"] = category
-    return state
+    return route
@@ -1,56 +1,20 @@
-import json
-from datetime import datetime, timedelta
-from typing import Dict, Any, List
+import time
 
 # External App Imports
-from app.clients.genai import genai_generate_text
-from app.core.db import fetch_all
 from app.inquiry.inquiry_schema import InquiryState
+from app.inquiry.nodes.router import llm_route_with_params
+from app.inquiry.sales_query import DIAGNOSIS_RECENT_REVIEW_LIMIT, fetch_diagnosis
+from app.store.store_resolver import get_store_index, resolve_stores
 
 # ===== Search Param Extraction Helper =====
 async def extract_search_params(question: str):
     """
-    질문 분석 -> 분석 대상(매장들) & 필요한 데이터 소스(테이블) 결정
+    질문 분석 -> 분석 대상(매장들) & 필요한 데이터 소스(테이블) & 기간 결정
+    (router_node가 LLM으로 분류한 경우 같은 호출에서 이미 받아 state["search_params"]로 넘어오므로,
+     로컬 분류기로 sales가 결정된 경우에만 호출됨)
     """
-    prompt = f"""
-    당신은 질문에서 핵심 키워드를 '있는 그대로 추출'하는 AI입니다. (번역/해석 금지)
-    질문을 분석하여 분석 대상 매장와 필요한 데이터를 JSON으로 반환하세요.
-    
-    질문: "{question}"
-    
-    [추출 규칙]
-    
-    1. target_store_codes: 분석 대상 매장명 (한글 키워드)
-       - ❌ 절대 영어로 번역하지 마세요. (No English Codes like 'SEOUL_GANGNAM')
-       - 질문에 있는 단어를 그대로 사용하세요.
-       - "강남점 매출" -> ["강남"]
-       - "서울이랑 부산 비교" -> ["서울", "부산"]
-       - "전체", "모든" -> ["ALL"]
-       
-    2. required_tables: 질문에 답변하기 위해 조회해야 할 테이블 리스트 (복수 선택 가능)
-       - "orders": 메뉴 판매량, 인기/비인기 메뉴 식별 (What)
-       - "sales_daily": 매출 추이, 날씨 정보 포함 (External Factor)
-       - "reviews": 판매/매출의 '원인(Why)' 분석, 고객 반응, 맛 평가 (이유/분석 요청 시 필수 포함)
-       
-    [테이블 선택 가이드]
-    - "왜 매출이 줄었어?" -> ["sales_daily", "reviews"] (추이 + 원인)
-    - "안 팔린 메뉴와 이유" -> ["orders", "reviews"] (메뉴 + 원인)
-    - "그냥 매출 보여줘" -> ["sales_daily"]
-       
-    [출력 예시]
-    {{
-        "target_store_codes": ["강남"], 
-        "required_tables": ["sales_daily", "reviews"],
-        "reason": "강남점의 매출 추이와 리뷰를 분석하기 위함"
-    }}
-    """
-    try:
-        response = await genai_generate_text(prompt)
-        clean_text = response.replace("```json", "").replace("```", "").strip()
-        parsed = json.loads(clean_text)
-        return parsed
-    except:
-        return {"target_store_codes": ["ALL"], "required_tables": ["sales_daily", "orders"], "reason": "Error parsing"}
+    return await llm_route_with_params(question)
+
 
 # ===== Step 3: Diagnosis Node (Multi-Store Support) =====
 async def diagnosis_node(state: InquiryState) -> InquiryState:
@@ -65,21 +29,27 @@ async def diagnosis_node(state: InquiryState) -> InquiryState:
         
     print(f"🕵️‍♀️ [Diagnosis V2] 분석 시작: {state['question']}")
     
-    # 1. 검색 파라미터 추출 (LLM)
-    search_params = await extract_search_params(state['question'])
+    # 단계별 소요 시간 (응답의 sales_data["timings_ms"])
+    timings = {}
+
+    # 1. 검색 파라미터 (Router LLM 호출에서 함께 받았으면 재사용, 아니면 1회 추출)
+    phase_start = time.perf_counter()
+    search_params = state.get("search_params") or await extract_search_params(state['question'])
+    timings["search_params_ms"] = round((time.perf_counter() - phase_start) * 1000, 2)
     
     target_store_codes = search_params.get("target_store_codes", ["ALL"])
-    required_tables = search_params.get("required_tables", [])
-    date_range_str = search_params.get("date_range", "DATE(o.ordered_at) >= DATE('now', '-7 days')")
+    required_tables = list(search_params.get("required_tables", []))
+    period_days = search_params.get("period_days", 7)
+    date_range_str = f"최근 {period_days}일"  # 조회 성공 시 실제 기간(YYYY-MM-DD ~ YYYY-MM-DD)으로 교체
     reason = search_params.get("reason", "")
     
-    print(f"   🎯 타겟(List): {target_store_codes}, Tables: {required_tables}")
+    print(f"   🎯 타겟(List): {target_store_codes}, Tables: {required_tables}, Period: {period_days}일")
     
     # Store ID Mapping
     collected_data = {
         "scope": ", ".join(target_store_codes),
         "tables_used": required_tables,
-        "period": "최근 7일 (자동 설정)" if "7 days" in date_range_str else "사용자 지정",
+        "period": f"최근 {period_days}일 (자동 설정)" if period_days == 7 else f"최근 {period_days}일",
         "reason": reason
     }
     
@@ -89,53 +59,11 @@ async def diagnosis_node(state: InquiryState) -> InquiryState:
         target_ids = []
         # target_store_id = None # 단일 스토어용 (비전용)
 
-        q_stores = "SELECT store_id, store_name, region FROM stores"
-        all_stores = await fetch_all(q_stores)
-        print(f"🕵️ [Debug] DB Stores: {all_stores}") # 실제 DB에 어떻게 저장되어 있는지 확인
-        
-        # Scope Resolution (AI-Powered Matching)
-        if "ALL" in target_store_codes:
-            store_codes = [s['store_name'] for s in all_stores]
-            target_ids = [s['store_id'] for s in all_stores]
-        else:
-            # [AI Matcher] 단순 문자열 비교 대신 LLM이 판단 (한글/영어/별칭 완벽 대응)
-            match_prompt = f"""
-            당신은 데이터 매칭 전문가입니다. 
-            사용자가 언급한 '키워드'와 실제 DB에 있는 '매장 목록'을 보고, 의도에 맞는 매장의 ID를 찾아주세요.
-
-            1. 사용자 키워드: {target_store_codes}
-            2. DB 매장 목록: {json.dumps(all_stores, ensure_ascii=False)}
-
-            [매칭 규칙]
-            - "강남" -> "서울 강남점" (O)
-            - "SEOUL" -> "서울 강남점" (O)
-            - "본점" -> "서울 강남점" (만약 강남이 본점이라면 문맥상 판단, 불확실하면 Skip)
-            - "속초" -> "강원 속초점" (O)
-            
-            [Output JSON]
-            반드시 매칭된 store_id 리스트만 반환하세요.
-            {{"matched_ids": [1, 3]}}
-            """
-            try:
-                m_res = await genai_generate_text(match_prompt)
-                m_clean = m_res.replace("```json", "").replace("```", "").strip()
-                m_data = json.loads(m_clean)
-                target_ids = m_data.get("matched_ids", [])
-                
-                # 매칭된 ID로 이름 리스트 역추적
-                store_codes = [s['store_name'] for s in all_stores if s['store_id'] in target_ids]
-                print(f"🤖 [AI Matcher] Mapped {target_store_codes} -> IDs: {target_ids} ({store_codes})")
-                
-            except Exception as e:
-                print(f"⚠️ [AI Matcher] Error: {e}")
-                # Fallback: 기존 단순 매칭 (안전장치)
-                for code in target_store_codes:
-                    clean_code = code.replace(" ", "").strip()
-                    for s in all_stores:
-                        if clean_code and (clean_code in s['store_name'].replace(" ", "") or clean_code in (s['region'] or "")):
-                             if s['store_id'] not in target_ids:
-                                 target_ids.append(s['store_id'])
-                                 store_codes.append(s['store_name'])
+        # Scope Resolution (매장 별칭 인덱스, 애매한 키워드만 LLM 판정)
+        phase_start = time.perf_counter()
+        target_ids, store_codes = await resolve_stores(target_store_codes)
+        timings["resolve_stores_ms"] = round((time.perf_counter() - phase_start) * 1000, 2)
+        print(f"🏪 [Store Resolver] Mapped {target_store_codes} -> IDs: {target_ids} ({store_codes})")
                             
         # [UI Fix] 실제 매칭된 매장명 전달 (중요)
         if store_codes:
@@ -143,165 +71,60 @@ async def diagnosis_node(state: InquiryState) -> InquiryState:
         else:
             collected_data["target_store_name"] = "전체 지점 (식별 실패)" if "ALL" not in target_store_codes else "전체 지점"
         
-        # [Anchor Date Fix] 데이터가 존재하는 실제 마지막 날짜 확인
+        # [Safety Lock] 메뉴 분석(Orders) 시 리뷰 강제 추가
+        if "orders" in required_tables and "reviews" not in required_tables:
+            print("⚠️ [Auto-Fix] 메뉴 분석을 위해 Reviews 테이블 강제 추가")
+            required_tables.append("reviews")
+
+        # [Single Round Trip] 기준일(Anchor Date) + 필요한 테이블 데이터를 CTE 쿼리 1회로 조회
+        # (기존: 기준일 / 매출 / Top5 / Worst5 / 메뉴 리뷰 / 리뷰 500건 순차 조회 6회)
+        # 매장 ID/기간은 바인딩 파라미터 -> 테이블 조합이 같으면 SQL이 같아 prepared plan 재사용
+        phase_start = time.perf_counter()
+        store_ids = target_ids or list((await get_store_index()).names)  # 식별 실패/전체 -> 전체 매장
+        bundle = await fetch_diagnosis(store_ids, period_days, required_tables)
+        timings["query_ms"] = round((time.perf_counter() - phase_start) * 1000, 2)
+
+        # [Anchor Date Fix] 데이터가 존재하는 실제 마지막 날짜 기준 (없으면 오늘)
         # 현재 시스템 시간(2026년)과 데이터 시간(2025년) 불일치 해결
-        anchor_date = None
-        q_max_date = "SELECT MAX(sale_date) as last_date FROM sales_daily"
-        if target_ids:
-             ids_str = ",".join(map(str, target_ids))
-             q_max_date += f" WHERE store_id IN ({ids_str})"
-             
-        try:
-            date_rows = await fetch_all(q_max_date)
-            if date_rows and date_rows[0]['last_date']:
-                anchor_date = date_rows[0]['last_date']
-                
-                # date 객체 확인 및 변환
-                if isinstance(anchor_date, str):
-                    curr_date = datetime.strptime(anchor_date, "%Y-%m-%d").date()
-                else:
-                    curr_date = anchor_date
-                    
-                start_date = curr_date - timedelta(days=6) # 1주일
-                # [CRITICAL FIX] Postgres 호환을 위해 명시적 날짜 문자열 사용
-                date_range_str = f"'{start_date}' AND '{curr_date}'"
-                print(f"📅 [Smart Period] 데이터 기반 기간 재설정: {start_date} ~ {curr_date}")
-            else:
-                print("⚠️ [Smart Period] 데이터가 없어 기본 기간(최근 7일) 사용")
-                # Fallback: Postgres Syntax
-                date_range_str = "CURRENT_DATE - INTERVAL '7 days' AND CURRENT_DATE"
-        except Exception as e:
-            print(f"⚠️ [Smart Period] Error: {e}")
-            
-        print(f"🔍 [Diagnosis] Effective Date Range: {date_range_str}")
+        date_range_str = f"{bundle['start_date']} ~ {bundle['end_date']}"
+        print(f"📅 [Smart Period] {bundle['start_date']} ~ {bundle['end_date']} ({timings['query_ms']}ms)")
 
         # (A) Sales Daily (매출 추이)
-        if "sales_daily" in required_tables:
-            where_sql = f"DATE(s.sale_date) BETWEEN {date_range_str}"
-            if target_ids:
-                ids_str = ",".join(map(str, target_ids))
-                where_sql += f" AND s.store_id IN ({ids_str})"
-            
-            q_sales = f"""
-                SELECT s.sale_date, st.store_name, SUM(s.total_sales) as total_sales, SUM(s.total_orders) as total_orders, MAX(s.weather_info) as weather_info
-                FROM sales_daily s
-                JOIN stores st ON s.store_id = st.store_id
-                WHERE {where_sql}
-                GROUP BY s.sale_date, st.store_name
-                ORDER BY s.sale_date ASC
-            """
-            rows = await fetch_all(q_sales)
+        if "daily_trend" in bundle:
+            rows = bundle["daily_trend"]
             collected_data["daily_trend"] = rows
-            
-            # Chart Data
-            chart_data = []
-            for r in rows:
-                chart_data.append({
+            collected_data["chart_data"] = [
+                {
                     "date": r['sale_date'],
                     "store": r['store_name'],
                     "sales": float(r['total_sales']) if r['total_sales'] else 0,
                     "orders": int(r['total_orders']) if r['total_orders'] else 0
-                })
-            collected_data["chart_data"] = chart_data
+                }
+                for r in rows
+            ]
 
-        # (B) Orders (메뉴 분석)
-        # [Safety Lock] 메뉴 분석(Orders) 시 리뷰 강제 추가
-        if "orders" in required_tables:
-            if "reviews" not in required_tables:
-                print("⚠️ [Auto-Fix] 메뉴 분석을 위해 Reviews 테이블 강제 추가")
-                required_tables.append("reviews")
-                
-            where_sql = f"DATE(o.ordered_at) BETWEEN {date_range_str}"
-            if target_ids:
-                 ids_str = ",".join(map(str, target_ids))
-                 where_sql += f" AND o.store_id IN ({ids_str})"
-            
-            q_menu = f"""
-                SELECT 
-                    m.menu_id,
-                    m.menu_name, 
-                    m.category, 
-                    SUM(o.quantity) as qty, 
-                    SUM(o.total_price) as rev
-                FROM orders o
-                JOIN menus m ON o.menu_id = m.menu_id
-                WHERE {where_sql}
-                GROUP BY m.menu_id, m.menu_name, m.category
-                ORDER BY qty DESC
-                LIMIT 5
-            """
-            # 1. Top 5 Fetch
-            rows_top = await fetch_all(q_menu)
-            print(f"📊 [Diagnosis] Top Menus Fetched: {len(rows_top)}")
-            
-            # 2. Worst 5 Fetch
-            q_worst = q_menu.replace("DESC", "ASC").replace("LIMIT 5", "LIMIT 5")
-            rows_worst = await fetch_all(q_worst)
-            print(f"📊 [Diagnosis] Worst Menus Fetched: {len(rows_worst)}")
-            
-            # 3. Review Binding Logic
-            all_target_menus = rows_top + rows_worst
-            target_menu_ids = [r['menu_id'] for r in all_target_menus]
-            
-            menu_review_map = {} 
-            
-            if target_menu_ids:
-                 ids_str_menu = ",".join(map(str, set(target_menu_ids)))
-                 q_deep = f"""
-                    SELECT o.menu_id, r.rating, r.review_text, o.ordered_at
-                    FROM reviews r
-                    JOIN orders o ON r.order_id = o.order_id
-                    WHERE o.menu_id IN ({ids_str_menu}) 
-                    AND DATE(o.ordered_at) BETWEEN {date_range_str}
-                 """
-                 
-                 # [Critial Fix] 지점 필터링 누락 수정
-                 if target_ids:
-                     ids_str_store = ",".join(map(str, target_ids))
-                     q_deep += f" AND o.store_id IN ({ids_str_store})"
-                     
-                 q_deep += " ORDER BY r.created_at DESC"
-                 deep_reviews = await fetch_all(q_deep)
-                 print(f"💬 [Diagnosis] Bound Reviews Fetched: {len(deep_reviews)}")
-                 
-                 # UI 증거용 저장
-                 collected_data["menu_specific_reviews"] = deep_reviews
-                 
-                 for dr in deep_reviews:
-                     mid = dr['menu_id']
-                     if mid not in menu_review_map:
-                         menu_review_map[mid] = []
-                     menu_review_map[mid].append(f"⭐{dr['rating']}: {dr['review_text']}")
-            
-            # 4. Attach to Menu Data
-            for r in rows_top:
-                r['related_reviews'] = menu_review_map.get(r['menu_id'], [])[:10]
-            for r in rows_worst:
-                r['related_reviews'] = menu_review_map.get(r['menu_id'], [])[:10]
+        # (B) Orders (메뉴 분석) - 메뉴별 리뷰를 Top/Worst 메뉴에 연결
+        if "top_selling_menus" in bundle:
+            rows_top, rows_worst = bundle["top_selling_menus"], bundle["low_selling_menus"]
+            deep_reviews = bundle["menu_specific_reviews"]
+            print(f"📊 [Diagnosis] Top/Worst Menus: {len(rows_top)}/{len(rows_worst)}, Bound Reviews: {len(deep_reviews)}")
+
+            # UI 증거용 저장
+            collected_data["menu_specific_reviews"] = deep_reviews
+
+            menu_review_map = {}
+            for dr in deep_reviews:
+                menu_review_map.setdefault(dr['menu_id'], []).append(f"⭐{dr['rating']}: {dr['review_text']}")
+            for r in rows_top + rows_worst:
+                r['related_reviews'] = menu_review_map.get(r['menu_id'], [])
 
             collected_data["top_selling_menus"] = rows_top
             collected_data["low_selling_menus"] = rows_worst
 
         # (C) Reviews (일반 조회)
-        if "reviews" in required_tables:
-            # Join with orders to get date & store filtering
-            where_sql = f"DATE(o.ordered_at) BETWEEN {date_range_str}"
-            if target_ids:
-                ids_str = ",".join(map(str, target_ids))
-                where_sql += f" AND o.store_id IN ({ids_str})"
-            
-            q_review = f"""
-                SELECT s.store_name, r.rating, r.review_text, o.ordered_at
-                FROM reviews r
-                JOIN orders o ON r.order_id = o.order_id
-                JOIN stores s ON o.store_id = s.store_id
-                WHERE {where_sql}
-                ORDER BY o.ordered_at DESC
-                LIMIT 500
-            """
-            rows = await fetch_all(q_review)
-            collected_data["recent_reviews"] = rows
-            print(f"💬 [Diagnosis] Recent Reviews Fetched: {len(rows)}")
+        if "recent_reviews" in bundle:
+            collected_data["recent_reviews"] = bundle["recent_reviews"]
+            print(f"💬 [Diagnosis] Recent Reviews Fetched: {len(bundle['recent_reviews'])}")
 
     except Exception as e:
         print(f"❌ [Diagnosis] Critical Error: {e}")
@@ -309,6 +132,7 @@ async def diagnosis_node(state: InquiryState) -> InquiryState:
         collected_data["summary_text"] = f"데이터 조회 중 심각한 오류가 발생했습니다: {e}"
         
     # 3. Summary Generation (LLM을 위한 요약 텍스트)
+    phase_start = time.perf_counter()
     # [Contextual Binding] 메뉴와 리뷰를 함께 제공
     summary_text = f"=== 📊 분석 리포트 ({', '.join(store_codes)}) ===\n"
     summary_text += f"기간: {date_range_str}\n\n"
@@ -338,7 +162,7 @@ async def diagnosis_node(state: InquiryState) -> InquiryState:
                 
     if "recent_reviews" in collected_data and isinstance(collected_data["recent_reviews"], list):
         summary_text += "\n[최근 고객 리뷰 데이터 (매장 전체)]\n"
-        for r in collected_data["recent_reviews"][:20]: # 상위 20개만
+        for r in collected_data["recent_reviews"][:DIAGNOSIS_RECENT_REVIEW_LIMIT]:
             s_name = r.get('store_name', '')
             summary_text += f"- [{s_name}] ⭐{r.get('rating')}: {r.get('review_text')}\n"
 
@@ -351,13 +175,18 @@ async def diagnosis_node(state: InquiryState) -> InquiryState:
         total_orders = sum([int(r['total_orders']) for r in collected_data["daily_trend"] if r['total_orders']])
         
         collected_data["key_metrics"] = {
-            "period": "최근 7일",
+            "period": f"최근 {period_days}일",
             "total_sales": total_sales,
             "total_orders": total_orders
         }
 
     # 간단 진단 코멘트 (타이틀용)
-    collected_data["diagnosis_result"] = f"분석 완료: {', '.join(store_codes)} (최근 7일)"
+    collected_data["diagnosis_result"] = f"분석 완료: {', '.join(store_codes)} (최근 {period_days}일)"
+
+    timings["summary_ms"] = round((time.perf_counter() - phase_start) * 1000, 2)
+    timings["total_ms"] = round(sum(timings.values()), 2)
+    collected_data["timings_ms"] = timings
+    print(f"⏱️ [Diagnosis] 단계별 소요 시간: {timings}")
 
     state["sales_data"] = collected_data
     return state
@@ -1,14 +1,28 @@
+from app.clients.openai import embed_text
 from app.inquiry.inquiry_schema import InquiryState
-from app.inquiry.inquiry_service import save_inquiry
+from app.inquiry.inquiry_service import get_answer_corpus_version, save_inquiry
 
 # ===== Step 7: Save Node (DB 저장) =====
 async def save_node(state: InquiryState) -> InquiryState:
-    """질문과 답변을 DB에 저장"""
-    inquiry_id = save_inquiry(
+    """질문과 답변을 DB에 저장 (내부 문서 기반 답변은 시맨틱 캐시용 임베딩/코퍼스 버전도 함께)"""
+    question_embedding, corpus_version = None, None
+    if state.get("search_meta", {}).get("source") != "web_search":
+        try:
+            corpus_version = await get_answer_corpus_version(state["category"])
+            if corpus_version:
+                # Phase 1에서 같은 질문을 임베딩했으므로 임베딩 캐시 Hit
+                question_embedding = await embed_text(state["question"])
+        except Exception as e:
+            print(f"⚠️ [Save] 시맨틱 캐시 정보 생성 실패 (답변만 저장): {e}")
+            question_embedding, corpus_version = None, None
+
+    inquiry_id = await save_inquiry(
         store_id=state["store_id"],
         category=state["category"],
         question=state["question"],
-        answer=state["final_answer"]
+        answer=state["final_answer"],
+        question_embedding=question_embedding,
+        corpus_version=corpus_version,
     )
     
     state["inquiry_id"] = inquiry_id
@@ -0,0 +1,168 @@
+import os
+from datetime import date
+from functools import lru_cache
+from psycopg import sql
+from psycopg.types.numeric import Int4
+from app.core.db import fetch_one
+from app.store.store_watermark import get_anchor_date
+
+# ---------------------------------------------------------
+# [Sales Query Builder] 매출 분석(diagnosis_node)용 고정 파라미터 SQL
+# - SQL 문자열은 필요한 테이블 조합(sales_daily / orders / reviews, 최대 8가지)에만 의존
+#   매장 ID는 store_id = ANY(%(store_ids)s), 기간은 %(period_days)s로 바인딩 -> 질문마다 SQL이 달라지지 않음
+# - 조합별 SQL은 프로세스당 1회 생성(lru_cache), 실행은 prepared statement (SQL_PREPARE_ENABLED)
+#   -> Postgres가 파싱/플랜을 커넥션별로 재사용
+# - pgbouncer transaction 모드처럼 prepared statement를 못 쓰는 환경이면 SQL_PREPARE_ENABLED=false
+# - 기존 f-string 방식과의 비교: scripts/benchmark_sales_query.py
+# ---------------------------------------------------------
+
+SQL_PREPARE_ENABLED = os.getenv("SQL_PREPARE_ENABLED", "true").lower() == "true"
+
+# 요약에 실제로 쓰는 만큼만 SQL에서 자름 (메뉴 Top/Worst 수, 메뉴별 리뷰 수, 최근 리뷰 수)
+DIAGNOSIS_MENU_LIMIT = 5
+DIAGNOSIS_MENU_REVIEW_LIMIT = 10
+DIAGNOSIS_RECENT_REVIEW_LIMIT = 20
+
+SALES_TABLES = ("sales_daily", "orders", "reviews")
+
+# 기준일(데이터가 있는 마지막 날짜, 없으면 오늘) / 기간
+# 매장 워터마크로 기준일을 알면 %(anchor_date)s로 받고 MAX 서브쿼리는 실행되지 않음 (COALESCE 단락 평가)
+_BOUNDS = sql.SQL("""
+    anchor AS (
+        SELECT COALESCE(
+            %(anchor_date)s::date,
+            (SELECT MAX(s.sale_date) FROM sales_daily s WHERE s.store_id = ANY(%(store_ids)s)),
+            CURRENT_DATE
+        ) AS end_date
+    ),
+    bounds AS (
+        SELECT end_date - %(period_days)s::int + 1 AS start_date,
+               end_date,
+               (end_date + 1)::timestamp AS end_ts
+        FROM anchor
+    )""")
+
+# 테이블별 조각: (CTE, 결과 컬럼 목록), 목록은 json_agg로 한 행에 담음
+_SLICES = {
+    # 일별 매출 추이
+    "sales_daily": (
+        sql.SQL("""
+    daily AS (
+        SELECT s.sale_date, st.store_name, SUM(s.total_sales) AS total_sales,
+               SUM(s.total_orders) AS total_orders, MAX(s.weather_info) AS weather_info
+        FROM sales_daily s
+        JOIN stores st ON s.store_id = st.store_id
+        CROSS JOIN bounds b
+        WHERE s.sale_date BETWEEN b.start_date AND b.end_date
+          AND s.store_id = ANY(%(store_ids)s)
+        GROUP BY s.sale_date, st.store_name
+    )"""),
+        [
+            sql.SQL("(SELECT COALESCE(json_agg(d ORDER BY d.sale_date, d.store_name), '[]') FROM daily d) AS daily_trend"),
+        ],
+    ),
+    # 메뉴 집계 1회 -> Top/Worst + 메뉴별 최신 리뷰
+    "orders": (
+        sql.SQL("""
+    menu_stats AS (
+        SELECT m.menu_id, m.menu_name, m.category, SUM(o.quantity) AS qty, SUM(o.total_price) AS rev
+        FROM orders o
+        JOIN menus m ON o.menu_id = m.menu_id
+        CROSS JOIN bounds b
+        WHERE o.ordered_at >= b.start_date AND o.ordered_at < b.end_ts
+          AND o.store_id = ANY(%(store_ids)s)
+        GROUP BY m.menu_id, m.menu_name, m.category
+    ),
+    top_menus AS (
+        SELECT * FROM menu_stats ORDER BY qty DESC, menu_id LIMIT %(menu_limit)s
+    ),
+    low_menus AS (
+        SELECT * FROM menu_stats ORDER BY qty ASC, menu_id LIMIT %(menu_limit)s
+    ),
+    menu_reviews AS (
+        SELECT menu_id, rating, review_text, ordered_at
+        FROM (
+            SELECT o.menu_id, r.rating, r.review_text, o.ordered_at,
+                   row_number() OVER (PARTITION BY o.menu_id ORDER BY r.created_at DESC) AS rn
+            FROM reviews r
+            JOIN orders o ON r.order_id = o.order_id
+            CROSS JOIN bounds b
+            WHERE o.menu_id IN (SELECT menu_id FROM top_menus UNION SELECT menu_id FROM low_menus)
+              AND o.ordered_at >= b.start_date AND o.ordered_at < b.end_ts
+              AND o.store_id = ANY(%(store_ids)s)
+        ) ranked
+        WHERE rn <= %(menu_review_limit)s
+    )"""),
+        [
+            sql.SQL("(SELECT COALESCE(json_agg(t ORDER BY t.qty DESC, t.menu_id), '[]') FROM top_menus t) AS top_selling_menus"),
+            sql.SQL("(SELECT COALESCE(json_agg(l ORDER BY l.qty ASC, l.menu_id), '[]') FROM low_menus l) AS low_selling_menus"),
+            sql.SQL(
+                "(SELECT COALESCE(json_agg(mr ORDER BY mr.menu_id, mr.ordered_at DESC), '[]') FROM menu_reviews mr) AS menu_specific_reviews"
+            ),
+        ],
+    ),
+    # 최근 리뷰
+    "reviews": (
+        sql.SQL("""
+    recent_reviews AS (
+        SELECT st.store_name, r.rating, r.review_text, o.ordered_at
+        FROM reviews r
+        JOIN orders o ON r.order_id = o.order_id
+        JOIN stores st ON o.store_id = st.store_id
+        CROSS JOIN bounds b
+        WHERE o.ordered_at >= b.start_date AND o.ordered_at < b.end_ts
+          AND o.store_id = ANY(%(store_ids)s)
+        ORDER BY o.ordered_at DESC
+        LIMIT %(recent_review_limit)s
+    )"""),
+        [
+            sql.SQL("(SELECT COALESCE(json_agg(rr ORDER BY rr.ordered_at DESC), '[]') FROM recent_reviews rr) AS recent_reviews"),
+        ],
+    ),
+}
+
+
+@lru_cache(maxsize=None)
+def diagnosis_statement(tables: tuple[str, ...]) -> sql.Composed:
+    """테이블 조합(SALES_TABLES 순서로 정렬된 튜플) -> 고정 SQL (조합별 1회 생성)"""
+    ctes, columns = [_BOUNDS], [sql.SQL("b.start_date, b.end_date")]
+    for table in tables:
+        cte, cols = _SLICES[table]
+        ctes.append(cte)
+        columns.extend(cols)
+    return sql.SQL("WITH {ctes}\nSELECT {columns}\nFROM bounds b").format(
+        ctes=sql.SQL(",").join(ctes), columns=sql.SQL(",\n       ").join(columns)
+    )
+
+
+def build_diagnosis_query(store_ids: list[int], period_days: int, required_tables: list[str], anchor_date: date | None = None):
+    """
+    매출 분석 데이터 1회 왕복 쿼리 -> (query, params)
+    - store_ids: 분석 대상 매장 ID (전체 매장이면 전체 ID 목록)
+    - required_tables: sales_daily / orders / reviews 중 필요한 것만 (순서 무관)
+    - anchor_date: 기준일 (None이면 SQL에서 MAX(sale_date))
+    """
+    tables = tuple(table for table in SALES_TABLES if table in required_tables)
+    # psycopg는 정수 크기에 따라 int2/int4/int8로 보내고 타입이 다르면 prepared statement도 따로 만듦
+    # -> 항상 int4 / int4[]로 고정
+    params = {
+        "store_ids": [Int4(store_id) for store_id in store_ids],
+        "anchor_date": anchor_date,
+        "period_days": Int4(period_days),
+        "menu_limit": Int4(DIAGNOSIS_MENU_LIMIT),
+        "menu_review_limit": Int4(DIAGNOSIS_MENU_REVIEW_LIMIT),
+        "recent_review_limit": Int4(DIAGNOSIS_RECENT_REVIEW_LIMIT),
+    }
+    return diagnosis_statement(tables), params
+
+
+async def fetch_diagnosis(store_ids: list[int], period_days: int, required_tables: list[str]) -> dict:
+    """
+    매출 분석 데이터 조회 (prepared statement, 기준일은 매장 워터마크에서)
+
+    Returns:
+        {"start_date", "end_date", + 테이블별 daily_trend / top_selling_menus / low_selling_menus /
+         menu_specific_reviews / recent_reviews}
+    """
+    query, params = build_diagnosis_query(store_ids, period_days, required_tables, get_anchor_date(store_ids))
+    return await fetch_one(query, params, prepare=SQL_PREPARE_ENABLED)
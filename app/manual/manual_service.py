@@ -0,0 +1,14 @@
+from app.core.cache import cached
+from app.core.db import fetch_all
+
+
+@cached("manuals", ttl=3600)
+async def select_manuals_all():
+    # 임베딩(Vector) 컬럼은 응답에 필요 없으므로 제외하고 조회
+    sql = """
+        SELECT manual_id, category, title, content, created_at
+        FROM manuals
+        ORDER BY manual_id
+    """
+    rows = await fetch_all(sql)
+    return rows
@@ -1,7 +1,7 @@
 from pydantic import BaseModel
-from sqlalchemy import Column, Integer, String, Boolean, Numeric, Text
+from sqlalchemy import Column, Integer, String, Boolean, Numeric, Text, Index
 from pgvector.sqlalchemy import Vector
-from app.core.db import base
+from app.core.db import base, VECTOR_HNSW_M, VECTOR_HNSW_EF_CONSTRUCTION
 
 # ---------- API / JSON 용 Pydantic 스키마 ----------
 
@@ -35,3 +35,14 @@ class Menu(base):
 
     description = Column(String(500), nullable=True)         # 메뉴 설명 (임베딩 대상)
     embedding = Column(Vector(1536), nullable=True)   # 메뉴 추천/검색용 임베딩
+
+    # 코사인 거리(<=>) 검색용 HNSW 인덱스
+    __table_args__ = (
+        Index(
+            "ix_menus_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": VECTOR_HNSW_M, "ef_construction": VECTOR_HNSW_EF_CONSTRUCTION},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
+    )
@@ -1,7 +1,14 @@
+from app.core.cache import cached
 from app.core.db import fetch_all
 
 
+@cached("menus", ttl=3600)
 async def select_menus_all():
-    sql = "SELECT * FROM menus"
+    # 임베딩(Vector) 컬럼은 응답에 필요 없으므로 제외하고 조회
+    sql = """
+        SELECT menu_id, menu_name, category, is_seasonal, cost_price, list_price,
+               ingredients, recipe_steps, description
+        FROM menus
+    """
     rows = await fetch_all(sql)
     return rows
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from sqlalchemy import Column, Integer, Numeric, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Numeric, DateTime, ForeignKey, Index
 from app.core.db import base
 
 # ---------- API / JSON 용 Pydantic 스키마 ----------
@@ -26,3 +26,12 @@ class Order(base):
     quantity = Column(Integer, nullable=False)
     total_price = Column(Numeric(10, 2), nullable=False)
     ordered_at = Column(DateTime, default=datetime.now, nullable=False)
+
+    # 매장 + 기간 조회(메뉴 비교/매출 분석)용 커버링 인덱스
+    __table_args__ = (
+        Index(
+            "ix_orders_store_ordered_at_covering",
+            "store_id", "ordered_at",
+            postgresql_include=["menu_id", "quantity", "total_price"],
+        ),
+    )
@@ -1,4 +1,7 @@
+from datetime import date
+from app.core.cache import cached
 from app.core.db import fetch_all
+from app.store.store_watermark import watermark_token
 
 
 async def select_orders_by_store(store_id: int):
@@ -13,14 +16,34 @@ async def select_orders_by_store(store_id: int):
     return rows
 
 
-async def select_daily_sales_by_store(store_id: int):
-    sql = """
+# 키에 매장 워터마크 포함: 새 매출 데이터가 들어오면 다른 키 -> TTL을 기다리지 않고 최신 데이터 조회
+@cached(
+    "daily_sales",
+    ttl=600,
+    key_builder=lambda store_id, since=None, until=None: f"{store_id}:{since or ''}:{until or ''}:{watermark_token(store_id)}",
+)
+async def select_daily_sales_by_store(store_id: int, since: date = None, until: date = None):
+    """
+    매장 일별 매출 (날짜 오름차순)
+    Args:
+        since / until (date): 조회 기간 (양 끝 포함), 없으면 전체 이력
+    기간을 주면 (store_id, sale_date) 커버링 인덱스만 읽으므로 이력 길이와 무관
+    """
+    conditions, params = ["store_id = %s"], [store_id]
+    if since:
+        conditions.append("sale_date >= %s")
+        params.append(since)
+    if until:
+        conditions.append("sale_date <= %s")
+        params.append(until)
+
+    sql = f"""
         SELECT sale_date as order_date, total_sales as daily_revenue, total_orders as order_count, COALESCE(weather_info, '알수없음') as weather_info
         FROM sales_daily
-        WHERE store_id = %s
+        WHERE {" AND ".join(conditions)}
         ORDER BY sale_date ASC
     """
-    rows = await fetch_all(sql, (store_id,))
+    rows = await fetch_all(sql, tuple(params))
     return rows
 
 
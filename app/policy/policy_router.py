@@ -1,14 +1,13 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter
 from typing import List
-from app.core.db import get_db
-from app.policy.policy_schema import Policy, PolicyResponse
+from app.policy.policy_schema import PolicyResponse
+from app.policy.policy_service import select_policies_all
 
 router = APIRouter(prefix="/policy", tags=["Policy"])
 
 @router.get("/get", response_model=List[PolicyResponse])
-def get_policies(db: Session = Depends(get_db)):
+async def get_policies():
     """모든 정책/규정 조회"""
-    results = db.query(Policy).all()
+    results = await select_policies_all()
     # Pydantic 모델(PolicyResponse)로 자동 변환 (임베딩 필드 제외)
     return results
@@ -1,10 +1,10 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index, ForeignKey, UniqueConstraint
 from sqlalchemy.sql import func
 from pgvector.sqlalchemy import Vector
 from pydantic import BaseModel
 from typing import Optional, List
-from app.core.db import base
+from app.core.db import base, VECTOR_HNSW_M, VECTOR_HNSW_EF_CONSTRUCTION
 
 # ---------- Alembic / DB 매핑용 SQLAlchemy 모델 ----------
 class Policy(base):
@@ -21,6 +21,44 @@ class Policy(base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # 코사인 거리(<=>) 검색용 HNSW 인덱스
+    __table_args__ = (
+        Index(
+            "ix_policies_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": VECTOR_HNSW_M, "ef_construction": VECTOR_HNSW_EF_CONSTRUCTION},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
+    )
+
+class PolicyChunk(base):
+    """정책 본문을 문단 단위로 나눈 검색용 조각 (app/core/chunking.py가 변경분만 임베딩/갱신)"""
+    __tablename__ = "policy_chunks"
+
+    chunk_id = Column(Integer, primary_key=True)
+    policy_id = Column(Integer, ForeignKey("policies.policy_id", ondelete="CASCADE"), nullable=False)
+    chunk_no = Column(Integer, nullable=False)          # 문서 내 순번 (0부터)
+    category = Column(String(50), nullable=False)
+    title = Column(String(200), nullable=False)         # 문서 제목 (검색 결과 표시 / 키워드 검색용)
+    content = Column(Text, nullable=False)              # 조각 본문
+    content_hash = Column(String(64), nullable=False)   # 임베딩 입력의 sha256 -> 같으면 재임베딩 생략
+
+    embedding = Column(Vector(1536), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("policy_id", "chunk_no", name="uix_policy_chunks_doc_chunk"),
+        Index(
+            "ix_policy_chunks_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": VECTOR_HNSW_M, "ef_construction": VECTOR_HNSW_EF_CONSTRUCTION},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
+    )
+
+
 # ---------- API / JSON 용 Pydantic 스키마 ----------
 class PolicyCreate(BaseModel):
     category: str
@@ -0,0 +1,14 @@
+from app.core.cache import cached
+from app.core.db import fetch_all
+
+
+@cached("policies", ttl=3600)
+async def select_policies_all():
+    # 임베딩(Vector) 컬럼은 응답에 필요 없으므로 제외하고 조회
+    sql = """
+        SELECT policy_id, category, title, content, created_at
+        FROM policies
+        ORDER BY policy_id
+    """
+    rows = await fetch_all(sql)
+    return rows
@@ -1,28 +1,38 @@
 import json
+import time
+import functools
 from typing import Annotated, TypedDict, List, Dict, Any
 from datetime import date
 from langgraph.graph import StateGraph, END
-from app.core.db import SessionLocal
-from app.report.report_schema import StoreReport
 from app.order.order_service import select_daily_sales_by_store, select_menu_sales_comparison, select_sales_by_day_type
 from app.review.review_service import select_reviews_by_store
 from app.clients.genai import genai_generate_text
 from app.clients.weather import fetch_weather_data
+from app.store.store_watermark import get_store_watermark, watermark_token
 
-from app.core.db import fetch_all
+from app.core.db import fetch_all, execute_return
+from psycopg.types.json import Json
 from datetime import datetime, timedelta
 
 from langgraph.graph.message import add_messages
 
+# 리포트에 넣는 최신 리뷰 수
+REPORT_REVIEW_LIMIT = 15
+
 # 리스트를 덮어쓰지 않고 추가하기 위한 리듀서 함수
 def append_logs(left: List[str], right: List[str]) -> List[str]:
     return left + right
 
+# 병렬 브랜치가 각자 쓴 노드별 소요 시간을 합치는 리듀서 함수
+def merge_timings(left: Dict[str, float], right: Dict[str, float]) -> Dict[str, float]:
+    return {**left, **right}
+
 # 1. 그래프 상태(State) 정의
 class ReportState(TypedDict):
     store_id: int
     store_name: str
     target_date: str # [Optional] 분석 기준 날짜 (YYYY-MM-DD)
+    daily_sales_rows: List[Dict[str, Any]] # 지난주 시작 ~ 기준일 14일치 (join_data에서 이번주/지난주로 분리)
     sales_data: List[Dict[str, Any]]      # 이번주 매출 (최근 7일)
     prev_sales_data: List[Dict[str, Any]] # 지난주 매출 (그 전 7일)
     reviews_data: List[Dict[str, Any]]
@@ -31,28 +41,55 @@ class ReportState(TypedDict):
     # [NEW] 집계 정합성을 위해 fetch 단계에서 계산한 값을 넘김
     calculated_total_sales: float 
     calculated_prev_sales: float
+    data_watermark: str  # 수집 시점의 매장 데이터 버전 (캐시 키 / 저장된 리포트 재사용 판단)
     final_report: Dict[str, Any]
+    node_timings: Annotated[Dict[str, float], merge_timings] # 노드별 소요 시간 (ms)
     execution_logs: Annotated[List[str], append_logs]
 
-async def fetch_data_node(state: ReportState):
-    """DB에서 매출과 리뷰 데이터를 수집하는 노드"""
+
+def timed_node(name: str):
+    """노드 실행 시간을 node_timings[name]에 기록하는 데코레이터 (ms)"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(state: ReportState):
+            start = time.perf_counter()
+            result = await func(state)
+            result["node_timings"] = {name: round((time.perf_counter() - start) * 1000, 2)}
+            return result
+        return wrapper
+    return decorator
+
+
+def report_window(target_date_str: str):
+    """기준일 -> (이번주 시작, 기준일, 지난주 시작, 지난주 끝)"""
+    # 이번주: ref_date 포함 최근 7일 (ref_date - 6 ~ ref_date)
+    # 지난주: 그 전 7일 (ref_date - 13 ~ ref_date - 7)
+    ref_date = datetime.strptime(target_date_str, "%Y-%m-%d").date()
+    return ref_date - timedelta(days=6), ref_date, ref_date - timedelta(days=13), ref_date - timedelta(days=7)
+
+
+@timed_node("resolve_anchor")
+async def resolve_anchor_node(state: ReportState):
+    """기준 날짜(Anchor Date)와 데이터 버전을 정하는 노드 (이후 조회 브랜치가 공유)"""
     store_id = state["store_id"]
     log = f"📊 [Fetch] '{state['store_name']}' 데이터 수집 시작"
     print(log)
 
-    # 1. 기준 날짜(Anchor Date) 결정
     # 시연 모드 or 과거 날짜 조회 지원
     target_date_str = state.get("target_date")
-    
-
-    if not target_date_str:
+    data_watermark = watermark_token(store_id)
+    watermark = get_store_watermark(store_id)
+
+    if not target_date_str and watermark and watermark["last_sale_date"]:
+        # 매장 워터마크(메모리)의 마지막 매출 날짜 사용 -> MAX(sale_date) 쿼리 생략
+        target_date_str = str(watermark["last_sale_date"])
+        log += f"\n🕒 최신 데이터 날짜 기준: {target_date_str} (워터마크)"
+    elif not target_date_str:
         # 타겟 날짜가 없으면 DB 최신 날짜 조회 (Simulation Mode)
         try:
-            max_date_rows = await fetch_all(f"""
-                SELECT MAX(sale_date) as last_date 
-                FROM sales_daily 
-                WHERE store_id = {store_id}
-            """)
+            max_date_rows = await fetch_all(
+                "SELECT MAX(sale_date) as last_date FROM sales_daily WHERE store_id = %s", (store_id,)
+            )
             if max_date_rows and max_date_rows[0]['last_date']:
                 target_date_str = str(max_date_rows[0]['last_date'])
                 log += f"\n🕒 최신 데이터 날짜 기준: {target_date_str}"
@@ -61,27 +98,46 @@ async def fetch_data_node(state: ReportState):
         except:
             target_date_str = str(date.today())
 
+    return {
+        "target_date": target_date_str, # State 업데이트
+        "data_watermark": data_watermark,
+        "execution_logs": [log],
+    }
 
-    ref_date = datetime.strptime(target_date_str, "%Y-%m-%d").date()
-    
-    # 2. 데이터 조회
-    # 메뉴별, 요일별 통계는 기준 날짜를 넘겨서 DB에서 정확히 계산
-    menu_stats = await select_menu_sales_comparison(store_id, days=7, target_date=target_date_str)
+
+# 2. 데이터 조회 (서로 독립 -> 병렬 브랜치, 각자 공용 커넥션 풀에서 커넥션 사용)
+# 기간/건수는 SQL에서 자름 -> 매장 이력이 길어도 조회량 일정
+
+@timed_node("fetch_menu_stats")
+async def fetch_menu_stats_node(state: ReportState):
+    """메뉴별 최근 7일 vs 이전 7일 비교 (기준 날짜를 넘겨서 DB에서 정확히 계산)"""
+    menu_stats = await select_menu_sales_comparison(state["store_id"], days=7, target_date=state["target_date"])
     # day_stats = await select_sales_by_day_type(store_id, days=7, target_date=target_date_str) # [삭제] DB 호출 대신 직접 집계
-    reviews = await select_reviews_by_store(store_id) # 리뷰는 전체 가져와서 최신순 (TODO: 날짜 필터링?)
+    return {"menu_sales_data": menu_stats}
+
+
+@timed_node("fetch_reviews")
+async def fetch_reviews_node(state: ReportState):
+    """기준일까지 작성된 최신 REPORT_REVIEW_LIMIT건"""
+    _, ref_date, _, _ = report_window(state["target_date"])
+    reviews = await select_reviews_by_store(state["store_id"], until=ref_date, limit=REPORT_REVIEW_LIMIT)
+    return {"reviews_data": reviews}
+
+
+@timed_node("fetch_daily_sales")
+async def fetch_daily_sales_node(state: ReportState):
+    """일별 매출은 지난주 시작 ~ 기준일 14일치만 조회"""
+    _, curr_end, prev_start, _ = report_window(state["target_date"])
+    rows = await select_daily_sales_by_store(state["store_id"], since=prev_start, until=curr_end)
+    return {"daily_sales_rows": rows}
+
+
+@timed_node("join_data")
+async def join_data_node(state: ReportState):
+    """병렬 조회 결과 합류: 이번주 / 지난주 분리 및 합계 계산"""
+    target_date_str = state["target_date"]
+    curr_start, curr_end, prev_start, prev_end = report_window(target_date_str)
 
-    # 일별 매출은 전체를 가져온 뒤 파이썬에서 날짜 필터링 (DB 호출 횟수 절약)
-    all_sales = await select_daily_sales_by_store(store_id)
-    
-    # 3. 날짜 필터링 (이번주 vs 지난주)
-    # 이번주: ref_date 포함 최근 7일 (ref_date - 6 ~ ref_date)
-    # 지난주: 그 전 7일 (ref_date - 13 ~ ref_date - 7)
-    
-    curr_start = ref_date - timedelta(days=6)
-    curr_end = ref_date
-    prev_start = ref_date - timedelta(days=13)
-    prev_end = ref_date - timedelta(days=7)
-    
     target_sales = []
     prev_sales = []
 
@@ -89,7 +145,7 @@ async def fetch_data_node(state: ReportState):
     weekday_sales = {"recent": 0, "prev": 0}
     weekend_sales = {"recent": 0, "prev": 0}
     
-    for s in all_sales:
+    for s in state.get("daily_sales_rows", []):
         s_date = s['order_date'] # date object
         rev = float(s['daily_revenue'])
 
@@ -119,15 +175,13 @@ async def fetch_data_node(state: ReportState):
     return {
         "sales_data": target_sales,
         "prev_sales_data": prev_sales,
-        "reviews_data": reviews[:15], # 최신 15개만 사용
-        "menu_sales_data": menu_stats,
         "weather_data": weather_map,
         "calculated_total_sales": weekday_sales["recent"] + weekend_sales["recent"], # [NEW] 정확한 합계 전달
         "calculated_prev_sales": weekday_sales["prev"] + weekend_sales["prev"],
-        "target_date": target_date_str, # State 업데이트
-        "execution_logs": [log, f"✅ [Fetch] 데이터 수집 및 정합성 검증 완료 (기준일: {target_date_str})"]
+        "execution_logs": [f"✅ [Fetch] 데이터 수집 및 정합성 검증 완료 (기준일: {target_date_str})"]
     }
 
+@timed_node("analyze_data")
 async def analyze_data_node(state: ReportState):
     """데이터 분석 및 수치적 근거 계산을 수행하는 노드"""
     log = "🧠 [Analyze] 수치 데이터 계산 및 AI 분석 시작"
@@ -306,9 +360,8 @@ async def analyze_data_node(state: ReportState):
         "execution_logs": [log, f"✅ [Analyze] 수치 근거 분석 완료 (주간 성장률: {growth_rate:+.1f}%)"]
     }
 
-async def save_report_node(state: ReportState):
-    """최종 리포트를 DB에 저장하는 노드"""
-    log = "💾 [Save] 분석 결과 DB 저장 중"
+def build_report_record(state: ReportState) -> Dict[str, Any]:
+    """최종 리포트 -> store_reports 행과 같은 모양 (저장 전에 바로 응답/캐시에 사용)"""
     report_dict = state["final_report"]
 
     # 메트릭 및 소스 정보를 risk_assessment 내부에 병합하여 영구 저장
@@ -316,16 +369,27 @@ async def save_report_node(state: ReportState):
     risk_info['metrics'] = report_dict.get('metrics')
     risk_info['data_evidence'] = report_dict.get('data_evidence')
     risk_info['source_data'] = report_dict.get('source_data')  # 원본 데이터 추가 저장
+    risk_info['data_watermark'] = state.get('data_watermark', '')  # 이 버전 이후 데이터가 들어오면 재생성
+    risk_info['node_timings'] = state.get('node_timings', {})  # 노드별 소요 시간 (ms)
+
+    return {
+        "report_id": None,  # DB 저장(백그라운드) 후 부여
+        "store_id": state["store_id"],
+        "report_date": date.today(),
+        "report_type": "AI_GRAPH_REPORT",
+        "summary": report_dict['summary'],
+        "marketing_strategy": report_dict['marketing_strategy'],
+        "operational_improvement": report_dict['operational_improvement'],
+        "risk_assessment": risk_info,
+        "created_at": datetime.now(),
+    }
 
-    db_report = StoreReport(
-        store_id=state["store_id"],
-        report_date=date.today(),
-        report_type="AI_GRAPH_REPORT",
-        summary=report_dict['summary'],
-        marketing_strategy=report_dict['marketing_strategy'],
-        operational_improvement=report_dict['operational_improvement'],
-        risk_assessment=risk_info
-    )
+
+async def save_report(record: Dict[str, Any]) -> str:
+    """
+    리포트 행을 DB에 저장 (그래프 밖에서 응답 후 백그라운드로 실행), 결과 로그 반환
+    """
+    risk_info = record["risk_assessment"]
 
     # Risk 점수가 0이면 파싱 실패로 간주 -> DB 저장 건너뛰기 (재시도 유도)
     risk_score_val = risk_info.get('risk_score') if isinstance(risk_info, dict) else 0
@@ -333,31 +397,60 @@ async def save_report_node(state: ReportState):
     # [Prevent Saving Bad Data] 
     # 파싱 실패(0)거나 필수 필드가 없으면 저장하지 않음.
     if not risk_score_val or risk_score_val == 0:
-        return {
-             "execution_logs": [log, "⚠️ [Skip Save] 불완전한 리포트(Risk Parsing Fail)로 인해 DB 저장을 생략합니다."]
-        }
-
-    with SessionLocal() as session:
-        session.query(StoreReport).filter_by(
-            store_id=state["store_id"],              
-            report_date=date.today()).delete()
-        session.add(db_report)
-        session.commit()
-
-    return {
-        "execution_logs": [log, "🏁 [Complete] 프로세스 종료"]
-    }
+        return "⚠️ [Skip Save] 불완전한 리포트(Risk Parsing Fail)로 인해 DB 저장을 생략합니다."
+
+    # [Async Upsert] 동기 Session(delete → insert) 대신 단일 INSERT ... ON CONFLICT (풀 커넥션 사용)
+    sql = """
+        INSERT INTO store_reports (
+            store_id, report_date, report_type, summary,
+            marketing_strategy, operational_improvement, risk_assessment, created_at
+        )
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        ON CONFLICT (store_id, report_date) DO UPDATE SET
+            report_type = EXCLUDED.report_type,
+            summary = EXCLUDED.summary,
+            marketing_strategy = EXCLUDED.marketing_strategy,
+            operational_improvement = EXCLUDED.operational_improvement,
+            risk_assessment = EXCLUDED.risk_assessment,
+            created_at = EXCLUDED.created_at
+        RETURNING report_id
+    """
+    params = (
+        record["store_id"],
+        record["report_date"],
+        record["report_type"],
+        record['summary'],
+        record['marketing_strategy'],
+        record['operational_improvement'],
+        Json(risk_info, dumps=lambda obj: json.dumps(obj, ensure_ascii=False, default=str)),
+        record["created_at"],
+    )
+    saved = await execute_return(sql, params)
+    if not saved:
+        return "❌ [Save] DB 저장 실패 (Upsert Error)"
+    return f"💾 [Save] 리포트 DB 저장 완료 (report_id={saved['report_id']})"
 
 def create_report_graph():
+    """
+    resolve_anchor -> (fetch_menu_stats | fetch_reviews | fetch_daily_sales 병렬) -> join_data -> analyze_data
+    DB 저장 / 캐시 저장은 응답 경로 밖 (report_service에서 백그라운드 실행)
+    """
     workflow = StateGraph(ReportState)
-    workflow.add_node("fetch_data", fetch_data_node)
+    workflow.add_node("resolve_anchor", resolve_anchor_node)
+    workflow.add_node("fetch_menu_stats", fetch_menu_stats_node)
+    workflow.add_node("fetch_reviews", fetch_reviews_node)
+    workflow.add_node("fetch_daily_sales", fetch_daily_sales_node)
+    workflow.add_node("join_data", join_data_node)
     workflow.add_node("analyze_data", analyze_data_node)
-    workflow.add_node("save_report", save_report_node)
 
-    workflow.set_entry_point("fetch_data")
-    workflow.add_edge("fetch_data", "analyze_data")
-    workflow.add_edge("analyze_data", "save_report")
-    workflow.add_edge("save_report", END)
+    workflow.set_entry_point("resolve_anchor")
+    # Fan-out: 같은 단계(superstep)의 노드는 동시에 실행됨
+    for branch in ("fetch_menu_stats", "fetch_reviews", "fetch_daily_sales"):
+        workflow.add_edge("resolve_anchor", branch)
+    # Fan-in: 세 브랜치가 모두 끝나야 join_data 실행
+    workflow.add_edge(["fetch_menu_stats", "fetch_reviews", "fetch_daily_sales"], "join_data")
+    workflow.add_edge("join_data", "analyze_data")
+    workflow.add_edge("analyze_data", END)
 
     return workflow.compile()
 
@@ -1,6 +1,9 @@
+from datetime import date
+from typing import Optional
 from fastapi import APIRouter, HTTPException
+from app.core.cache import invalidate_reports, invalidate_store_reports, invalidate_all_reports
 from app.report.report_schema import GenerateReportRequest
-from app.report.report_service import generate_ai_store_report, select_latest_report
+from app.report.report_service import generate_ai_store_report, select_latest_report, delete_reports_by_store, delete_all_reports
 
 router = APIRouter(prefix="/report", tags=["report"])
 
@@ -31,25 +34,13 @@ async def delete_reports(store_id: int):
     """
     해당 지점의 모든 AI 리포트 데이터 삭제 (초기화)
     """
-    from app.core.db import SessionLocal
-    from app.report.report_schema import StoreReport
-    
     try:
-        # 1. DB 삭제
-        with SessionLocal() as session:
-            # 해당 지점 리포트 전체 삭제
-            session.query(StoreReport).filter(StoreReport.store_id == store_id).delete()
-            session.commit()
-            
-        # 2. Redis 캐시 삭제 (동기화)
-        from app.core.cache import get_redis
-        client = await get_redis()
-        if client:
-            # 해당 store_id의 모든 리포트 키 스캔
-            keys = await client.keys(f"report:{store_id}:*")
-            if keys:
-                await client.delete(*keys)
-                print(f"🗑️ [Redis] {store_id}번 지점 관련 캐시 {len(keys)}개 삭제 완료")
+        # 1. DB 삭제 (비동기 풀 커넥션)
+        deleted_count = await delete_reports_by_store(store_id)
+        print(f"🗑️ [DB] {store_id}번 지점 리포트 {deleted_count}건 삭제 완료")
+
+        # 2. 캐시 무효화 (지점 태그로 Redis 키 삭제 + Pub/Sub으로 모든 워커의 메모리 캐시 삭제)
+        await invalidate_store_reports(store_id)
 
         return {"status": "success", "message": f"{store_id}번 지점 리포트 초기화 완료"}
     except Exception as e:
@@ -61,29 +52,27 @@ async def reset_all_reports():
     """
     [Admin] 시스템 내 모든 AI 리포트 데이터 삭제 (DB + Redis + Local Memory)
     """
-    from app.core.db import SessionLocal
-    from app.report.report_schema import StoreReport
-    from app.core.cache import get_redis, clear_all_local_cache
-    
     try:
-        # 1. DB 전체 삭제
-        with SessionLocal() as session:
-            deleted_count = session.query(StoreReport).delete()
-            session.commit()
-            print(f"🗑️ [DB] 전체 리포트 {deleted_count}건 삭제 완료")
-            
-        # 2. Redis 캐시 전체 삭제
-        client = await get_redis()
-        if client:
-            keys = await client.keys("report:*")
-            if keys:
-                await client.delete(*keys)
-                print(f"🗑️ [Redis] 전체 리포트 캐시 {len(keys)}개 삭제 완료")
-                
-        # 3. 로컬 메모리 캐시 전체 삭제
-        clear_all_local_cache()
-        
+        # 1. DB 전체 삭제 (비동기 풀 커넥션)
+        deleted_count = await delete_all_reports()
+        print(f"🗑️ [DB] 전체 리포트 {deleted_count}건 삭제 완료")
+
+        # 2. 캐시 전체 무효화 (세대 번호 증가 + Pub/Sub으로 모든 워커의 메모리 캐시 삭제)
+        await invalidate_all_reports()
+
         return {"status": "success", "message": "시스템 내 모든 리포트 데이터가 초기화되었습니다."}
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete("/cache/{store_id}")
+async def invalidate_report_cache(store_id: int, date_from: Optional[date] = None, date_to: Optional[date] = None):
+    """
+    해당 지점의 리포트 캐시만 무효화 (DB는 그대로, 날짜 구간 지정 가능)
+    """
+    try:
+        deleted = await invalidate_reports(store_id=store_id, date_from=date_from, date_to=date_to)
+        return {"status": "success", "deleted": deleted}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,7 +1,7 @@
 from pydantic import BaseModel
 from datetime import date, datetime
 from typing import Dict, Any, Optional
-from sqlalchemy import Column, Integer, String, Text, Date, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, Date, ForeignKey, JSON, UniqueConstraint
 from app.core.db import base
 
 # ---------- API / JSON 용 Pydantic 스키마 ----------
@@ -48,3 +48,8 @@ class StoreReport(base):
     risk_assessment = Column(JSON, nullable=True)
 
     created_at = Column(Date, default=datetime.now)
+
+    # 한 매장의 같은 날짜 리포트는 하나만 존재 (INSERT ... ON CONFLICT 업서트 기준)
+    __table_args__ = (
+        UniqueConstraint('store_id', 'report_date', name='uix_store_report_date'),
+    )
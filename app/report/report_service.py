@@ -5,73 +5,122 @@ import traceback
 
 from datetime import date, datetime, timedelta
 from sqlalchemy import func
-from app.core.db import SessionLocal, fetch_all
+from app.core.db import fetch_all, execute_return
 from app.report.report_schema import StoreReport
 from app.clients.genai import genai_generate_text
 from app.order.order_service import select_daily_sales_by_store
 from app.review.review_service import select_reviews_by_store
-from app.core.cache import get_report_cache, set_report_cache, get_report_object_cache
-from app.report.report_graph import report_graph_app
+from app.core.cache import get_report_cache, set_report_cache, single_flight, get_cache_age, get_latency_stats, record_load, REPORT_SOFT_TTL, REPORT_HARD_TTL
+from app.report.report_graph import report_graph_app, build_report_record, save_report
+from app.store.store_watermark import watermark_token
 
 
 # ------------------------------------------------------------------
-# [Portfolio] Redis vs DB Speed Race Helper Functions (Flattened)
+# 캐시 조회 (L1 -> Redis -> DB)
 # ------------------------------------------------------------------
 
-async def _measure_redis_speed(s_id: int, check_date: date):
-    """Redis 조회 속도 측정"""
-    start = time.perf_counter()
-    data = await get_report_cache(s_id, check_date)
-    dur = time.perf_counter() - start
-    return dur, data
+async def _lookup_report(store_id: int, save_date: date, mode: str, version: str = ""):
+    """
+    캐시 -> DB 순서로 리포트 조회 (이전의 Redis/DB 동시 경쟁 조회 대체)
+    DB에서 찾으면 캐시에 다시 올려두어 다음 조회는 캐시에서 응답
+    version(매장 워터마크)이 있으면 같은 데이터 버전으로 만든 리포트만 사용
+    """
+    logs = []
 
+    start = time.perf_counter()
+    cached_data = await get_report_cache(store_id, save_date, version)
+    elapsed = time.perf_counter() - start
+    if cached_data:
+        # [Portfolio] 속도 비교: 이번 캐시 조회 시간 vs 누적 DB 조회 평균 (/admin/cache/stats 지표 기반)
+        db_avg_ms = get_latency_stats()["db"]["avg_ms"]
+        tier = "Local Memory" if cached_data.get("cache_tier") == "l1" else "Redis"
+        logs.append(f"⚡ [Cache] {tier} Hit ({elapsed * 1000:.2f}ms)")
+        if db_avg_ms and elapsed > 0:
+            logs.append(f"🏎️ [속도 비교] DB 평균 조회 {db_avg_ms:.2f}ms 대비 {db_avg_ms / (elapsed * 1000):.1f}배 빠릅니다!")
+        return cached_data, logs
 
-async def _measure_db_speed(s_id: int, check_date: date):
-    """DB 조회 속도 측정"""
     start = time.perf_counter()
-    row = await select_latest_report(s_id)
-    data = None
-    if row and str(row['report_date']) == str(check_date):
-        data = row
-    dur = time.perf_counter() - start
-    return dur, data
+    row = await select_report_by_date(store_id, save_date)
+    elapsed = time.perf_counter() - start
+    record_load("report", elapsed)
+    if not row:
+        return None, logs
 
+    risk_info = row.get("risk_assessment") or {}
+    if version and risk_info.get("data_watermark") != version:
+        logs.append("🆕 [Watermark] 저장된 리포트 이후 새 주문/리뷰가 들어와 리포트를 다시 생성합니다.")
+        return None, logs
 
-async def race_condition_check(s_id: int, t_date: str):
-    """
-    Redis와 DB의 조회 속도를 경쟁(Race)시키는 메인 로직.
-    asyncio.gather를 사용하여 두 태스크를 동시에 실행함.
-    """
-    logs = []
-    
-    if t_date:
-        check_date = datetime.strptime(t_date, "%Y-%m-%d").date()
-    else:
-        check_date = date.today()
-
-    # Async Execution (Race Start!) 🔫
-    # 헬퍼 함수들을 동시에 호출
-    (redis_time, redis_data), (db_time, db_data) = await asyncio.gather(
-        _measure_redis_speed(s_id, check_date), 
-        _measure_db_speed(s_id, check_date)
-    )
-    
-    data_found = redis_data if redis_data else db_data
-    
-    # 데이터가 어딘가에 있다면 Race Log 생성
-    if data_found:
-        winner = "Redis" if redis_time < db_time else "DB"
-        gap = db_time / redis_time if redis_time > 0 else 99.9
-        
-        logs.append(f"🏎️ [Race] {winner} Win! (Redis: {redis_time:.4f}s vs DB: {db_time:.4f}s)")
-        logs.append(f"⚡ [속도 비교] Redis가 DB보다 {gap:.1f}배 더 빠릅니다!")
-        
-        # DB 데이터만 있는 경우 포맷 맞춤 (UI 호환성)
-        if not redis_data and db_data:
-                # DB Row를 Dict 구조로 감싸기
-                data_found = {"report": db_data, "logs": [], "mode": "sequential"}
-
-    return data_found, logs
+    logs.append(f"🗄️ [DB] 저장된 리포트 조회 ({elapsed * 1000:.2f}ms) → 캐시에 다시 저장")
+    # 캐시 나이는 DB에 저장된 생성 시각 기준 (다시 올린 시각으로 하면 오래된 리포트도 fresh로 보임)
+    cached_at = _report_created_timestamp(row.get("created_at")) or time.time()
+    data = {"report": row, "logs": [], "mode": mode, "cached_at": cached_at}
+    if risk_info.get("risk_score"):
+        # Hard TTL도 생성 시각부터 계산 (이미 지났으면 잠깐만 두고 SWR 재생성 결과로 교체)
+        ttl = max(int(REPORT_HARD_TTL - (time.time() - cached_at)), 60)
+        await set_report_cache(store_id, {**data, "cached": False}, save_date, ttl=ttl, version=version, cached_at=cached_at)
+    return data, logs
+
+
+def _report_created_timestamp(created_at) -> float | None:
+    """store_reports.created_at(Date 컬럼, 날짜만 있으면 그날 0시) -> epoch 초"""
+    if isinstance(created_at, datetime):
+        return created_at.timestamp()
+    if isinstance(created_at, date):
+        return datetime.combine(created_at, datetime.min.time()).timestamp()
+    return None
+
+
+# ------------------------------------------------------------------
+# Stale-While-Revalidate (백그라운드 재생성)
+# ------------------------------------------------------------------
+
+# 백그라운드 태스크 참조 보관 (GC로 중간에 사라지지 않도록)
+_background_tasks: set = set()
+
+
+def _spawn(coro):
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+async def drain_background_tasks(timeout: float = 10.0):
+    """앱 종료 시 호출: 진행 중인 백그라운드 저장/갱신이 끝날 때까지 대기 (풀/Redis 종료 전)"""
+    if not _background_tasks:
+        return
+    print(f"⏳ [Report] 백그라운드 작업 {len(_background_tasks)}건 완료 대기")
+    _, pending = await asyncio.wait(set(_background_tasks), timeout=timeout)
+    if pending:
+        print(f"⚠️ [Report] 백그라운드 작업 {len(pending)}건이 {timeout}초 안에 끝나지 않아 중단합니다.")
+        for task in pending:
+            task.cancel()
+
+
+def _schedule_refresh(store_id: int, store_name: str, mode: str, target_date: str, save_date: date, stale_cached_at: float, version: str = ""):
+    """오래된(Stale) 리포트를 응답한 뒤, 백그라운드에서 재생성하여 캐시 교체"""
+    flight_key = f"report:{store_id}:{save_date.isoformat()}"
+
+    async def _fresh_entry():
+        # 다른 워커가 먼저 갱신을 끝냈다면 그 결과로 충분 (Stale 항목은 무시)
+        data = await get_report_cache(store_id, save_date, version)
+        if data and (data.get("cached_at") or 0) > stale_cached_at:
+            return data
+        return None
+
+    async def _refresh():
+        try:
+            await single_flight(
+                flight_key,
+                lambda: _run_report_graph(store_id, store_name, mode, target_date, save_date, []),
+                wait_for=_fresh_entry,
+            )
+            print(f"🔄 [SWR] '{store_name}' 리포트 백그라운드 갱신 완료")
+        except Exception as e:
+            print(f"❌ [SWR] 백그라운드 갱신 실패: {str(e)}")
+
+    _spawn(_refresh())
 
 
 # ------------------------------------------------------------------
@@ -80,62 +129,48 @@ async def race_condition_check(s_id: int, t_date: str):
 
 async def generate_ai_store_report(store_id: int, store_name: str, mode: str = "sequential", target_date: str = None):
     """
-    LangGraph 프로세스 실행 (Sequential Graph)
-    캐시 확인 → 없으면 생성 → 캐시 저장
+    LangGraph 프로세스 실행 (조회 병렬 Fan-out → 분석)
+    캐시 확인 → 없으면 생성(동시 요청은 하나로 병합) → 캐시 저장 → 응답 후 DB 저장
     """
     try:
         print(f"🚀 [Service] '{store_name}' 리포트 생성 시작 ({target_date if target_date else 'Today'})...")
 
-        # 1. [Race] 캐시/DB 경쟁 조회 (Flattened 구조)
-        cached_data, race_logs = await race_condition_check(store_id, target_date)
-        
+        save_date = datetime.strptime(target_date, "%Y-%m-%d").date() if target_date else date.today()
+
+        # 매장 데이터 버전 (새 주문/리뷰/매출이 들어오면 바뀜 -> 캐시 키가 달라져 자동 재생성)
+        version = watermark_token(store_id)
+
+        # 1. 캐시(L1 -> Redis) 조회, 없으면 DB에 저장된 리포트 조회
+        cached_data, lookup_logs = await _lookup_report(store_id, save_date, mode, version)
+
         if cached_data:
-            print(f"♻️ [Service] '{store_name}' 리포트 조회 성공! (Race Winner Logic)")
-            
-            # 기존 로그에 레이스 로그 병합
-            final_logs = race_logs + cached_data.get("logs", [])
+            print(f"♻️ [Service] '{store_name}' 리포트 조회 성공!")
+
+            # 기존 로그에 조회 로그 병합
+            final_logs = lookup_logs + cached_data.get("logs", [])
             cached_data["logs"] = final_logs
             cached_data["cached"] = True
+
+            # [SWR] Soft TTL 경과 시: 캐시는 즉시 응답, 재생성은 백그라운드로
+            cache_age = get_cache_age(cached_data)
+            cached_data["cache_age_sec"] = round(cache_age, 1) if cache_age is not None else None
+            if cache_age is not None and cache_age >= REPORT_SOFT_TTL:
+                cached_data["freshness"] = "stale"
+                cached_data["logs"].append(f"🔄 [SWR] 캐시가 {int(cache_age)}초 경과(Stale) → 백그라운드에서 최신 리포트로 갱신합니다.")
+                _schedule_refresh(store_id, store_name, cached_data.get("mode", mode), target_date, save_date, cached_data["cached_at"], version)
+            else:
+                cached_data["freshness"] = "fresh"
             return cached_data
 
         # 2. 리포트 생성 (데이터 없음 -> AI 실행)
-        initial_state = {
-            "store_id": store_id,
-            "store_name": store_name,
-            "target_date": target_date, # [NEW] 분석 대상 날짜
-            "execution_logs": race_logs # Race 결과(없음)도 로그에 남김
-        }
-
-        # LangGraph 실행 (미리 컴파일된 싱글톤 앱 사용)
-        final_state = await report_graph_app.ainvoke(initial_state)
-
-        # DB에서 저장된 리포트 조회
-        report = await select_latest_report(store_id)
-
-        # 실행 로그 수집
-        logs = race_logs + final_state.get("execution_logs", [])
-
-        result = {
-            "report": report,
-            "logs": logs,
-            "mode": mode,
-            "cached": False
-        }
-
-        # 3. 생성된 리포트를 캐시에 저장 (Redis + DB는 이미 위에서 됨)
-        # target_date가 있으면 그걸로, 없으면 오늘 날짜로 key 생성
-        save_date = datetime.strptime(target_date, "%Y-%m-%d").date() if target_date else date.today()
-        
-        # [Prevent Caching Bad Data] 불량 리포트(Risk Score=0)는 Redis 저장 건너뛰기
-        risk_check = report.get("risk_assessment") if report else None
-        risk_score = risk_check.get("risk_score") if risk_check else 0
-        
-        if risk_score and risk_score > 0:
-            await set_report_cache(store_id, result, save_date)
-        else:
-            print("⚠️ [Cache Skip] 불량 리포트라 Redis 캐싱을 생략합니다.")
-
-        return result
+        # [Single-Flight] 같은 (store_id, target_date)로 동시에 들어온 요청은 한 번만 생성하고 결과 공유
+        flight_key = f"report:{store_id}:{save_date.isoformat()}"
+
+        return await single_flight(
+            flight_key,
+            lambda: _run_report_graph(store_id, store_name, mode, target_date, save_date, lookup_logs),
+            wait_for=lambda: get_report_cache(store_id, save_date, version),
+        )
 
     except Exception as e:
         print(f"❌ [Service] 에러 발생: {str(e)}")
@@ -143,6 +178,61 @@ async def generate_ai_store_report(store_id: int, store_name: str, mode: str = "
         return None
 
 
+async def _run_report_graph(store_id: int, store_name: str, mode: str, target_date: str, save_date: date, lookup_logs: list):
+    """LangGraph 실행 → 캐시 저장 → 응답, DB 저장은 백그라운드 (Single-Flight 리더만 실행)"""
+    initial_state = {
+        "store_id": store_id,
+        "store_name": store_name,
+        "target_date": target_date, # [NEW] 분석 대상 날짜
+        "execution_logs": lookup_logs # 캐시/DB 조회 결과(없음)도 로그에 남김
+    }
+
+    # LangGraph 실행 (미리 컴파일된 싱글톤 앱 사용)
+    start = time.perf_counter()
+    final_state = await report_graph_app.ainvoke(initial_state)
+    graph_ms = round((time.perf_counter() - start) * 1000, 2)
+
+    # 저장될 행과 같은 모양으로 바로 응답 (저장 후 select_latest_report 재조회 생략)
+    report = build_report_record(final_state)
+    node_timings = {**final_state.get("node_timings", {}), "graph_total": graph_ms}
+
+    # 실행 로그 수집
+    logs = lookup_logs + final_state.get("execution_logs", [])
+    logs.append("⏱️ [Timing] " + " | ".join(f"{name} {ms:.0f}ms" for name, ms in node_timings.items()))
+
+    result = {
+        "report": report,
+        "logs": logs,
+        "mode": mode,
+        "cached": False,
+        "freshness": "generated",
+        "node_timings": node_timings,
+    }
+
+    # 3. 생성된 리포트를 캐시에 저장 - 반환(= Single-Flight 락 해제) 전에 끝내야
+    #    락 해제를 기다리던 다른 워커가 캐시에서 결과를 찾음 (못 찾으면 그래프를 다시 실행)
+    # target_date가 있으면 그걸로, 없으면 오늘 날짜로 key 생성 (save_date)
+
+    # [Prevent Caching Bad Data] 불량 리포트(Risk Score=0)는 Redis 저장 건너뛰기
+    risk_score = report["risk_assessment"].get("risk_score") or 0
+    if risk_score > 0:
+        # 수집 시점의 데이터 버전으로 저장 (생성 중 새 데이터가 들어왔으면 다음 요청에서 재생성)
+        await set_report_cache(store_id, result, save_date, version=final_state.get("data_watermark", ""))
+    else:
+        print("⚠️ [Cache Skip] 불량 리포트라 Redis 캐싱을 생략합니다.")
+
+    # 4. DB 저장(Upsert)만 응답 경로 밖에서
+    _spawn(_save_report_in_background(report))
+    return result
+
+
+async def _save_report_in_background(report: dict):
+    try:
+        print(await save_report(report))
+    except Exception as e:
+        print(f"❌ [Save] 백그라운드 저장 실패: {str(e)}")
+
+
 async def select_latest_report(store_id: int):
     """
     지점의 가장 최신 리포트 조회 (DB Only)
@@ -150,3 +240,45 @@ async def select_latest_report(store_id: int):
     sql = "SELECT * FROM store_reports WHERE store_id = %s ORDER BY report_date DESC, report_id DESC LIMIT 1"
     rows = await fetch_all(sql, (store_id,))
     return rows[0] if rows else None
+
+
+async def select_report_by_date(store_id: int, report_date: date):
+    """
+    지점의 특정 날짜 리포트 조회 (DB Only, (store_id, report_date) 유니크)
+    """
+    sql = "SELECT * FROM store_reports WHERE store_id = %s AND report_date = %s"
+    rows = await fetch_all(sql, (store_id, report_date))
+    return rows[0] if rows else None
+
+
+async def delete_reports_by_store(store_id: int) -> int:
+    """
+    특정 지점의 리포트 전체 삭제 (DB Only), 삭제 건수 반환 (실패 시 RuntimeError)
+    """
+    sql = """
+        WITH deleted AS (
+            DELETE FROM store_reports WHERE store_id = %s RETURNING 1
+        )
+        SELECT COUNT(*) AS deleted_count FROM deleted
+    """
+    row = await execute_return(sql, (store_id,))
+    # COUNT(*)는 항상 1행 -> None이면 DB 오류 (execute_return은 예외를 로그만 남기고 삼킴)
+    if row is None:
+        raise RuntimeError(f"{store_id}번 지점 리포트 삭제 실패 (DB 오류)")
+    return row["deleted_count"]
+
+
+async def delete_all_reports() -> int:
+    """
+    전체 리포트 삭제 (DB Only), 삭제 건수 반환 (실패 시 RuntimeError)
+    """
+    sql = """
+        WITH deleted AS (
+            DELETE FROM store_reports RETURNING 1
+        )
+        SELECT COUNT(*) AS deleted_count FROM deleted
+    """
+    row = await execute_return(sql)
+    if row is None:
+        raise RuntimeError("전체 리포트 삭제 실패 (DB 오류)")
+    return row["deleted_count"]
@@ -2,7 +2,7 @@ from pydantic import BaseModel
 from datetime import datetime
 from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, Numeric, JSON
 from pgvector.sqlalchemy import Vector
-from app.core.db import base
+from app.core.db import base, VECTOR_HNSW_M, VECTOR_HNSW_EF_CONSTRUCTION
 
 # ---------- API / JSON 용 Pydantic 스키마 ----------
 
@@ -39,5 +39,18 @@ class Review(base):
     # AI 검색(Semantic Search)을 위한 임베딩은 조회 빈도가 높으므로 본 테이블에 유지
     embedding = Column(Vector(1536), nullable=True)
 
+    # 코사인 거리(<=>) 검색용 HNSW 인덱스
+    __table_args__ = (
+        Index(
+            "ix_reviews_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": VECTOR_HNSW_M, "ef_construction": VECTOR_HNSW_EF_CONSTRUCTION},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
+        # 매장 최신 리뷰 N건 (ORDER BY created_at DESC LIMIT N)
+        Index("ix_reviews_store_created_at", "store_id", created_at.desc()),
+    )
+
 
 
@@ -1,14 +1,35 @@
+from datetime import date, timedelta
 from app.core.db import fetch_all
 
 
-async def select_reviews_by_store(store_id: int):
-    sql = """
-        SELECT r.*, m.menu_name, o.ordered_at
+async def select_reviews_by_store(store_id: int, since: date = None, until: date = None, limit: int = None):
+    """
+    매장 리뷰 (최신순)
+    Args:
+        since / until (date): 작성일 기간 (양 끝 포함), 없으면 전체
+        limit (int): 최신 N건만
+    (store_id, created_at DESC) 인덱스를 역순으로 읽다가 limit에서 멈추므로 리뷰 누적량과 무관
+    """
+    conditions, params = ["r.store_id = %s"], [store_id]
+    if since:
+        conditions.append("r.created_at >= %s")
+        params.append(since)
+    if until:
+        # 날짜 포함 -> 다음날 0시 미만 (created_at에 함수를 씌우지 않아야 인덱스 사용)
+        conditions.append("r.created_at < %s")
+        params.append(until + timedelta(days=1))
+
+    sql = f"""
+        SELECT r.review_id, r.store_id, r.order_id, r.menu_id, r.rating, r.review_text,
+               r.created_at, r.delivery_app, m.menu_name, o.ordered_at
         FROM reviews r
         JOIN menus m ON r.menu_id = m.menu_id
         LEFT JOIN orders o ON r.order_id = o.order_id
-        WHERE r.store_id = %s
+        WHERE {" AND ".join(conditions)}
         ORDER BY r.created_at DESC
     """
-    rows = await fetch_all(sql, (store_id,))
+    if limit:
+        sql += " LIMIT %s"
+        params.append(limit)
+    rows = await fetch_all(sql, tuple(params))
     return rows
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import date
-from sqlalchemy import Column, Integer, Date, Numeric, ForeignKey, UniqueConstraint, String
+from sqlalchemy import Column, Integer, Date, Numeric, ForeignKey, UniqueConstraint, String, Index
 from app.core.db import base
 
 # ---------- API / JSON 용 Pydantic 스키마 ----------
@@ -31,4 +31,10 @@ class SalesDaily(base):
     # 한 매장의 같은 날짜 데이터는 하나만 존재해야 함 (중복 방지)
     __table_args__ = (
         UniqueConstraint('store_id', 'sale_date', name='uix_store_date'),
+        # 기간 조회(리포트/매출 분석)용 커버링 인덱스: 테이블을 읽지 않고 인덱스만으로 응답
+        Index(
+            "ix_sales_daily_store_date_covering",
+            "store_id", "sale_date",
+            postgresql_include=["total_sales", "total_orders", "weather_info"],
+        ),
     )
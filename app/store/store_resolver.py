@@ -0,0 +1,182 @@
+import os
+import json
+import unicodedata
+from typing import Optional
+from app.clients.genai import genai_generate_json
+from app.store.store_service import select_stores_all
+
+# ---------------------------------------------------------
+# [Store Resolver] 질문 속 매장 키워드("강남", "부산", "SEOUL") -> store_id, LLM 없이 사전 조회
+# 1) 별칭 일치: 정규화된 매장명 / 이름 토큰 / 지역 / 도시 / 설정 별칭(STORE_ALIASES)
+# 2) 포함 일치: "서울강남역점" ⊃ "강남" 처럼 한쪽이 다른 쪽을 포함
+# 3) 글자 n-gram 유사도(Dice): 오타/띄어쓰기 차이 허용, STORE_FUZZY_THRESHOLD 이상만
+#    1, 2위 매장 점수가 STORE_FUZZY_TIE_MARGIN 이내면 애매 -> 그때만 LLM이 후보 중에서 선택
+# - 인덱스는 매장 카탈로그(select_stores_all, 캐시됨)가 바뀌면 다시 만듦
+# ---------------------------------------------------------
+
+STORE_FUZZY_THRESHOLD = float(os.getenv("STORE_FUZZY_THRESHOLD", "0.6"))
+STORE_FUZZY_TIE_MARGIN = float(os.getenv("STORE_FUZZY_TIE_MARGIN", "0.05"))
+
+# 별칭 -> 매장명 또는 지역명 (예: STORE_ALIASES='{"본점": "서울 강남점"}')
+STORE_ALIASES = json.loads(os.getenv("STORE_ALIASES", "{}"))
+
+# 영문/약칭 지역 별칭 (질문에 영어로 쓰는 경우)
+REGION_ALIASES = {
+    "seoul": "서울",
+    "busan": "부산",
+    "gangwon": "강원",
+    "incheon": "인천",
+    "daegu": "대구",
+    "daejeon": "대전",
+    "gwangju": "광주",
+    "jeju": "제주",
+}
+
+_STORE_SUFFIXES = ("지점", "매장", "점")
+
+
+def normalize_store_text(text: str) -> str:
+    """비교용 정규화: NFKC, 소문자, 공백 제거, 끝의 '점/지점/매장' 제거"""
+    text = "".join(unicodedata.normalize("NFKC", text or "").lower().split())
+    for suffix in _STORE_SUFFIXES:
+        if len(text) > len(suffix) and text.endswith(suffix):
+            return text[: -len(suffix)]
+    return text
+
+
+def _ngrams(text: str) -> set[str]:
+    """앞뒤 공백을 붙인 글자 bigram ("강남" -> {" 강", "강남", "남 "}), 짧은 한글 이름도 비교 가능"""
+    padded = f" {text} "
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+def _dice(a: set[str], b: set[str]) -> float:
+    return 2 * len(a & b) / (len(a) + len(b)) if a and b else 0.0
+
+
+class StoreAliasIndex:
+    """별칭 -> store_id 집합 + 별칭별 n-gram"""
+
+    def __init__(self, stores: list[dict], aliases: Optional[dict] = None):
+        self.names = {s["store_id"]: s["store_name"] for s in stores}
+        self.aliases: dict[str, set[int]] = {}
+
+        def add(alias: str, store_id: int):
+            key = normalize_store_text(alias)
+            if key:
+                self.aliases.setdefault(key, set()).add(store_id)
+
+        for s in stores:
+            add(s["store_name"], s["store_id"])
+            for token in s["store_name"].split():
+                add(token, s["store_id"])
+            if s.get("region"):
+                add(s["region"], s["store_id"])
+            if s.get("city"):
+                add(s["city"], s["store_id"])
+
+        # 지역/설정 별칭은 대상(매장명 또는 지역)의 store_id를 그대로 물려받음
+        for alias, target in {**REGION_ALIASES, **(aliases if aliases is not None else STORE_ALIASES)}.items():
+            for store_id in self.aliases.get(normalize_store_text(target), ()):
+                add(alias, store_id)
+
+        self.grams = {alias: _ngrams(alias) for alias in self.aliases}
+
+    def __len__(self):
+        return len(self.names)
+
+    def resolve(self, keyword: str) -> dict:
+        """
+        키워드 1개 -> 매칭 결과
+
+        Returns:
+            {"ids": [...], "method": "alias" | "contains" | "fuzzy" | "ambiguous" | "none",
+             "candidates": [(store_id, score), ...] (fuzzy/ambiguous일 때 점수 순)}
+        """
+        key = normalize_store_text(keyword)
+        if not key:
+            return {"ids": [], "method": "none", "candidates": []}
+
+        if key in self.aliases:
+            return {"ids": sorted(self.aliases[key]), "method": "alias", "candidates": []}
+
+        contained = set()
+        for alias, store_ids in self.aliases.items():
+            if len(alias) >= 2 and (key in alias or alias in key):
+                contained |= store_ids
+        if contained:
+            return {"ids": sorted(contained), "method": "contains", "candidates": []}
+
+        grams = _ngrams(key)
+        best: dict[int, float] = {}
+        for alias, store_ids in self.aliases.items():
+            score = _dice(grams, self.grams[alias])
+            for store_id in store_ids:
+                best[store_id] = max(best.get(store_id, 0.0), score)
+        ranked = sorted(
+            ((store_id, round(score, 4)) for store_id, score in best.items() if score >= STORE_FUZZY_THRESHOLD),
+            key=lambda item: -item[1],
+        )
+        if not ranked:
+            return {"ids": [], "method": "none", "candidates": []}
+
+        tied = [item for item in ranked if item[1] >= ranked[0][1] - STORE_FUZZY_TIE_MARGIN]
+        if len(tied) > 1:
+            return {"ids": [], "method": "ambiguous", "candidates": tied}
+        return {"ids": [ranked[0][0]], "method": "fuzzy", "candidates": ranked}
+
+
+_index: Optional[StoreAliasIndex] = None
+_signature: Optional[tuple] = None
+
+
+async def get_store_index() -> StoreAliasIndex:
+    """매장 카탈로그가 바뀌었으면(행 추가/수정/삭제) 인덱스 재생성"""
+    global _index, _signature
+    stores = await select_stores_all()
+    signature = tuple(sorted((s["store_id"], s["store_name"], s.get("region"), s.get("city")) for s in stores))
+    if _index is None or signature != _signature:
+        _index = StoreAliasIndex(stores)
+        _signature = signature
+        print(f"🏪 [StoreResolver] 인덱스 생성 ({len(_index)}개 매장, 별칭 {len(_index.aliases)}개)")
+    return _index
+
+
+async def _llm_tiebreak(keyword: str, candidates: list[tuple], names: dict) -> list[int]:
+    """애매한 키워드만 LLM이 후보 중에서 선택 (실패 시 후보 전체)"""
+    options = [{"store_id": store_id, "store_name": names[store_id]} for store_id, _ in candidates]
+    prompt = f"""
+    사용자가 말한 매장 키워드 "{keyword}"가 가리키는 매장을 아래 후보 중에서 하나 고르세요.
+    후보: {json.dumps(options, ensure_ascii=False)}
+    판단할 수 없으면 store_id를 0으로 반환하세요.
+    """
+    schema = {"type": "OBJECT", "properties": {"store_id": {"type": "INTEGER"}}, "required": ["store_id"]}
+    try:
+        store_id = (await genai_generate_json(prompt, schema)).get("store_id")
+        if store_id in names and any(store_id == c for c, _ in candidates):
+            return [store_id]
+    except Exception as e:
+        print(f"⚠️ [StoreResolver] LLM 판정 실패 (후보 전체 사용): {e}")
+    return [store_id for store_id, _ in candidates]
+
+
+async def resolve_stores(target_store_codes: list[str]) -> tuple[list[int], list[str]]:
+    """
+    매장 키워드 목록 -> (store_id 목록, 매장명 목록)
+    - "ALL" -> 전체 매장
+    - 매칭 실패 키워드는 무시 (전부 실패하면 빈 목록)
+    """
+    index = await get_store_index()
+    if "ALL" in target_store_codes:
+        return list(index.names), list(index.names.values())
+
+    target_ids: list[int] = []
+    for keyword in target_store_codes:
+        result = index.resolve(keyword)
+        ids = result["ids"]
+        if result["method"] == "ambiguous":
+            ids = await _llm_tiebreak(keyword, result["candidates"], index.names)
+        print(f"🏪 [StoreResolver] '{keyword}' -> {ids} ({result['method']})")
+        target_ids.extend(store_id for store_id in ids if store_id not in target_ids)
+
+    return target_ids, [index.names[store_id] for store_id in target_ids]
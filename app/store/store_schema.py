@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import date
-from sqlalchemy import Column, Integer, String, Float, Date, Numeric
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Numeric, ForeignKey
 from app.core.db import base
 
 # ---------- API / JSON 용 Pydantic 스키마 ----------
@@ -34,3 +34,17 @@ class Store(base):
     population_density_index = Column(Float, nullable=True)  # 도심 대비 인구밀도 지수
     open_date = Column(Date, nullable=True)
     franchise_type = Column(String(20), nullable=True)    # 직영 / 가맹
+
+
+class StoreWatermark(base):
+    """
+    매장별 최신 데이터 시점 (sales_daily / orders / reviews 트리거가 갱신)
+    - 분석 기준일(Anchor Date) 조회와 캐시 키 버전에 사용 (app/store/store_watermark.py)
+    """
+    __tablename__ = "store_watermarks"
+
+    store_id = Column(Integer, ForeignKey("stores.store_id", ondelete="CASCADE"), primary_key=True)
+    last_sale_date = Column(Date, nullable=True)        # MAX(sales_daily.sale_date)
+    last_ordered_at = Column(DateTime, nullable=True)   # MAX(orders.ordered_at)
+    last_review_at = Column(DateTime, nullable=True)    # MAX(reviews.created_at)
+    updated_at = Column(DateTime, nullable=False)
@@ -1,5 +1,8 @@
+from app.core.cache import cached
 from app.core.db import fetch_all
 
+
+@cached("stores", ttl=3600)
 async def select_stores_all():
     sql = "SELECT * FROM stores"
     rows = await fetch_all(sql)
@@ -0,0 +1,116 @@
+import os
+import asyncio
+import hashlib
+from datetime import date
+from typing import Optional
+from psycopg import AsyncConnection
+from app.core.db import database_url, fetch_all
+
+# ---------------------------------------------------------
+# [Store Watermark] 매장별 최신 데이터 시점 (마지막 sale_date / ordered_at / 리뷰 created_at)
+# - store_watermarks 테이블은 sales_daily / orders / reviews 트리거가 갱신 (alembic c8d4e2f1a7b9, f5c1d8a3b2e7)
+#   주문/리뷰 시각은 분 단위로 저장 (같은 분 안의 추가 주문은 토큰을 바꾸지 않음)
+# - 트리거가 NOTIFY store_watermark 로 바뀐 매장을 알리면 메모리 사본을 바로 갱신
+#   (LISTEN 연결이 끊겨도 WATERMARK_REFRESH_INTERVAL마다 전체 재조회)
+# - 용도: 분석 기준일(Anchor Date)을 MAX(sale_date) 쿼리 없이 조회
+#         캐시 키 버전(watermark_token) -> 새 주문/리뷰가 들어오면 리포트/분석 캐시가 자동으로 다른 키 사용
+# ---------------------------------------------------------
+
+WATERMARK_CHANNEL = "store_watermark"
+WATERMARK_REFRESH_INTERVAL = float(os.getenv("WATERMARK_REFRESH_INTERVAL", "30"))
+
+_watermarks: dict[int, dict] = {}
+_listener: Optional[asyncio.Task] = None
+
+
+async def refresh_store_watermarks(store_ids: Optional[list[int]] = None) -> int:
+    """테이블 -> 메모리 (store_ids를 주면 해당 매장만), 갱신한 매장 수 반환"""
+    query = "SELECT store_id, last_sale_date, last_ordered_at, last_review_at, updated_at FROM store_watermarks"
+    params = ()
+    if store_ids is not None:
+        query += " WHERE store_id = ANY(%s)"
+        params = (list(store_ids),)
+    rows = await fetch_all(query, params)
+
+    if store_ids is None:
+        _watermarks.clear()
+    for row in rows:
+        _watermarks[row["store_id"]] = row
+    return len(rows)
+
+
+def get_store_watermark(store_id: int) -> Optional[dict]:
+    """메모리의 워터마크 (없으면 None -> 호출자가 DB 조회로 대체)"""
+    return _watermarks.get(store_id)
+
+
+def get_anchor_date(store_ids: list[int]) -> Optional[date]:
+    """대상 매장들의 마지막 매출 날짜 (한 매장이라도 모르면 None)"""
+    dates = []
+    for store_id in store_ids:
+        watermark = _watermarks.get(store_id)
+        if watermark is None:
+            return None
+        if watermark["last_sale_date"] is not None:
+            dates.append(watermark["last_sale_date"])
+    return max(dates) if dates else None
+
+
+def watermark_token(store_id: int) -> str:
+    """
+    캐시 키용 짧은 버전 문자열 (모르면 빈 문자열)
+    새 데이터(INSERT)뿐 아니라 기존 행 수정(UPDATE)/삭제도 updated_at을 올리므로 토큰이 바뀜
+    """
+    watermark = _watermarks.get(store_id)
+    if watermark is None:
+        return ""
+    raw = (
+        f"{watermark['last_sale_date']}|{watermark['last_ordered_at']}|{watermark['last_review_at']}"
+        f"|{watermark.get('updated_at')}"
+    )
+    return "w" + hashlib.md5(raw.encode()).hexdigest()[:10]
+
+
+async def _apply_notification(payload: str):
+    if payload == "*":
+        await refresh_store_watermarks()
+    else:
+        await refresh_store_watermarks([int(store_id) for store_id in payload.split(",") if store_id])
+
+
+async def _listen_watermarks():
+    """LISTEN store_watermark (전용 연결), 알림이 없어도 주기적으로 전체 재조회"""
+    while True:
+        try:
+            async with await AsyncConnection.connect(database_url, autocommit=True) as conn:
+                await conn.execute(f"LISTEN {WATERMARK_CHANNEL}")
+                print("👂 [Watermark] 변경 알림 구독 시작")
+                while True:
+                    await refresh_store_watermarks()
+                    async for notify in conn.notifies(timeout=WATERMARK_REFRESH_INTERVAL):
+                        await _apply_notification(notify.payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"⚠️ [Watermark] 구독 연결 실패 ({WATERMARK_REFRESH_INTERVAL}초 후 재시도): {e}")
+            await asyncio.sleep(WATERMARK_REFRESH_INTERVAL)
+
+
+async def start_watermark_listener():
+    """앱 시작 시 호출: 워터마크 적재 + 변경 알림 구독 태스크 시작"""
+    global _listener
+    try:
+        count = await refresh_store_watermarks()
+        print(f"🕒 [Watermark] 매장 워터마크 로드 ({count}개 매장)")
+    except Exception as e:
+        print(f"⚠️ [Watermark] 로드 실패 (MAX 조회로 대체): {e}")
+    if _listener is None or _listener.done():
+        _listener = asyncio.create_task(_listen_watermarks())
+
+
+async def stop_watermark_listener():
+    global _listener
+    if _listener is not None:
+        _listener.cancel()
+        await asyncio.wait({_listener}, timeout=1.0)
+        _listener = None
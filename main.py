@@ -2,6 +2,11 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.clients import genai
 from app.core.db import close_pool, init_pool
+from app.core.cache import close_redis, start_invalidation_listener, stop_invalidation_listener
+from app.core.vector_index import load_vector_indexes, stop_vector_index_refresher
+from app.inquiry.intent_classifier import load_intent_centroids
+from app.store.store_watermark import start_watermark_listener, stop_watermark_listener
+from app.report.report_service import drain_background_tasks
 # from app.user import user_router
 from app.store import store_router
 from app.menu import menu_router
@@ -12,16 +17,30 @@ from app.report import report_router
 from app.inquiry import inquiry_router
 from app.manual import manual_router
 from app.policy import policy_router
+from app.admin import admin_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_pool()
+    start_invalidation_listener()
+    await load_vector_indexes()
+    await start_watermark_listener()
+    try:
+        await load_intent_centroids()
+    except Exception as e:
+        print(f"⚠️ [Intent] centroid 로드 실패 (첫 질문에서 재시도): {e}")
     print("🚀 App startup complete")
 
     yield
 
+    # 응답 후 백그라운드로 돌던 리포트 저장이 풀/Redis 종료 전에 끝나도록
+    await drain_background_tasks()
+    await stop_invalidation_listener()
+    await stop_vector_index_refresher()
+    await stop_watermark_listener()
     await close_pool()
+    await close_redis()
     print("🧹 App shutdown complete")
 
 app = FastAPI(lifespan=lifespan)
@@ -36,6 +55,7 @@ app.include_router(report_router.router)
 app.include_router(inquiry_router.router)
 app.include_router(manual_router.router)
 app.include_router(policy_router.router)
+app.include_router(admin_router.router)
 
 # response = genai.genai_generate_text("안녕하세요")
 # print("genai 실행", response)
@@ -0,0 +1,127 @@
+"""
+[Benchmark] 리포트 캐시 직렬화 코덱 비교
+
+실제 리포트 캐시와 같은 모양의 payload(리포트 행 + 지표 + 마크다운 근거 + 원본 매출/메뉴 + 로그)를
+코덱별로 인코딩/디코딩하여 Redis에 저장되는 바이트 수와 소요 시간을 비교합니다.
+
+- legacy      : 기존 방식 (json.dumps(default=str), 무압축)
+- json/orjson/msgpack : 버전 헤더 + 코덱 (zstd 미적용 / 적용)
+
+사용법:
+    python scripts/benchmark_cache_codec.py --days 30 --menus 40 --repeat 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+import app.core.cache as cache_module
+from app.core.cache import decode_value, encode_value
+
+
+def build_payload(days: int, menus: int) -> dict:
+    """리포트 캐시와 동일한 구조의 합성 데이터"""
+    rnd = random.Random(42)
+    today = date.today()
+
+    sales = [
+        {
+            "sale_date": today - timedelta(days=i),
+            "total_sales": Decimal(rnd.randint(500_000, 3_000_000)),
+            "order_count": rnd.randint(80, 400),
+        }
+        for i in range(days)
+    ]
+    menu_rows = [
+        {
+            "menu_id": i,
+            "menu_name": f"시그니처 메뉴 {i}",
+            "category": rnd.choice(["커피", "음료", "디저트", "베이커리"]),
+            "price": Decimal(rnd.randint(30, 80) * 100),
+            "qty": rnd.randint(10, 300),
+        }
+        for i in range(menus)
+    ]
+    evidence = "\n".join(
+        f"- {row['sale_date']} 매출 {row['total_sales']:,}원 / 주문 {row['order_count']}건 (전일 대비 {rnd.uniform(-15, 15):.1f}%)"
+        for row in sales
+    )
+
+    return {
+        "report": {
+            "report_id": 1024,
+            "store_id": 1,
+            "report_date": today,
+            "summary": "최근 매출이 주말 중심으로 회복세이며, 디저트 카테고리 비중이 증가하고 있습니다.",
+            "risk_score": 42,
+            "risk_assessment": {
+                "metrics": {
+                    "total_rev": Decimal("45210000"),
+                    "avg_daily_rev": Decimal("1507000"),
+                    "rev_growth": -3.2,
+                    "top_menus": [m["menu_name"] for m in menu_rows[:5]],
+                },
+                "risk_factors": ["평일 오후 매출 감소", "리뷰 평점 하락 추세"],
+            },
+            "action_plan": "## 실행 계획\n1. 평일 오후 세트 프로모션\n2. 리뷰 응대 강화\n" * 4,
+            "data_evidence": f"## 📊 매출 근거\n{evidence}",
+            "created_at": datetime.now(),
+        },
+        "source_data": {"sales": sales, "menus": menu_rows},
+        "logs": [f"📊 [Fetch] 단계 {i} 완료" for i in range(20)],
+        "cached": False,
+        "freshness": "generated",
+        "cached_at": time.time(),
+    }
+
+
+def _timeit(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1_000_000  # us / op
+
+
+def run_case(label: str, encode, decode, repeat: int):
+    blob = encode()
+    enc_us = _timeit(encode, repeat)
+    dec_us = _timeit(lambda: decode(blob), repeat)
+    print(f"[{label:>14}] bytes={len(blob):>7,}  encode={enc_us:8.1f}us  decode={dec_us:8.1f}us")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="리포트 캐시 직렬화 코덱 비교")
+    parser.add_argument("--days", type=int, default=30, help="payload에 포함할 일별 매출 행 수")
+    parser.add_argument("--menus", type=int, default=40, help="payload에 포함할 메뉴 행 수")
+    parser.add_argument("--repeat", type=int, default=200, help="코덱별 반복 횟수")
+    args = parser.parse_args()
+
+    payload = build_payload(args.days, args.menus)
+    print(f"📦 Cache Codec Benchmark (days={args.days}, menus={args.menus}, repeat={args.repeat})")
+
+    run_case(
+        "legacy",
+        lambda: json.dumps(payload, ensure_ascii=False, default=str).encode(),
+        json.loads,
+        args.repeat,
+    )
+
+    threshold = cache_module.CACHE_COMPRESS_THRESHOLD
+    for compress in (False, True):
+        # 압축 기준을 조절해 zstd 미적용 / 적용을 각각 측정
+        cache_module.CACHE_COMPRESS_THRESHOLD = threshold if compress else float("inf")
+        for codec in ("json", "orjson", "msgpack"):
+            label = f"{codec}{'+zstd' if compress else ''}"
+            run_case(label, lambda c=codec: encode_value(payload, codec=c), decode_value, args.repeat)
+    cache_module.CACHE_COMPRESS_THRESHOLD = threshold
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,79 @@
+"""
+[Benchmark] Gemini 호출 중 이벤트 루프 지연(Loop Lag) 측정
+
+N개의 LLM 호출이 동시에 진행되는 동안, 10ms 주기로 깨어나는 Probe 태스크가
+실제로 얼마나 늦게 깨어나는지(= 다른 요청이 기다리는 시간)를 기록합니다.
+
+- blocking : 기존 방식 재현 (async 함수 안에서 동기 client.models.generate_content 호출)
+- async    : 현재 방식 (client.aio + Semaphore)
+
+사용법:
+    python scripts/benchmark_genai_event_loop.py --calls 8
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from app.clients.genai import client, genai_generate_text
+
+PROBE_INTERVAL = 0.01  # 10ms
+PROMPT = "카페 매장 운영 팁을 한 문장으로 알려줘."
+
+
+async def _blocking_call(prompt: str):
+    """[Before] 이벤트 루프를 점유하는 동기 호출"""
+    response = client.models.generate_content(
+        model="gemini-2.0-flash",
+        contents=[{"role": "user", "parts": [{"text": prompt}]}],
+        config={"response_mime_type": "text/plain"},
+    )
+    return response.text
+
+
+async def _probe(lags: list, stop: asyncio.Event):
+    """10ms마다 깨어나서 예정 시각 대비 지연(ms)을 기록"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append((time.perf_counter() - start - PROBE_INTERVAL) * 1000)
+
+
+async def run_mode(mode: str, calls: int):
+    lags = []
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(_probe(lags, stop))
+
+    call = genai_generate_text if mode == "async" else _blocking_call
+    start = time.perf_counter()
+    await asyncio.gather(*[call(PROMPT) for _ in range(calls)])
+    total = time.perf_counter() - start
+
+    stop.set()
+    await probe_task
+
+    lags.sort()
+    p50 = statistics.median(lags) if lags else 0
+    p99 = lags[int(len(lags) * 0.99) - 1] if len(lags) >= 100 else (lags[-1] if lags else 0)
+    worst = lags[-1] if lags else 0
+    print(f"[{mode:>8}] calls={calls:<3} total={total:6.2f}s  probes={len(lags):<5} "
+          f"lag p50={p50:7.1f}ms  p99={p99:7.1f}ms  max={worst:7.1f}ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Gemini 호출 중 이벤트 루프 지연 측정")
+    parser.add_argument("--calls", type=int, default=8, help="동시에 진행할 LLM 호출 수")
+    parser.add_argument("--modes", default="blocking,async", help="측정 모드 (blocking,async)")
+    args = parser.parse_args()
+
+    print(f"⏱️ Loop Lag Benchmark (probe interval {PROBE_INTERVAL * 1000:.0f}ms)")
+    for mode in args.modes.split(","):
+        await run_mode(mode.strip(), args.calls)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,147 @@
+"""
+[Benchmark] 매출 분석 쿼리: f-string 조립 vs 고정 파라미터 SQL (prepared)
+
+무작위 매장 조합 / 기간으로 같은 분석 데이터를 조회하며
+- fstring   : 기존 방식 (매장 ID/날짜를 SQL에 직접 삽입, 기준일/매출/Top5/Worst5/메뉴 리뷰/리뷰 500건 순차 6회)
+- literal   : 통합 CTE 쿼리 1회, 단 값을 SQL에 직접 삽입 (질문마다 SQL이 달라 플랜 재사용 불가)
+- prepared  : app/inquiry/sales_query.py (통합 CTE 1회 + 파라미터 바인딩 + prepared statement)
+의 지연(p50/p95)과 서로 다른 SQL 문자열 수를 출력합니다.
+
+사용법:
+    python scripts/benchmark_sales_query.py --queries 100 --tables sales_daily,orders,reviews
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from psycopg import sql
+
+from app.core.db import close_pool, fetch_all, fetch_one, init_pool
+from app.inquiry.sales_query import build_diagnosis_query, fetch_diagnosis
+
+
+async def run_fstring(store_ids: list[int], period_days: int, tables: list[str], texts: set):
+    """기존 diagnosis_node 방식 (f-string + 순차 쿼리)"""
+    async def run(query):
+        texts.add(query)
+        return await fetch_all(query)
+
+    ids_str = ",".join(map(str, store_ids))
+    date_rows = await run(f"SELECT MAX(sale_date) as last_date FROM sales_daily WHERE store_id IN ({ids_str})")
+    end_date = date_rows[0]["last_date"]
+    if end_date is None:
+        return
+    date_range_str = f"'{end_date - timedelta(days=period_days - 1)}' AND '{end_date}'"
+
+    if "sales_daily" in tables:
+        await run(f"""
+            SELECT s.sale_date, st.store_name, SUM(s.total_sales) as total_sales, SUM(s.total_orders) as total_orders, MAX(s.weather_info) as weather_info
+            FROM sales_daily s
+            JOIN stores st ON s.store_id = st.store_id
+            WHERE DATE(s.sale_date) BETWEEN {date_range_str} AND s.store_id IN ({ids_str})
+            GROUP BY s.sale_date, st.store_name
+            ORDER BY s.sale_date ASC
+        """)
+    if "orders" in tables:
+        q_menu = f"""
+            SELECT m.menu_id, m.menu_name, m.category, SUM(o.quantity) as qty, SUM(o.total_price) as rev
+            FROM orders o
+            JOIN menus m ON o.menu_id = m.menu_id
+            WHERE DATE(o.ordered_at) BETWEEN {date_range_str} AND o.store_id IN ({ids_str})
+            GROUP BY m.menu_id, m.menu_name, m.category
+            ORDER BY qty DESC
+            LIMIT 5
+        """
+        menus = await run(q_menu) + await run(q_menu.replace("DESC", "ASC"))
+        if menus:
+            ids_str_menu = ",".join(str(m["menu_id"]) for m in menus)
+            await run(f"""
+                SELECT o.menu_id, r.rating, r.review_text, o.ordered_at
+                FROM reviews r
+                JOIN orders o ON r.order_id = o.order_id
+                WHERE o.menu_id IN ({ids_str_menu})
+                AND DATE(o.ordered_at) BETWEEN {date_range_str} AND o.store_id IN ({ids_str})
+                ORDER BY r.created_at DESC
+            """)
+    if "reviews" in tables:
+        await run(f"""
+            SELECT s.store_name, r.rating, r.review_text, o.ordered_at
+            FROM reviews r
+            JOIN orders o ON r.order_id = o.order_id
+            JOIN stores s ON o.store_id = s.store_id
+            WHERE DATE(o.ordered_at) BETWEEN {date_range_str} AND o.store_id IN ({ids_str})
+            ORDER BY o.ordered_at DESC
+            LIMIT 500
+        """)
+
+
+async def run_literal(store_ids: list[int], period_days: int, tables: list[str], texts: set):
+    """통합 CTE 쿼리, 값은 SQL에 직접 삽입 (플랜 캐시 효과만 분리해서 보기 위함)"""
+    query, params = build_diagnosis_query(store_ids, period_days, tables)
+    def to_literal(value):
+        if isinstance(value, list):
+            return sql.Literal([int(v) for v in value])
+        return sql.Literal(value if value is None else int(value))
+
+    literal = {key: to_literal(value) for key, value in params.items()}
+    text = query.as_string(None) % {key: value.as_string(None) for key, value in literal.items()}
+    texts.add(text)
+    await fetch_one(text, prepare=False)
+
+
+async def run_prepared(store_ids: list[int], period_days: int, tables: list[str], texts: set):
+    query, _ = build_diagnosis_query(store_ids, period_days, tables)
+    texts.add(query.as_string(None))
+    await fetch_diagnosis(store_ids, period_days, tables)
+
+
+def summarize(label: str, latencies: list, texts: set):
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies)
+    p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+    print(f"[{label:>9}] p50={p50:7.2f}ms  p95={p95:7.2f}ms  distinct_sql={len(texts)}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="매출 분석 쿼리 f-string vs prepared 비교")
+    parser.add_argument("--queries", type=int, default=100, help="측정할 질문(매장 조합 x 기간) 수")
+    parser.add_argument("--tables", default="sales_daily,orders,reviews", help="조회할 테이블 목록")
+    parser.add_argument("--seed", type=int, default=42, help="매장 조합/기간 난수 시드")
+    args = parser.parse_args()
+    tables = args.tables.split(",")
+
+    await init_pool()
+    try:
+        store_ids = [row["store_id"] for row in await fetch_all("SELECT store_id FROM stores ORDER BY store_id")]
+        if not store_ids:
+            print("⚠️ stores 테이블이 비어 있습니다.")
+            return
+
+        rng = random.Random(args.seed)
+        scenarios = [
+            (sorted(rng.sample(store_ids, rng.randint(1, len(store_ids)))), rng.choice([1, 7, 14, 30, 90]))
+            for _ in range(args.queries)
+        ]
+
+        print(f"🧮 Sales Query Benchmark (queries={len(scenarios)}, stores={len(store_ids)}, tables={tables})")
+        for label, runner in (("fstring", run_fstring), ("literal", run_literal), ("prepared", run_prepared)):
+            texts, latencies = set(), []
+            await runner(*scenarios[0], tables, set())  # 워밍업 (커넥션/캐시)
+            for ids, period_days in scenarios:
+                start = time.perf_counter()
+                await runner(ids, period_days, tables, texts)
+                latencies.append((time.perf_counter() - start) * 1000)
+            summarize(label, latencies, texts)
+    finally:
+        await close_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,82 @@
+"""
+[Benchmark] HNSW 인덱스 recall@k / 지연 측정
+
+테이블에 저장된 임베딩 중 일부를 질문 벡터로 사용하여
+- exact : 인덱스 없이 전체 스캔한 정답 Top-K
+- hnsw  : ef_search 값별 인덱스 검색 결과
+를 비교하고 recall@k와 지연(p50/p95)을 출력합니다.
+
+사용법:
+    python scripts/benchmark_vector_index.py --table reviews --queries 50 --k 10 --ef 20,40,80,160
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from psycopg import sql
+
+from app.core.db import VECTOR_SEARCH_TABLES, close_pool, fetch_all, init_pool, vector_search
+
+
+async def sample_query_vectors(table: str, n: int):
+    query = sql.SQL("SELECT embedding FROM {} WHERE embedding IS NOT NULL ORDER BY random() LIMIT %s").format(sql.Identifier(table))
+    rows = await fetch_all(query, (n,))
+    return [row["embedding"] for row in rows]
+
+
+async def run_search(table: str, vectors: list, k: int, **options):
+    """질문 벡터별 (결과 ID 집합, 지연 ms) 목록"""
+    id_column = VECTOR_SEARCH_TABLES[table][0]
+    results = []
+    for vector in vectors:
+        start = time.perf_counter()
+        rows = await vector_search(table, vector, k=k, columns=(id_column,), **options)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        results.append(({row[id_column] for row in rows}, elapsed_ms))
+    return results
+
+
+def summarize(label: str, results: list, truth: list = None, k: int = 10):
+    latencies = sorted(ms for _, ms in results)
+    p50 = statistics.median(latencies)
+    p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+    recall = ""
+    if truth is not None:
+        hits = [len(ids & truth_ids) / max(1, len(truth_ids)) for (ids, _), (truth_ids, _) in zip(results, truth)]
+        recall = f"recall@{k}={statistics.mean(hits):.3f}"
+    print(f"[{label:>12}] p50={p50:7.2f}ms  p95={p95:7.2f}ms  {recall}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="HNSW 인덱스 recall / 지연 측정")
+    parser.add_argument("--table", default="reviews", choices=list(VECTOR_SEARCH_TABLES), help="대상 테이블")
+    parser.add_argument("--queries", type=int, default=50, help="질문 벡터 수 (테이블에서 무작위 샘플)")
+    parser.add_argument("--k", type=int, default=10, help="Top-K")
+    parser.add_argument("--ef", default="20,40,80,160", help="측정할 ef_search 값 목록")
+    args = parser.parse_args()
+
+    await init_pool()
+    try:
+        vectors = await sample_query_vectors(args.table, args.queries)
+        if not vectors:
+            print(f"⚠️ '{args.table}' 테이블에 임베딩이 없습니다.")
+            return
+
+        print(f"🧭 Vector Index Benchmark (table={args.table}, queries={len(vectors)}, k={args.k})")
+        truth = await run_search(args.table, vectors, args.k, exact=True)
+        summarize("exact", truth)
+
+        for ef in [int(v) for v in args.ef.split(",")]:
+            results = await run_search(args.table, vectors, args.k, ef_search=ef)
+            summarize(f"hnsw ef={ef}", results, truth, args.k)
+    finally:
+        await close_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
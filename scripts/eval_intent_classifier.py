@@ -0,0 +1,114 @@
+"""
+[Eval] 로컬 질문 분류기 vs LLM 라우터 정확도 / 지연 비교
+
+라벨이 달린 질문 세트(centroid 예시 질문과 겹치지 않음)에 대해
+- local  : centroid + 키워드 분류 (확신한 질문만 결정, 나머지는 '애매')
+- llm    : 기존 Gemini 라우터 (llm_route)
+- hybrid : local이 확신하면 local, 아니면 llm (실제 router_node 동작)
+의 정확도와 지연(p50/p95)을 출력합니다. local 지연은 임베딩 캐시가 없는 첫 호출 기준입니다.
+
+사용법:
+    python scripts/eval_intent_classifier.py
+    python scripts/eval_intent_classifier.py --margin 0.03 --no-llm
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+import app.inquiry.intent_classifier as intent_module
+from app.core.cache import close_redis
+from app.inquiry.intent_classifier import classify_intent, load_intent_centroids
+from app.inquiry.nodes.router import llm_route
+
+LABELED_QUESTIONS = [
+    ("서울강남점의 최근 매출 하락 원인을 메뉴별로 분석해줘", "sales"),
+    ("최근 1주일간 가장 잘팔린 메뉴 Top 5 알려줘", "sales"),
+    ("부산점과 서울점의 매출과 리뷰를 비교해서 개선점을 제안해줘", "sales"),
+    ("이번 주 아메리카노 몇 잔 팔렸어?", "sales"),
+    ("전월 대비 매출 성장률은?", "sales"),
+    ("시간대별 주문량이 제일 많은 때는?", "sales"),
+    ("디저트 카테고리 실적 어때?", "sales"),
+    ("평일 오후 매출이 왜 줄었지?", "sales"),
+    ("리뷰에서 불만이 많은 메뉴가 뭐야?", "sales"),
+    ("에스프레소 머신 백플러싱 하는 법", "manual"),
+    ("정수 필터 교체는 어떻게 해?", "manual"),
+    ("블렌더 칼날 세척 방법 알려줘", "manual"),
+    ("쇼케이스에 성에가 꼈어", "manual"),
+    ("냉장고 적정 온도가 몇 도야?", "manual"),
+    ("배달 앱 주문 거절은 어떻게 해?", "manual"),
+    ("라스트 오더 안내 멘트 알려줘", "manual"),
+    ("소화기 사용법이 뭐야?", "manual"),
+    ("오픈 조와 마감 조가 해야 할 필수 체크리스트는?", "manual"),
+    ("고객이 환불을 요구할 때 규정과 응대 멘트 알려줘", "policy"),
+    ("근무 중 휴대폰 사용 규정이 있어?", "policy"),
+    ("신규 아르바이트생 복장 규정은?", "policy"),
+    ("매장 위생 점검 항목이 뭐야?", "policy"),
+    ("병가 쓸 때 필요한 서류는?", "policy"),
+    ("불법 소프트웨어 설치 금지 정책 알려줘", "policy"),
+    ("서울 종로구의 짜장면 맛집 추천해줘", "policy"),
+    ("내일 비 온대?", "policy"),
+    ("요즘 카페 업계 뉴스 알려줘", "policy"),
+    ("반품 처리 기준이 어떻게 돼?", "policy"),
+]
+
+
+def latency_summary(latencies: list[float]) -> str:
+    ordered = sorted(latencies)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    return f"p50={statistics.median(ordered) * 1000:7.1f}ms  p95={p95 * 1000:7.1f}ms"
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="로컬 질문 분류기 vs LLM 라우터 비교")
+    parser.add_argument("--margin", type=float, default=None, help="확신 기준 margin (기본: INTENT_CONFIDENCE_MARGIN)")
+    parser.add_argument("--no-llm", action="store_true", help="LLM 라우터 호출 생략 (로컬 결과만)")
+    args = parser.parse_args()
+
+    if args.margin is not None:
+        intent_module.INTENT_CONFIDENCE_MARGIN = args.margin
+
+    try:
+        await load_intent_centroids()
+        print(f"🧭 Intent Classifier Eval (questions={len(LABELED_QUESTIONS)}, margin={intent_module.INTENT_CONFIDENCE_MARGIN})")
+
+        local_hits, local_decided, local_latency = 0, 0, []
+        llm_hits, llm_latency = 0, []
+        hybrid_hits = 0
+        for question, label in LABELED_QUESTIONS:
+            start = time.perf_counter()
+            intent = await classify_intent(question)
+            local_latency.append(time.perf_counter() - start)
+
+            llm_category = None
+            if not args.no_llm:
+                start = time.perf_counter()
+                llm_category, _ = await llm_route(question)
+                llm_latency.append(time.perf_counter() - start)
+                llm_hits += llm_category == label
+
+            if intent["category"]:
+                local_decided += 1
+                local_hits += intent["category"] == label
+            final = intent["category"] or llm_category
+            hybrid_hits += final == label
+
+            mark = "✅" if intent["category"] == label else ("··" if intent["category"] is None else "❌")
+            print(f"  {mark} [{label:>6}] local={str(intent['category']):>6} llm={str(llm_category):>6} margin={intent['margin']:.3f}  {question}")
+
+        total = len(LABELED_QUESTIONS)
+        print()
+        print(f"[ local] coverage={local_decided / total:.0%}  precision={local_hits / max(1, local_decided):.0%}  {latency_summary(local_latency)}")
+        if not args.no_llm:
+            print(f"[   llm] accuracy={llm_hits / total:.0%}  {latency_summary(llm_latency)}")
+            print(f"[hybrid] accuracy={hybrid_hits / total:.0%}  LLM 호출 {total - local_decided}/{total}건")
+    finally:
+        await close_redis()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
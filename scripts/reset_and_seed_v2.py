@@ -9,6 +9,10 @@ from decimal import Decimal
 sys.path.append(os.getcwd())
 
 from app.core.db import execute, fetch_all, init_pool, close_pool
+from app.core.cache import invalidate_all_reports, close_redis
+from app.store.store_service import select_stores_all
+from app.menu.menu_service import select_menus_all
+from app.order.order_service import select_daily_sales_by_store
 
 # --- 설정 ---
 SURVIVOR_LOCATIONS = ["서울 강남구", "부산 부산진구", "강원도 속초시"] # 남길 지점 위치 키워드
@@ -201,7 +205,13 @@ async def main():
         
     # 3. 데이터 생성
     await generate_daily_data(survivor_ids, menu_ids)
-    
+
+    # 4. 서버 캐시 무효화 (지점/메뉴/매출/리포트 모두 새 데이터 기준으로)
+    for cached_func in (select_stores_all, select_menus_all, select_daily_sales_by_store):
+        await cached_func.invalidate_all()
+    await invalidate_all_reports()
+    await close_redis()
+
     await close_pool()
     print("🎉 모든 작업 완료! 이제 '강남본점', '부산서면점', '강원속초점'만 남았습니다.")
 
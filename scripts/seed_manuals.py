@@ -1,15 +1,16 @@
 import sys
 import os
 import asyncio
-from sqlalchemy import text
 from dotenv import load_dotenv
 from langchain_openai import OpenAIEmbeddings
 
 # Add project root to sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.core.db import engine, base, SessionLocal
+from app.core.db import engine, base, SessionLocal, init_pool, close_pool
+from app.core.chunking import sync_chunks
 from app.manual.manual_schema import Manual
+from app.manual.manual_service import select_manuals_all
 # Menu import Removed to prevent accidental modification
 
 load_dotenv()
@@ -23,17 +24,7 @@ async def get_embedding(text: str):
         return None
 
 def init_db():
-    print("🔄 Initializing Manuals Table (Only)...")
-    try:
-        with engine.connect() as conn:
-            # Only Drop Manuals
-            conn.execute(text("DROP TABLE IF EXISTS manuals CASCADE"))
-            conn.commit()
-            print("   - Old manuals table dropped. (Menus table is SAFE)")
-    except Exception as e:
-        print(f"   - Warning during drop: {e}")
-
-    # Create new tables (SQLAlchemy checks existence so it's safe)
+    # 기존: DROP 후 재생성 + 전체 재임베딩 -> 이제 테이블은 유지하고 seed_data에서 변경분만 반영
     base.metadata.create_all(bind=engine)
     print("✅ Manuals table ready.")
 
@@ -81,24 +72,41 @@ async def seed_data():
             {"cat": "CS 응대", "title": "라스트 오더(Last Order) 안내", "content": "마감 30분 전 주문 마감. 매장 이용 고객에게는 마감 10분 전까지 정리 부탁 정중히 멘트. 포장은 마감 직전까지 가능."}
         ]
 
-        manuals_db = []
-        print("🧠 Generating Manual Embeddings...")
+        # 제목 기준 upsert: 바뀐 문서만 갱신/임베딩, 목록에서 빠진 문서는 삭제 (조각은 CASCADE)
+        existing = {m.title: m for m in session.query(Manual).all()}
+        inserted, updated = 0, 0
+        print("🧠 Generating Manual Embeddings (changed only)...")
         for item in manuals_list:
-            m = Manual(
-                category=item["cat"],
-                title=item["title"],
-                content=item["content"]
-            )
+            m = existing.pop(item["title"], None)
+            if m is not None and m.category == item["cat"] and m.content == item["content"] and m.embedding is not None:
+                continue
+            if m is None:
+                m = Manual(title=item["title"])
+                session.add(m)
+                inserted += 1
+            else:
+                updated += 1
+            m.category = item["cat"]
+            m.content = item["content"]
             # 임베딩 생성 (비동기)
             text_to_embed = f"매뉴얼: {m.title}\n{m.content}"
-            emb = await get_embedding(text_to_embed)
-            m.embedding = emb
-            manuals_db.append(m)
+            m.embedding = await get_embedding(text_to_embed)
+
+        for m in existing.values():
+            session.delete(m)
 
-        session.add_all(manuals_db)
-        
         session.commit()
-        print(f"✅ Inserted {len(manuals_db)} Manuals")
+        print(f"✅ Manuals: {inserted} inserted / {updated} updated / {len(existing)} deleted")
+
+        # 검색용 조각 동기화 (변경된 조각만 배치 임베딩)
+        await init_pool()
+        try:
+            await sync_chunks("manuals")
+        finally:
+            await close_pool()
+
+        # 서버에 캐시된 매뉴얼 목록 무효화 (모든 워커)
+        await select_manuals_all.invalidate_all()
         print("🎉 Manual Seeding Completed Successfully!")
         
     except Exception as e:
@@ -10,6 +10,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.core.db import engine, base, SessionLocal
 from app.menu.menu_schema import Menu
+from app.menu.menu_service import select_menus_all
 
 load_dotenv()
 embeddings_model = OpenAIEmbeddings(model="text-embedding-3-small")
@@ -129,6 +130,9 @@ async def seed_data():
         session.commit()
         
         print(f"✅ Inserted {len(menus_data)} Menus")
+
+        # 서버에 캐시된 메뉴 목록 무효화 (모든 워커)
+        await select_menus_all.invalidate_all()
         print("🎉 Menu Seeding Completed Successfully!")
         
     except Exception as e:
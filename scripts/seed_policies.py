@@ -1,15 +1,16 @@
 import sys
 import os
 import asyncio
-from sqlalchemy import text
 from dotenv import load_dotenv
 from langchain_openai import OpenAIEmbeddings
 
 # Add project root to sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.core.db import engine, base, SessionLocal
+from app.core.db import engine, base, SessionLocal, init_pool, close_pool
+from app.core.chunking import sync_chunks
 from app.policy.policy_schema import Policy
+from app.policy.policy_service import select_policies_all
 
 load_dotenv()
 embeddings_model = OpenAIEmbeddings(model="text-embedding-3-small")
@@ -22,19 +23,9 @@ async def get_embedding(text: str):
         return None
 
 def init_db():
-    print("🔄 Initializing Policy Table...")
-    try:
-        with engine.connect() as conn:
-            # Policy 테이블만 초기화 (CASCADE 조심할 필요 없음, 독립적임)
-            conn.execute(text("DROP TABLE IF EXISTS policies CASCADE"))
-            conn.commit()
-            print("   - Old policies table dropped.")
-    except Exception as e:
-        print(f"   - Warning during drop: {e}")
-
-    # Create new table (다른 테이블도 같이 create되지만 이미 있으면 패스됨)
+    # 기존: DROP 후 재생성 + 전체 재임베딩 -> 이제 테이블은 유지하고 seed_data에서 변경분만 반영
     base.metadata.create_all(bind=engine)
-    print("✅ Policy table created.")
+    print("✅ Policy table ready.")
 
 async def seed_data():
     session = SessionLocal()
@@ -79,26 +70,42 @@ async def seed_data():
             {"cat": "윤리/보안", "title": "불법 소프트웨어 설치 금지", "content": "포스기 및 매장 PC에 게임, 불법 다운로드 사이트 접속, 개인 USB 연결 금지. 랜섬웨어 감염 예방 철저."}
         ]
 
-        policies_db = []
-        print("🧠 Generating Policy Embeddings...")
+        # 제목 기준 upsert: 바뀐 정책만 갱신/임베딩, 목록에서 빠진 정책은 삭제 (조각은 CASCADE)
+        existing = {p.title: p for p in session.query(Policy).all()}
+        inserted, updated = 0, 0
+        print("🧠 Generating Policy Embeddings (changed only)...")
         for item in policy_items:
-            # Pydantic이 아니라 바로 ORM 객체 매핑
-            p = Policy(
-                category=item["cat"],
-                title=item["title"],
-                content=item["content"]
-            )
+            p = existing.pop(item["title"], None)
+            if p is not None and p.category == item["cat"] and p.content == item["content"] and p.embedding is not None:
+                continue
+            if p is None:
+                # Pydantic이 아니라 바로 ORM 객체 매핑
+                p = Policy(title=item["title"])
+                session.add(p)
+                inserted += 1
+            else:
+                updated += 1
+            p.category = item["cat"]
+            p.content = item["content"]
             # 임베딩
             text_to_embed = f"정책: {p.title}\n{p.content}"
-            emb = await get_embedding(text_to_embed)
-            p.embedding = emb
-            
-            policies_db.append(p)
+            p.embedding = await get_embedding(text_to_embed)
+
+        for p in existing.values():
+            session.delete(p)
 
-        session.add_all(policies_db)
         session.commit()
-        
-        print(f"✅ Inserted {len(policies_db)} Policies with Embeddings.")
+        print(f"✅ Policies: {inserted} inserted / {updated} updated / {len(existing)} deleted")
+
+        # 검색용 조각 동기화 (변경된 조각만 배치 임베딩)
+        await init_pool()
+        try:
+            await sync_chunks("policies")
+        finally:
+            await close_pool()
+
+        # 서버에 캐시된 정책 목록 무효화 (모든 워커)
+        await select_policies_all.invalidate_all()
         print("🎉 Policy Seeding Completed!")
         
     except Exception as e:
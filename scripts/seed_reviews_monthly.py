@@ -9,7 +9,7 @@ from typing import List, Dict
 # 프로젝트 루트
 sys.path.append(os.getcwd())
 
-from app.core.db import execute, fetch_all, init_pool, close_pool
+from app.core.db import execute, fetch_all, init_pool, close_pool, to_vector
 from app.clients.genai import genai_generate_text
 from dotenv import load_dotenv
 from langchain_openai import OpenAIEmbeddings
@@ -114,7 +114,7 @@ async def process_batch(batch_items, store_id):
         
         await execute("""
             INSERT INTO reviews (store_id, menu_id, order_id, rating, review_text, created_at, embedding)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            VALUES (%s, %s, %s, %s, %s, %s, %b)
         """, (
             store_id,
             item['menu_id'],
@@ -122,7 +122,7 @@ async def process_batch(batch_items, store_id):
             item['rating'],
             review_txt,
             created_at,
-            str(emb) if emb else None
+            to_vector(emb) if emb else None
         ))
     
     # print(f"  ✅ {len(batch_items)}개 리뷰 저장 완료 (Store {store_id})")
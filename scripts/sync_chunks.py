@@ -0,0 +1,39 @@
+"""
+[Ingestion] 매뉴얼/정책 본문 -> 검색용 조각 동기화
+
+원본 테이블(manuals / policies)을 문단 단위 조각으로 나누고,
+content_hash가 바뀐 조각만 배치로 임베딩하여 manual_chunks / policy_chunks에 반영합니다.
+(관리자 화면이나 SQL로 문서를 직접 수정한 뒤 실행)
+
+사용법:
+    python scripts/sync_chunks.py                      # 매뉴얼 + 정책 전체
+    python scripts/sync_chunks.py --source manuals --doc-id 3 --doc-id 7
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(os.path.dirname(__file__))))
+
+from app.core.chunking import CHUNK_SOURCES, sync_chunks
+from app.core.db import close_pool, init_pool
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="매뉴얼/정책 검색 조각 동기화 (변경분만 임베딩)")
+    parser.add_argument("--source", choices=[*CHUNK_SOURCES, "all"], default="all", help="원본 테이블")
+    parser.add_argument("--doc-id", type=int, action="append", help="특정 문서만 동기화 (여러 번 지정 가능)")
+    args = parser.parse_args()
+
+    sources = list(CHUNK_SOURCES) if args.source == "all" else [args.source]
+    await init_pool()
+    try:
+        for source in sources:
+            await sync_chunks(source, doc_ids=args.doc_id)
+    finally:
+        await close_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,84 @@
+"""
+app/inquiry/inquiry_service.py 시맨틱 답변 캐시 단위 테스트 (DB / 임베딩 API 없이 실행 가능)
+"""
+import asyncio
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test")  # 클라이언트 생성용 (API는 호출하지 않음)
+
+import app.inquiry.inquiry_service as inquiry_service
+
+
+def make_row(distance, corpus_version="v1", category="manual"):
+    return {
+        "inquiry_id": 7,
+        "category": category,
+        "question": "커피머신 청소 어떻게 해?",
+        "answer": '{"answer": "백플러싱"}',
+        "created_at": "2026-10-17 09:00:00",
+        "corpus_version": corpus_version,
+        "distance": distance,
+    }
+
+
+def run_lookup(monkeypatch, row, current_version="v1"):
+    calls = []
+
+    async def fake_vector_search(table, vector, **kwargs):
+        calls.append((table, kwargs))
+        return [row] if row else []
+
+    async def fake_version(category):
+        return current_version
+
+    monkeypatch.setattr(inquiry_service, "vector_search", fake_vector_search)
+    monkeypatch.setattr(inquiry_service, "get_answer_corpus_version", fake_version)
+    return asyncio.run(inquiry_service.find_cached_answer(1, [0.1, 0.2, 0.3])), calls
+
+
+def test_hit_within_distance_and_same_corpus_version(monkeypatch):
+    hit, calls = run_lookup(monkeypatch, make_row(0.03))
+
+    assert hit["answer"] == '{"answer": "백플러싱"}'
+    assert "corpus_version" not in hit
+    table, kwargs = calls[0]
+    assert table == "store_inquiries"
+    assert kwargs["filters"] == {"store_id": 1, "category": ["manual", "policy"]}  # 같은 매장 + 캐시 가능한 카테고리만
+    assert kwargs["not_null"] == ("corpus_version",)
+
+
+def test_miss_when_too_far_or_corpus_changed(monkeypatch):
+    assert run_lookup(monkeypatch, make_row(0.3))[0] is None
+    assert run_lookup(monkeypatch, make_row(0.03, corpus_version="v1"), current_version="v2")[0] is None
+    assert run_lookup(monkeypatch, None)[0] is None
+
+
+def test_other_stores_do_not_crowd_out_same_store_match(monkeypatch):
+    """HNSW처럼 ef_search개 후보를 먼저 뽑고 필터를 나중에 적용해도 같은 매장 질문을 찾는지"""
+    # 다른 매장의 더 가까운 질문 300개 + 1번 매장의 같은 질문 1개
+    rows = [
+        {**make_row(0.01 + i * 0.0001), "inquiry_id": 1000 + i, "store_id": 2 + i % 50}
+        for i in range(300)
+    ] + [{**make_row(0.05), "store_id": 1}]
+    seen = {}
+
+    async def hnsw_like_search(table, vector, k=5, filters=None, columns=None, ef_search=None, exact=False, not_null=()):
+        seen["ef_search"] = ef_search
+        candidates = sorted(rows, key=lambda r: r["distance"])[: max(ef_search or 40, k)]
+        matched = [
+            r for r in candidates
+            if r["store_id"] == filters["store_id"] and r["category"] in filters["category"]
+            and all(r[col] is not None for col in not_null)
+        ]
+        return [{col: r[col] for col in (*columns, "distance")} for r in matched[:k]]
+
+    async def fake_version(category):
+        return "v1"
+
+    monkeypatch.setattr(inquiry_service, "vector_search", hnsw_like_search)
+    monkeypatch.setattr(inquiry_service, "get_answer_corpus_version", fake_version)
+
+    hit = asyncio.run(inquiry_service.find_cached_answer(1, [0.1, 0.2, 0.3]))
+
+    assert seen["ef_search"] == inquiry_service.ANSWER_CACHE_EF_SEARCH > 300
+    assert hit is not None and hit["inquiry_id"] == 7
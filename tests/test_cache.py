@@ -0,0 +1,280 @@
+"""
+app/core/cache.py 단위 테스트 (Redis / DB 없이 실행 가능)
+"""
+import asyncio
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+import app.core.cache as cache_module
+from app.core.cache import LocalTTLCache, RedisConnectionManager, decode_value, encode_value, single_flight
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_cache(max_entries=10, max_bytes=10_000):
+    clock = FakeClock()
+    return LocalTTLCache(max_entries, max_bytes, clock=clock), clock
+
+
+def test_ttl_is_honoured_on_read():
+    cache, clock = make_cache()
+    cache.set("report:1:2025-12-21", {"v": 1}, ttl=60)
+
+    clock.now += 59
+    assert cache.get("report:1:2025-12-21") == {"v": 1}
+
+    clock.now += 2
+    assert cache.get("report:1:2025-12-21") is None
+    assert cache.stats()["expirations"] == 1
+    assert len(cache) == 0
+
+
+def test_lru_eviction_by_entry_count():
+    cache, _ = make_cache(max_entries=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    cache.get("a")  # a가 최근 사용 -> b가 방출 대상
+    cache.set("c", 3, ttl=60)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_byte_budget_evicts_and_skips_oversized():
+    cache, _ = make_cache(max_bytes=100)
+    cache.set("a", "x", ttl=60, size=60)
+    cache.set("b", "y", ttl=60, size=60)  # 합계 120 > 100 -> a 방출
+
+    assert "a" not in cache
+    assert "b" in cache
+
+    cache.set("huge", "z", ttl=60, size=101)  # 단일 항목이 예산 초과 -> 저장 안 함
+    assert "huge" not in cache
+    assert cache.stats()["bytes"] == 60
+
+
+def test_copy_on_read_protects_cached_value():
+    cache, _ = make_cache()
+    original = {"report": {"summary": "ok"}, "logs": []}
+    cache.set("k", original, ttl=60)
+
+    original["logs"].append("caller mutation after set")
+    first = cache.get("k")
+    first["cached"] = True
+    first["logs"].append("caller mutation after get")
+
+    assert cache.get("k") == {"report": {"summary": "ok"}, "logs": []}
+
+
+def test_hit_miss_counters_and_prefix_delete():
+    cache, _ = make_cache()
+    cache.set("report:1:2025-12-20", 1, ttl=60)
+    cache.set("report:1:2025-12-21", 2, ttl=60)
+    cache.set("report:2:2025-12-21", 3, ttl=60)
+
+    cache.get("report:1:2025-12-20")
+    cache.get("missing")
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert cache.delete_prefix("report:1:") == 2
+    assert len(cache) == 1
+
+
+def test_single_flight_coalesces_concurrent_callers(monkeypatch):
+    async def no_redis():
+        return None
+
+    monkeypatch.setattr(cache_module, "get_redis", no_redis)  # Redis 없이 프로세스 내부 병합만
+    calls = []
+
+    async def producer():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"report": {"summary": "ok"}, "logs": []}
+
+    async def run():
+        return await asyncio.gather(*[single_flight("report:1:2025-12-21", producer) for _ in range(5)])
+
+    results = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert all(r == {"report": {"summary": "ok"}, "logs": []} for r in results)
+    results[0]["logs"].append("mutated")
+    assert results[1]["logs"] == []  # 호출자끼리 객체 공유 안 함
+    assert cache_module._inflight == {}
+
+
+class FakeRedis:
+    def __init__(self):
+        self.healthy = True
+        self.pings = 0
+
+    async def ping(self):
+        self.pings += 1
+        if not self.healthy:
+            raise ConnectionError("redis down")
+        return True
+
+
+def test_circuit_breaker_opens_backs_off_and_recovers():
+    clock = FakeClock()
+    fake = FakeRedis()
+    manager = RedisConnectionManager(lambda: fake, failure_threshold=2, base_backoff=1, max_backoff=4, clock=clock)
+
+    async def scenario():
+        # 최초 연결: HALF_OPEN -> PING 성공 -> CLOSED
+        assert await manager.get_client() is fake
+        assert manager.state == "closed"
+
+        # 연속 실패 임계치 도달 -> OPEN (1초 백오프)
+        manager.record_failure(TimeoutError())
+        manager.record_failure(TimeoutError())
+        assert manager.state == "open"
+        assert await manager.get_client() is None
+
+        # 백오프 경과 -> HALF_OPEN 재시도, 여전히 장애면 백오프 2배로 다시 OPEN
+        fake.healthy = False
+        clock.now += 1.1
+        assert await manager.get_client() is None
+        assert manager.state == "open"
+        assert manager.stats()["retry_in_sec"] == 2.0
+
+        # 복구 후 백오프 경과 -> PING 성공 -> CLOSED
+        fake.healthy = True
+        clock.now += 2.1
+        assert await manager.get_client() is fake
+        assert manager.state == "closed"
+        assert manager.stats()["total_trips"] == 2
+
+    asyncio.run(scenario())
+
+
+def test_codec_round_trip_preserves_types_and_compresses_large_values():
+    data = {
+        "report": {"report_date": date(2025, 12, 21), "created_at": datetime(2025, 12, 21, 9, 30)},
+        "metrics": {"total_rev": Decimal("1234500.00")},
+        "logs": ["📊 [Fetch] 데이터 수집 시작"] * 200,
+    }
+
+    blob = encode_value(data, codec="msgpack")
+
+    assert blob[:3] == b"RC\x01"
+    assert blob[3] & 0x10  # 기준 크기 이상 -> zstd 압축 플래그
+    assert decode_value(blob) == data
+
+
+def test_codec_decodes_legacy_json_and_other_codecs():
+    legacy = json.dumps({"report": {"summary": "ok"}, "cached": False}).encode()
+    assert decode_value(legacy) == {"report": {"summary": "ok"}, "cached": False}
+
+    small = {"summary": "ok"}
+    for codec in ("orjson", "json"):
+        blob = encode_value(small, codec=codec)
+        assert not blob[3] & 0x10  # 작은 값은 압축하지 않음
+        assert decode_value(blob) == small
+
+
+def test_invalidation_message_clears_matching_local_entries(monkeypatch):
+    cache, _ = make_cache()
+    monkeypatch.setattr(cache_module, "_local_cache", cache)
+    monkeypatch.setattr(cache_module, "_generation", 0)
+    for store_id in (1, 2):
+        for day in (20, 21, 22):
+            cache.set(f"report:g0:{store_id}:2025-12-{day}", {"v": day}, ttl=60)
+
+    # 1번 지점의 21일 이후만 삭제
+    assert cache_module._apply_invalidation({"store_id": 1, "date_from": "2025-12-21", "date_to": None}) == 2
+    assert "report:g0:1:2025-12-20" in cache
+    assert "report:g0:2:2025-12-22" in cache
+
+    # 전체 무효화: 세대 번호 갱신 + 리포트 항목 전부 삭제
+    cache_module._apply_invalidation({"generation": 3})
+    assert cache_module._generation == 3
+    assert len(cache) == 0
+
+
+def test_cached_decorator_uses_l1_and_invalidates(monkeypatch):
+    async def no_redis():
+        return None
+
+    cache, _ = make_cache()
+    monkeypatch.setattr(cache_module, "get_redis", no_redis)
+    monkeypatch.setattr(cache_module, "_local_cache", cache)
+    calls = []
+
+    @cache_module.cached("test_sales", ttl=60)
+    async def select_sales(store_id: int, days: int = 7):
+        calls.append(store_id)
+        await asyncio.sleep(0.01)
+        return [{"store_id": store_id, "days": days}]
+
+    async def scenario():
+        # 동시 Miss는 한 번만 조회, 이후는 L1 Hit
+        await asyncio.gather(*[select_sales(1) for _ in range(3)])
+        assert await select_sales(1) == [{"store_id": 1, "days": 7}]
+        assert await select_sales(2, days=30) == [{"store_id": 2, "days": 30}]
+        assert calls == [1, 2]
+
+        await select_sales.invalidate(1)
+        await select_sales(1)
+        assert calls == [1, 2, 1]
+
+        await select_sales.invalidate_all()
+        assert len(cache) == 0
+
+    asyncio.run(scenario())
+    stats = cache_module.get_namespace_stats()["test_sales"]
+    assert stats["l1_hits"] == 1
+    assert stats["loads"] == 3
+
+
+def test_embedding_traffic_does_not_evict_report_entries(monkeypatch):
+    async def no_redis():
+        return None
+
+    shared, clock = make_cache(max_entries=3)
+    embedding_l1 = LocalTTLCache(2, 1_000_000, clock=clock)
+    monkeypatch.setattr(cache_module, "get_redis", no_redis)
+    monkeypatch.setattr(cache_module, "_local_cache", shared)
+    monkeypatch.setattr(cache_module, "_namespace_local_caches", {"embedding": embedding_l1})
+
+    shared.set("report:g0:1:2025-12-21", {"summary": "ok"}, 60)
+    shared.set("cache:stores:all", [{"store_id": 1}], 60)
+
+    @cache_module.cached("embedding", ttl=60)
+    async def embed(text: str):
+        return [0.1] * 8
+
+    async def scenario():
+        for i in range(10):  # 공용 L1 용량보다 많은 서로 다른 질문
+            await embed(f"질문 {i}")
+
+    asyncio.run(scenario())
+
+    assert shared.get("report:g0:1:2025-12-21") == {"summary": "ok"}
+    assert shared.get("cache:stores:all") == [{"store_id": 1}]
+    assert len(embedding_l1) == 2 and embedding_l1.evictions == 8
+    assert cache_module.get_local_cache_stats()["dedicated"]["embedding"]["entries"] == 2
+
+
+def test_latency_histogram_buckets_and_percentiles():
+    hist = cache_module.LatencyHistogram(buckets=(1, 10, 100))
+    for ms in (0.5, 0.8, 5, 50, 500):
+        hist.observe(ms / 1000)
+
+    stats = hist.stats()
+    assert stats["count"] == 5
+    assert stats["buckets"] == {"<=1ms": 2, "<=10ms": 1, "<=100ms": 1, ">100ms": 1}
+    assert stats["p50_ms"] == 10.0
+    assert stats["p99_ms"] == 500.0  # 최대 버킷 초과 -> 실제 최대값
@@ -0,0 +1,40 @@
+"""
+app/core/chunking.py 단위 테스트 (DB / 임베딩 API 없이 실행 가능)
+"""
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test")  # 클라이언트 생성용 (API는 호출하지 않음)
+
+from app.core.chunking import build_chunks, split_passages
+
+STEPS = (
+    "주기: 매일 마감 시.\n"
+    "방법: 1. 포터필터에 블라인드 바스켓 장착. 2. 전용 세정제 3g 투입. "
+    "3. 그룹헤드에 장착 후 추출 버튼 10초 가동. 4. 물로만 5회 반복하여 헹굼."
+)
+
+
+def test_split_passages_keeps_sentences_and_numbered_steps_together():
+    assert split_passages(STEPS, max_chars=400) == [STEPS]
+
+    passages = split_passages(STEPS, max_chars=60)
+    assert all(len(p) <= 60 for p in passages)
+    assert passages[0].startswith("주기: 매일 마감 시.\n방법: 1. 포터필터")  # "1." 뒤에서 자르지 않음
+    assert " ".join(p.replace("\n", " ") for p in passages) == STEPS.replace("\n", " ")
+
+
+def test_split_passages_hard_splits_long_sentence():
+    assert split_passages("가" * 130, max_chars=50) == ["가" * 50, "가" * 50, "가" * 30]
+
+
+def test_build_chunks_hash_changes_only_for_edited_passage():
+    doc = {"manual_id": 1, "category": "기기 관리", "title": "에스프레소 머신 청소", "content": STEPS}
+    before = build_chunks("manuals", [doc], max_chars=60)
+
+    edited = dict(doc, content=STEPS.replace("5회 반복", "3회 반복"))
+    after = build_chunks("manuals", [edited], max_chars=60)
+
+    assert [c["chunk_no"] for c in after] == list(range(len(before)))
+    changed = [a["chunk_no"] for a, b in zip(after, before) if a["content_hash"] != b["content_hash"]]
+    assert changed == [len(after) - 1]  # 마지막 조각만 재임베딩 대상
+    assert after[0]["embed_input"].startswith("매뉴얼: 에스프레소 머신 청소\n")
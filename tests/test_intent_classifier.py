@@ -0,0 +1,38 @@
+"""
+app/inquiry/intent_classifier.py 단위 테스트 (임베딩 API 없이 실행 가능)
+"""
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test")  # 클라이언트 생성용 (API는 호출하지 않음)
+
+import numpy as np
+
+from app.inquiry.intent_classifier import build_centroids, score_intent
+
+CENTROIDS = build_centroids({
+    "sales": [[1.0, 0.0, 0.0], [0.9, 0.1, 0.0]],
+    "manual": [[0.0, 1.0, 0.0], [0.0, 2.0, 0.0]],  # 길이가 달라도 정규화 후 평균
+    "policy": [[0.0, 0.0, 1.0]],
+})
+
+
+def test_centroids_are_unit_vectors():
+    for centroid in CENTROIDS.values():
+        assert abs(np.linalg.norm(centroid) - 1.0) < 1e-6
+
+
+def test_confident_question_is_decided_locally():
+    result = score_intent("지난주 매출 어때?", [0.95, 0.05, 0.0], CENTROIDS)
+
+    assert result["category"] == "sales"
+    assert result["margin"] > 0.5
+
+
+def test_ambiguous_question_falls_through_and_lexicon_breaks_ties():
+    vector = [0.0, 0.7, 0.7]  # manual / policy 중간
+    assert score_intent("이거 어떻게 돼?", vector, CENTROIDS)["category"] is None
+
+    # 같은 벡터라도 키워드("환불", "규정")가 있으면 policy로 확신
+    result = score_intent("환불 규정 어떻게 돼?", vector, CENTROIDS)
+    assert result["category"] == "policy"
+    assert result["scores"]["policy"] > result["scores"]["manual"]
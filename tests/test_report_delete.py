@@ -0,0 +1,33 @@
+"""리포트 삭제 API: DB 오류를 '0건 삭제 성공'으로 응답하지 않는지 (DB 없이 실행 가능)"""
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test")  # 클라이언트 생성용 (API는 호출하지 않음)
+os.environ.setdefault("GEMINI_API_KEY", "test")
+
+import app.core.db  # noqa: F401  (순환 import 방지용으로 먼저 로드)
+import app.report.report_router as router_module
+import app.report.report_service as service_module
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+def test_delete_failure_returns_error_instead_of_zero(monkeypatch):
+    invalidated = []
+
+    async def failing_execute_return(sql, params=()):
+        return None  # execute_return은 DB 예외를 삼키고 None 반환
+
+    async def fake_invalidate(*args, **kwargs):
+        invalidated.append(args)
+
+    monkeypatch.setattr(service_module, "execute_return", failing_execute_return)
+    monkeypatch.setattr(router_module, "invalidate_store_reports", fake_invalidate)
+    monkeypatch.setattr(router_module, "invalidate_all_reports", fake_invalidate)
+
+    app = FastAPI()
+    app.include_router(router_module.router)
+    client = TestClient(app)
+
+    assert client.delete("/report/reset/1").status_code == 500
+    assert client.delete("/report/reset-all").status_code == 500
+    assert invalidated == []  # DB 삭제 실패 시 캐시도 그대로
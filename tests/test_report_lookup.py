@@ -0,0 +1,57 @@
+"""
+리포트 조회: DB에서 다시 올린 리포트의 신선도(SWR)가 생성 시각 기준인지 (Redis / DB 없이 실행 가능)
+"""
+import asyncio
+import os
+import time
+from datetime import date, datetime, timedelta
+
+os.environ.setdefault("OPENAI_API_KEY", "test")  # 클라이언트 생성용 (API는 호출하지 않음)
+os.environ.setdefault("GEMINI_API_KEY", "test")
+
+import app.core.db  # noqa: F401  (순환 import 방지용으로 먼저 로드)
+import app.report.report_service as service_module
+
+
+def run_db_fallback(monkeypatch, created_at):
+    written, refreshes = [], []
+
+    async def cache_miss(store_id, save_date, version=""):
+        return None
+
+    async def fake_select_report_by_date(store_id, report_date):
+        return {"report_id": 3, "store_id": store_id, "created_at": created_at, "risk_assessment": {"risk_score": 40}}
+
+    async def fake_set_report_cache(store_id, data, target_date, ttl=0, version="", cached_at=None):
+        written.append({"ttl": ttl, "cached_at": cached_at})
+
+    monkeypatch.setattr(service_module, "get_report_cache", cache_miss)
+    monkeypatch.setattr(service_module, "select_report_by_date", fake_select_report_by_date)
+    monkeypatch.setattr(service_module, "set_report_cache", fake_set_report_cache)
+    monkeypatch.setattr(service_module, "watermark_token", lambda store_id: "")
+    monkeypatch.setattr(service_module, "_schedule_refresh", lambda *args: refreshes.append(args))
+
+    result = asyncio.run(service_module.generate_ai_store_report(1, "서울 강남점", target_date="2025-01-14"))
+    return result, written, refreshes
+
+
+def test_old_db_report_is_served_stale_and_revalidated(monkeypatch):
+    result, written, refreshes = run_db_fallback(monkeypatch, date.today() - timedelta(days=3))
+
+    assert result["freshness"] == "stale"
+    assert result["cache_age_sec"] >= 3 * 86400 - 1
+    assert len(refreshes) == 1
+    # 다시 올린 캐시도 원래 생성 시각 유지 + Hard TTL이 이미 지났으므로 짧게
+    assert written[0]["cached_at"] == result["cached_at"]
+    assert written[0]["ttl"] == 60
+
+
+def test_recent_db_report_stays_fresh(monkeypatch):
+    created_at = datetime.now() - timedelta(seconds=30)
+    result, written, refreshes = run_db_fallback(monkeypatch, created_at)
+
+    assert result["freshness"] == "fresh"
+    assert refreshes == []
+    assert abs(written[0]["cached_at"] - created_at.timestamp()) < 1e-6
+    assert written[0]["ttl"] > service_module.REPORT_HARD_TTL - 60
+    assert time.time() - result["cached_at"] >= 30
@@ -0,0 +1,108 @@
+"""
+리포트 생성 Single-Flight / 백그라운드 저장 (Redis / DB / LLM 없이 실행 가능)
+- 락 해제 시점에 폴링하던 다른 워커가 캐시 결과를 받는지
+- 앱 종료 시 백그라운드 DB 저장이 끝날 때까지 기다리는지
+"""
+import asyncio
+import os
+from datetime import date
+
+os.environ.setdefault("OPENAI_API_KEY", "test")  # 클라이언트 생성용 (API는 호출하지 않음)
+os.environ.setdefault("GEMINI_API_KEY", "test")
+
+import app.core.db  # noqa: F401  (순환 import 방지용으로 먼저 로드)
+import app.core.cache as cache_module
+import app.report.report_service as service_module
+
+
+class FakeLockRedis:
+    """SET NX / 락 해제 스크립트 / EXISTS만 흉내내는 워커 공용 Redis"""
+
+    def __init__(self):
+        self.locks = {}
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.locks:
+            return None
+        self.locks[key] = value
+        return True
+
+    async def eval(self, script, numkeys, key, token):
+        if self.locks.get(key) == token:
+            del self.locks[key]
+            return 1
+        return 0
+
+    async def exists(self, key):
+        return int(key in self.locks)
+
+
+def test_follower_polling_at_lock_release_gets_cached_report(monkeypatch):
+    redis = FakeLockRedis()
+    shared_cache = {}  # 워커 공용 Redis 리포트 캐시 대용
+    graph_runs = []
+
+    async def fake_get_redis():
+        return redis
+
+    class FakeGraph:
+        async def ainvoke(self, state):
+            graph_runs.append(state["store_id"])
+            await asyncio.sleep(0.05)
+            return {"execution_logs": [], "node_timings": {}, "data_watermark": "w1"}
+
+    async def fake_set_report_cache(store_id, data, target_date, version=""):
+        await asyncio.sleep(0.03)  # Redis 왕복
+        shared_cache[(store_id, target_date, version)] = data
+
+    async def fake_save_report(record):
+        return "saved"
+
+    monkeypatch.setattr(cache_module, "get_redis", fake_get_redis)
+    monkeypatch.setattr(cache_module, "SINGLE_FLIGHT_POLL_INTERVAL", 0.01)
+    monkeypatch.setattr(service_module, "report_graph_app", FakeGraph())
+    monkeypatch.setattr(service_module, "build_report_record", lambda state: {"risk_assessment": {"risk_score": 50}})
+    monkeypatch.setattr(service_module, "set_report_cache", fake_set_report_cache)
+    monkeypatch.setattr(service_module, "save_report", fake_save_report)
+
+    save_date = date(2025, 1, 14)
+    key = f"report:1:{save_date.isoformat()}"
+
+    def produce():
+        return service_module._run_report_graph(1, "서울 강남점", "sequential", None, save_date, [])
+
+    async def wait_for():
+        return shared_cache.get((1, save_date, "w1"))
+
+    async def run():
+        # 리더 워커가 락을 잡은 뒤, 다른 워커(별도 프로세스 -> _inflight 공유 없음)가 락 해제를 폴링
+        leader = asyncio.ensure_future(cache_module._run_with_distributed_lock(key, produce, wait_for, 5.0))
+        await asyncio.sleep(0.01)
+        follower = await cache_module._run_with_distributed_lock(key, produce, wait_for, 5.0)
+        return await leader, follower
+
+    leader_result, follower_result = asyncio.run(run())
+
+    assert graph_runs == [1]  # 그래프(LLM)는 리더만 실행
+    assert follower_result["report"] == leader_result["report"]
+    assert redis.locks == {}
+
+
+def test_drain_waits_for_background_save(monkeypatch):
+    saved = []
+
+    async def slow_save(record):
+        await asyncio.sleep(0.02)
+        saved.append(record)
+        return "saved"
+
+    monkeypatch.setattr(service_module, "save_report", slow_save)
+
+    async def run():
+        service_module._spawn(service_module._save_report_in_background({"store_id": 1}))
+        await service_module.drain_background_tasks(timeout=1.0)
+
+    asyncio.run(run())
+
+    assert saved == [{"store_id": 1}]
+    assert service_module._background_tasks == set()
@@ -0,0 +1,82 @@
+"""리포트 그래프: 병렬 조회 브랜치 / 기간·건수를 SQL로 넘기는지 (DB/LLM 없이 실행 가능)"""
+import asyncio
+import os
+from datetime import date, timedelta
+
+os.environ.setdefault("OPENAI_API_KEY", "test")  # 클라이언트 생성용 (API는 호출하지 않음)
+os.environ.setdefault("GEMINI_API_KEY", "test")
+
+import app.core.db  # noqa: F401  (순환 import 방지용으로 먼저 로드)
+import app.report.report_graph as graph_module
+import app.review.review_service as review_module
+
+
+def test_report_graph_fetches_two_weeks_in_parallel_branches(monkeypatch):
+    calls, running = {}, {"now": 0, "peak": 0}
+
+    async def track():
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        await asyncio.sleep(0.02)
+        running["now"] -= 1
+
+    async def fake_menu_stats(store_id, days=7, target_date=None):
+        await track()
+        return []
+
+    async def fake_reviews(store_id, since=None, until=None, limit=None):
+        calls["reviews"] = (since, until, limit)
+        await track()
+        return [{"rating": 5, "review_text": "맛있어요"}]
+
+    async def fake_daily_sales(store_id, since=None, until=None):
+        calls["sales"] = (since, until)
+        await track()
+        return [
+            {"order_date": since + timedelta(days=offset), "daily_revenue": 1000, "weather_info": "맑음"}
+            for offset in range((until - since).days + 1)
+        ]
+
+    async def fake_generate_text(prompt):
+        return "<SECTION:SALES_ANALYSIS>분석</SECTION:SALES_ANALYSIS><SECTION:RISK>{\"risk_score\": 30}</SECTION:RISK>"
+
+    monkeypatch.setattr(graph_module, "select_menu_sales_comparison", fake_menu_stats)
+    monkeypatch.setattr(graph_module, "select_reviews_by_store", fake_reviews)
+    monkeypatch.setattr(graph_module, "select_daily_sales_by_store", fake_daily_sales)
+    monkeypatch.setattr(graph_module, "genai_generate_text", fake_generate_text)
+
+    state = {"store_id": 1, "store_name": "서울 강남점", "target_date": "2025-01-14", "execution_logs": []}
+    result = asyncio.run(graph_module.create_report_graph().ainvoke(state))
+
+    assert calls["sales"] == (date(2025, 1, 1), date(2025, 1, 14))
+    assert calls["reviews"] == (None, date(2025, 1, 14), graph_module.REPORT_REVIEW_LIMIT)
+    assert len(result["sales_data"]) == 7 and len(result["prev_sales_data"]) == 7
+    assert result["calculated_total_sales"] == 7000
+    # 세 조회 브랜치가 동시에 실행되고, 노드별 소요 시간이 모두 기록됨
+    assert running["peak"] == 3
+    assert set(result["node_timings"]) == {
+        "resolve_anchor", "fetch_menu_stats", "fetch_reviews", "fetch_daily_sales", "join_data", "analyze_data"
+    }
+
+    record = graph_module.build_report_record(result)
+    assert record["risk_assessment"]["risk_score"] == 30
+    assert record["risk_assessment"]["node_timings"] == result["node_timings"]
+
+
+def test_review_window_is_applied_in_sql(monkeypatch):
+    captured = []
+
+    async def fake_fetch_all(query, params=()):
+        captured.append((query, params))
+        return []
+
+    monkeypatch.setattr(review_module, "fetch_all", fake_fetch_all)
+
+    asyncio.run(review_module.select_reviews_by_store(1))
+    asyncio.run(review_module.select_reviews_by_store(1, until=date(2025, 1, 14), limit=15))
+
+    (full_sql, full_params), (window_sql, window_params) = captured
+    assert "LIMIT" not in full_sql and full_params == (1,)
+    assert "r.created_at < %s" in window_sql and window_sql.rstrip().endswith("LIMIT %s")
+    # 기준일 포함 -> 다음날 0시 미만
+    assert window_params == (1, date(2025, 1, 15), 15)
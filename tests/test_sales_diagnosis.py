@@ -0,0 +1,67 @@
+"""
+app/inquiry/nodes/sales.py 매출 분석 쿼리 단위 테스트 (DB/LLM 없이 실행 가능)
+"""
+import asyncio
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test")  # 클라이언트 생성용 (API는 호출하지 않음)
+os.environ.setdefault("GEMINI_API_KEY", "test")
+
+import app.core.db  # noqa: F401  (inquiry_schema 순환 import 방지용으로 먼저 로드)
+import app.inquiry.nodes.sales as sales_module
+
+
+def test_diagnosis_node_uses_single_round_trip_and_reports_timings(monkeypatch):
+    calls = []
+
+    async def fake_resolve_stores(codes):
+        return [1], ["서울 강남점"]
+
+    async def fake_fetch_diagnosis(store_ids, period_days, required_tables):
+        calls.append((store_ids, period_days, list(required_tables)))
+        return {
+            "start_date": "2025-01-01",
+            "end_date": "2025-01-07",
+            "top_selling_menus": [{"menu_id": 10, "menu_name": "라떼", "category": "커피", "qty": 30, "rev": 150000}],
+            "low_selling_menus": [{"menu_id": 11, "menu_name": "스콘", "category": "디저트", "qty": 1, "rev": 3000}],
+            "menu_specific_reviews": [{"menu_id": 11, "rating": 2, "review_text": "퍽퍽해요", "ordered_at": "2025-01-06T10:00:00"}],
+            "recent_reviews": [{"store_name": "서울 강남점", "rating": 2, "review_text": "퍽퍽해요"}],
+        }
+
+    monkeypatch.setattr(sales_module, "resolve_stores", fake_resolve_stores)
+    monkeypatch.setattr(sales_module, "fetch_diagnosis", fake_fetch_diagnosis)
+
+    state = {
+        "question": "강남점 안 팔린 메뉴와 이유",
+        "category": "sales",
+        "search_params": {"target_store_codes": ["강남"], "required_tables": ["orders"], "period_days": 7},
+    }
+    data = asyncio.run(sales_module.diagnosis_node(state))["sales_data"]
+
+    assert calls == [([1], 7, ["orders", "reviews"])]
+    assert data["tables_used"] == ["orders", "reviews"]
+    assert data["low_selling_menus"][0]["related_reviews"] == ["⭐2: 퍽퍽해요"]
+    assert "기간: 2025-01-01 ~ 2025-01-07" in data["summary_text"]
+    assert {"search_params_ms", "resolve_stores_ms", "query_ms", "summary_ms", "total_ms"} <= set(data["timings_ms"])
+
+
+def test_diagnosis_summary_period_is_readable_when_query_fails(monkeypatch):
+    async def fake_resolve_stores(codes):
+        return [1], ["서울 강남점"]
+
+    async def failing_fetch_diagnosis(store_ids, period_days, required_tables):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(sales_module, "resolve_stores", fake_resolve_stores)
+    monkeypatch.setattr(sales_module, "fetch_diagnosis", failing_fetch_diagnosis)
+
+    state = {
+        "question": "강남점 최근 2주 매출",
+        "category": "sales",
+        "search_params": {"target_store_codes": ["강남"], "required_tables": ["sales_daily"], "period_days": 14},
+    }
+    summary = asyncio.run(sales_module.diagnosis_node(state))["sales_data"]["summary_text"]
+
+    # SQL 조각이 LLM 요약에 그대로 들어가지 않음
+    assert "기간: 최근 14일" in summary
+    assert "CURRENT_DATE" not in summary
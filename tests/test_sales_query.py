@@ -0,0 +1,36 @@
+"""
+app/inquiry/sales_query.py 단위 테스트 (DB 없이 실행 가능)
+"""
+import app.core.db  # noqa: F401  (inquiry_schema 순환 import 방지용으로 먼저 로드)
+from app.inquiry.sales_query import DIAGNOSIS_RECENT_REVIEW_LIMIT, build_diagnosis_query
+
+
+def test_query_includes_only_required_sections():
+    query, params = build_diagnosis_query([1, 2], 7, ["sales_daily"])
+    text = query.as_string(None)
+
+    assert "daily AS" in text and "daily_trend" in text
+    assert "menu_stats" not in text and "recent_reviews" not in text
+    assert "s.store_id = ANY(%(store_ids)s)" in text
+    assert params["store_ids"] == [1, 2]
+
+
+def test_menu_query_limits_in_sql():
+    query, params = build_diagnosis_query([1], 30, ["orders", "reviews"])
+    text = query.as_string(None)
+
+    assert text.count("LIMIT %(menu_limit)s") == 2  # Top / Worst 모두 메뉴 집계 1회 재사용
+    assert "rn <= %(menu_review_limit)s" in text
+    assert "LIMIT %(recent_review_limit)s" in text
+    assert params["recent_review_limit"] == DIAGNOSIS_RECENT_REVIEW_LIMIT
+
+
+def test_sql_text_is_stable_across_stores_periods_and_table_order():
+    query_a, params_a = build_diagnosis_query([1], 7, ["reviews", "orders"])
+    query_b, params_b = build_diagnosis_query([2, 3, 70000], 30, ["orders", "reviews"])
+
+    # 값은 파라미터로만 바뀌고 SQL은 같은 객체 (prepared statement 재사용)
+    assert query_a is query_b
+    assert "70000" not in query_b.as_string(None)
+    assert params_a["period_days"] == 7 and params_b["period_days"] == 30
+    assert {type(v).__name__ for v in params_b["store_ids"]} == {"Int4"}  # 값 크기와 무관하게 int4[]
@@ -0,0 +1,90 @@
+"""
+app/store/store_resolver.py 단위 테스트 (DB/LLM 없이 실행 가능)
+"""
+import asyncio
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test")  # 클라이언트 생성용 (API는 호출하지 않음)
+os.environ.setdefault("GEMINI_API_KEY", "test")
+
+import app.store.store_resolver as store_resolver
+from app.store.store_resolver import StoreAliasIndex, normalize_store_text
+
+STORES = [
+    {"store_id": 1, "store_name": "서울 강남점", "region": "서울", "city": "강남구"},
+    {"store_id": 2, "store_name": "서울 홍대점", "region": "서울", "city": "마포구"},
+    {"store_id": 3, "store_name": "부산 서면점", "region": "부산", "city": "부산진구"},
+    {"store_id": 4, "store_name": "강원 속초점", "region": "강원", "city": "속초시"},
+]
+
+
+def test_normalize_strips_spaces_case_and_store_suffix():
+    assert normalize_store_text(" 서울 강남점 ") == "서울강남"
+    assert normalize_store_text("Gangnam 지점") == "gangnam"
+    assert normalize_store_text("점") == "점"  # 접미사만 있으면 그대로
+
+
+def test_alias_region_and_contains_matching():
+    index = StoreAliasIndex(STORES, aliases={"본점": "서울 강남점"})
+
+    assert index.resolve("강남")["ids"] == [1]
+    assert index.resolve("서울")["ids"] == [1, 2]  # 지역 -> 소속 매장 전체
+    assert index.resolve("SEOUL")["ids"] == [1, 2]  # 영문 지역 별칭
+    assert index.resolve("본점") == {"ids": [1], "method": "alias", "candidates": []}
+    assert index.resolve("마포구")["ids"] == [2]  # 도시
+    assert index.resolve("속초점 매장")["method"] == "contains"
+
+
+def test_fuzzy_matches_typo_and_rejects_unrelated():
+    index = StoreAliasIndex(STORES, aliases={})
+
+    assert index.resolve("gangnm")["method"] == "none"  # 영문 매장명 별칭이 없으면 매칭 안 함 (gangwon과는 임계값 미만)
+
+    index = StoreAliasIndex(STORES, aliases={"gangnam": "서울 강남점"})
+    result = index.resolve("gangnm")
+    assert result["method"] == "fuzzy"
+    assert result["ids"] == [1]
+    assert index.resolve("제주도")["ids"] == []
+
+
+def test_resolve_stores_uses_llm_only_for_ambiguous(monkeypatch):
+    index = StoreAliasIndex(STORES, aliases={"hongdae1": "서울 홍대점", "hongdae2": "부산 서면점"})
+    llm_calls = []
+
+    async def fake_get_store_index():
+        return index
+
+    async def fake_generate_json(prompt, schema):
+        llm_calls.append(prompt)
+        return {"store_id": 3}
+
+    monkeypatch.setattr(store_resolver, "get_store_index", fake_get_store_index)
+    monkeypatch.setattr(store_resolver, "genai_generate_json", fake_generate_json)
+
+    assert asyncio.run(store_resolver.resolve_stores(["강남", "부산"])) == ([1, 3], ["서울 강남점", "부산 서면점"])
+    assert asyncio.run(store_resolver.resolve_stores(["ALL"]))[0] == [1, 2, 3, 4]
+    assert llm_calls == []
+
+    # "hongdae3" 은 두 별칭과 유사도가 같음 -> LLM이 후보(2, 3) 중에서 선택
+    assert index.resolve("hongdae3")["method"] == "ambiguous"
+    assert asyncio.run(store_resolver.resolve_stores(["hongdae3"])) == ([3], ["부산 서면점"])
+    assert len(llm_calls) == 1
+
+
+def test_index_is_rebuilt_when_store_catalog_changes(monkeypatch):
+    catalog = [list(STORES)]
+
+    async def fake_select_stores_all():
+        return catalog[0]
+
+    monkeypatch.setattr(store_resolver, "select_stores_all", fake_select_stores_all)
+    monkeypatch.setattr(store_resolver, "_index", None)
+    monkeypatch.setattr(store_resolver, "_signature", None)
+
+    first = asyncio.run(store_resolver.get_store_index())
+    assert asyncio.run(store_resolver.get_store_index()) is first
+
+    catalog[0] = STORES + [{"store_id": 5, "store_name": "제주 애월점", "region": "제주", "city": "제주시"}]
+    second = asyncio.run(store_resolver.get_store_index())
+    assert second is not first
+    assert second.resolve("애월")["ids"] == [5]
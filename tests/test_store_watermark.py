@@ -0,0 +1,86 @@
+"""매장 워터마크: 기준일 조회 / 캐시 버전 토큰 / 버전 포함 리포트 캐시 키"""
+import asyncio
+import os
+from datetime import date, datetime
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+import app.core.db  # noqa: F401  (순환 import 방지: db -> store_schema 먼저 로드)
+import app.store.store_watermark as watermark_module
+from app.core.cache import _make_key, _parse_key
+from app.inquiry.sales_query import build_diagnosis_query
+from app.store.store_watermark import get_anchor_date, watermark_token
+
+
+def _watermark(store_id, sale_date, ordered_at=None, review_at=None):
+    return {
+        "store_id": store_id,
+        "last_sale_date": sale_date,
+        "last_ordered_at": ordered_at,
+        "last_review_at": review_at,
+    }
+
+
+def test_anchor_date_needs_every_store(monkeypatch):
+    monkeypatch.setattr(watermark_module, "_watermarks", {
+        1: _watermark(1, date(2024, 5, 1)),
+        2: _watermark(2, date(2024, 5, 3)),
+        3: _watermark(3, None),
+    })
+
+    assert get_anchor_date([1, 2]) == date(2024, 5, 3)
+    assert get_anchor_date([1, 3]) == date(2024, 5, 1)
+    assert get_anchor_date([3]) is None
+    # 모르는 매장이 섞이면 SQL의 MAX(sale_date)로 대체
+    assert get_anchor_date([1, 99]) is None
+
+    _, params = build_diagnosis_query([1, 2], 7, ["sales_daily"], get_anchor_date([1, 2]))
+    assert params["anchor_date"] == date(2024, 5, 3)
+
+
+def test_token_changes_when_new_data_arrives(monkeypatch):
+    marks = {1: _watermark(1, date(2024, 5, 1), datetime(2024, 5, 1, 12, 0))}
+    monkeypatch.setattr(watermark_module, "_watermarks", marks)
+
+    before = watermark_token(1)
+    assert before.startswith("w") and before == watermark_token(1)
+    assert watermark_token(2) == ""
+
+    marks[1] = _watermark(1, date(2024, 5, 1), datetime(2024, 5, 1, 12, 0), datetime(2024, 5, 1, 13, 0))
+    assert watermark_token(1) != before
+
+
+def test_token_changes_when_existing_rows_are_edited(monkeypatch):
+    marks = {1: {**_watermark(1, date(2024, 5, 1)), "updated_at": datetime(2024, 5, 1, 12, 0)}}
+    monkeypatch.setattr(watermark_module, "_watermarks", marks)
+    before = watermark_token(1)
+
+    # 매출 정정 / 리뷰 수정: 마지막 날짜는 그대로, updated_at만 바뀜
+    marks[1] = {**marks[1], "updated_at": datetime(2024, 5, 1, 12, 5)}
+    assert watermark_token(1) != before
+
+
+def test_notification_refreshes_only_listed_stores(monkeypatch):
+    marks = {1: _watermark(1, date(2024, 5, 1)), 2: _watermark(2, date(2024, 5, 1))}
+    monkeypatch.setattr(watermark_module, "_watermarks", marks)
+    calls = []
+
+    async def fake_fetch_all(query, params=()):
+        calls.append(params)
+        return [_watermark(2, date(2024, 5, 2))]
+
+    monkeypatch.setattr(watermark_module, "fetch_all", fake_fetch_all)
+    asyncio.run(watermark_module._apply_notification("2"))
+
+    assert calls == [([2],)]
+    assert marks[1]["last_sale_date"] == date(2024, 5, 1)
+    assert marks[2]["last_sale_date"] == date(2024, 5, 2)
+
+
+def test_report_cache_key_carries_version():
+    plain = _make_key(7, date(2024, 5, 1), 3)
+    versioned = _make_key(7, date(2024, 5, 1), 3, "wabc")
+
+    assert versioned == f"{plain}:wabc"
+    assert _parse_key(plain) == (7, date(2024, 5, 1))
+    assert _parse_key(versioned) == (7, date(2024, 5, 1))
@@ -0,0 +1,74 @@
+"""
+app/core/vector_index.py 단위 테스트 (DB 없이 실행 가능)
+"""
+import asyncio
+
+import numpy as np
+
+import app.core.vector_index as vector_index_module
+from app.core.vector_index import InMemoryVectorIndex
+
+
+def make_rows():
+    return [
+        {"manual_id": 1, "title": "제빙기 필터 교체", "content": "...", "embedding": np.array([1.0, 0.0, 0.0])},
+        {"manual_id": 2, "title": "포스 마감", "content": "...", "embedding": np.array([0.0, 2.0, 0.0])},  # 정규화 전 길이 2
+        {"manual_id": 3, "title": "에스프레소 머신 세척", "content": "...", "embedding": np.array([0.7, 0.7, 0.0])},
+    ]
+
+
+def test_search_returns_cosine_top_k_like_pgvector():
+    index = InMemoryVectorIndex(make_rows())
+
+    results = index.search([2.0, 0.1, 0.0], k=2, columns=("manual_id", "title"))
+
+    assert [r["manual_id"] for r in results] == [1, 3]
+    assert set(results[0]) == {"manual_id", "title", "distance"}
+    assert results[0]["distance"] < results[1]["distance"]
+    assert abs(results[0]["distance"] - (1 - 2.0 / np.linalg.norm([2.0, 0.1, 0.0]))) < 1e-6
+
+
+def test_search_handles_k_larger_than_corpus_and_empty_index():
+    assert len(InMemoryVectorIndex(make_rows()).search([0.0, 1.0, 0.0], k=10)) == 3
+    assert InMemoryVectorIndex([]).search([0.0, 1.0, 0.0], k=3) == []
+
+
+def test_search_corpus_falls_back_to_pgvector_when_not_in_memory(monkeypatch):
+    calls = []
+
+    async def fake_vector_search(table, vector, k=5, columns=None):
+        calls.append(table)
+        return [{"title": "db", "distance": 0.1}]
+
+    monkeypatch.setattr(vector_index_module, "vector_search", fake_vector_search)
+    monkeypatch.setattr(vector_index_module, "_indexes", {"manuals": InMemoryVectorIndex(make_rows()), "policies": None})
+
+    async def scenario():
+        in_memory = await vector_index_module.search_corpus("manuals", [1.0, 0.0, 0.0], k=1)
+        fallback = await vector_index_module.search_corpus("policies", [1.0, 0.0, 0.0], k=1)
+        return in_memory, fallback
+
+    in_memory, fallback = asyncio.run(scenario())
+
+    assert in_memory[0]["manual_id"] == 1
+    assert fallback == [{"title": "db", "distance": 0.1}]
+    assert calls == ["policies"]
+
+
+def test_hybrid_search_promotes_keyword_match_with_rrf():
+    rows = make_rows()
+    rows[0]["content"] = "제빙기 필터는 3개월마다 교체합니다."
+    rows[2]["content"] = "에스프레소 머신 그룹헤드 세척 방법"
+    index = InMemoryVectorIndex(rows, text_columns=("title", "content"))
+
+    # 벡터만 보면 3번(에스프레소)이 1위지만, 키워드("제빙기 필터")는 1번 문서에만 일치
+    query = [0.6, 0.8, 0.0]
+    assert index.search(query, k=1)[0]["manual_id"] != 1
+
+    results = index.hybrid_search(query, "제빙기 필터는 언제 바꾸나요?", k=3)
+
+    assert results[0]["manual_id"] == 1
+    assert results[0]["lexical_rank"] == 1
+    assert results[0]["rrf_score"] > results[1]["rrf_score"]
+    assert {"distance", "vector_rank", "lexical_rank", "rrf_score"} <= set(results[0])
+    assert all(r["lexical_rank"] is None for r in results[1:])  # 키워드 불일치 문서는 벡터 순위만
@@ -225,6 +225,7 @@ def inquiry_page():
     if prompt := st.chat_input("질문을 입력하세요..."):
         st.session_state.messages.append({"role": "user", "content": prompt})
         st.chat_message("user").markdown(prompt)
+        st.session_state.pop("cache_bypass_question", None)
         
         # --- [Phase 1: Check] ---
         with st.chat_message("assistant"):
@@ -233,6 +234,13 @@ def inquiry_page():
                     res = requests.post(f"{API_BASE_URL}/inquiry/check", json={"store_id": 1, "question": prompt})
                     if res.status_code == 200:
                         data = res.json()["data"]
+                        if data.get("cache_hit"):
+                            # [Semantic Cache] 거의 같은 이전 질문의 답변을 바로 표시 (검색/LLM 생략)
+                            status.update(label="♻️ 이전 답변을 재사용했습니다.", state="complete", expanded=False)
+                            logs = [{"message": f"♻️ 유사 질문 답변 재사용 (유사도 {data['similarity_score']}%, {data['cached_at'][:16]}) - \"{data['cached_question']}\""}]
+                            st.session_state.messages.append({"role": "assistant", "content": data["cached_answer"], "logs": logs})
+                            st.session_state.cache_bypass_question = prompt
+                            st.rerun()
                         status.update(label="Analysis Complete. Please select an action.", state="complete", expanded=False)
                         st.session_state.pending_inquiry = {"question": prompt, "data": data}
                         st.rerun()
@@ -241,6 +249,17 @@ def inquiry_page():
                 except Exception as e:
                     status.update(label=f"Connection Error: {e}", state="error")
 
+    # 6-1. 캐시된 답변 대신 새로 받기 (시맨틱 캐시 건너뛰고 Phase 1 재실행)
+    if "cache_bypass_question" in st.session_state:
+        if st.button("🔄 새로 답변 받기 (캐시 사용 안 함)"):
+            question = st.session_state.pop("cache_bypass_question")
+            res = requests.post(f"{API_BASE_URL}/inquiry/check", json={"store_id": 1, "question": question, "use_cache": False})
+            if res.status_code == 200:
+                st.session_state.pending_inquiry = {"question": question, "data": res.json()["data"]}
+            else:
+                st.error("Server Error")
+            st.rerun()
+
     # 7. [Phase 2: Action Selection]
     if "pending_inquiry" in st.session_state:
         pending = st.session_state.pending_inquiry
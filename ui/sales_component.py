@@ -253,7 +253,9 @@ def show_sales_dialog(store_id, store_name):
                     report_data = result.get("report")
                     
                     # 캐시/생성 성공 메시지
-                    if result.get("cached"):
+                    if result.get("freshness") == "stale":
+                        st.info("⚡ 이전에 생성된 리포트를 즉시 불러왔습니다. (최신 리포트는 백그라운드에서 갱신 중)")
+                    elif result.get("cached"):
                         st.info("⚡ 이전에 생성된 리포트가 있어 즉시 불러왔습니다.")
                     else:
                         st.success(f"{report_target_date} 기준 리포트가 생성되었습니다!")